@@ -1,3 +1,4 @@
+#@section imports
 import os
 import json
 from airflow import models
@@ -16,23 +17,35 @@ from airflow.exceptions import AirflowFailException
 from airflow.models import Param
 from bfdms.dpaas import BFDMSDataprocCreateClusterOperator
 from airflow.operators.empty import EmptyOperator
+#@end
 
+#@section header
 # Task 1. Cluster creation
 # b. Ingestion from ICDS
 #         
 # Task 3. Upsert Target
 # Task 4. Cluster deletion
+#@end
 
 SENSITIVITY="SE"
 PRIORITY="P2"
 TAGS = ["Massmart-eComm",PRIORITY,"Ephemeral","SA","SECURE","MDSE","MAKRO","mak_physl_invt_doc","SLT"]
 CLUSTER_NAME = "sa-mdse-dl-secure-mak-physl-invt-doc"
+#@section artifactory_url
 ARTIFACTORY_URL = Variable.get("ARTIFACTORY_URL")
+#@end
 BANNER_NAME="makro"
 TRUE_FLAG = "true"
 TABLE_NAME="IKPF" #SAP table name
+#@section mode_settings
+#@end
+PARAM_DEFAULTS = {}  # dag_params defaults sized from --table-stats (empty: the defaults below)
+PROD_SCHEDULE = "0 22 * * *"  # cron slot (UTC) assigned by --schedule-window
+DEFERRABLE_POLL_SECONDS = 0  # --deferrable polling interval of the Dataproc tasks (0: blocking operators)
+HUDI_OPTIONS = {}  # Hudi write configs of the upsert job per --sapTableName, from ingestion.csv
 
 
+#@section param_templates
 # Dynamic cluster configuration parameters
 machine_type = "{{ params.machineType }}"
 
@@ -50,18 +63,24 @@ ups_exec_cores = "{{ params.upsExecCores }}"
 ups_exec_memory = "{{ params.upsExecMemory }}"
 ups_memory_overhead = "{{ params.upsMemoryOverhead }}"
 cluster_type = "{{ params.clusterType }}"
+#@end
 
 ALERT_EMAIL_ADDRESSES = ['intltechdatamassmart@email.wal-mart.com']
 BQ_SYNC = TRUE_FLAG
+#@section environment
 CCM_URL = Variable.get("CCM_URL")
 DAG_ID = os.path.basename(__file__).replace(".pyc", "").replace(".py", "")
 ENV = Variable.get("ENV")
+#@end
 
 SCHEDULE = ""
 if "DEV" in ENV:
     SCHEDULE = None
 elif "PROD" in ENV:
-    SCHEDULE="0 22 * * *"  # Schedule updated to run daily at 11:30 PM
+    SCHEDULE=PROD_SCHEDULE  # Daily, staggered per DAG by --schedule-window
+
+# Deferred Dataproc job/cluster-delete tasks wait in the triggerer instead of holding a worker slot
+DEFER_ARGS = {"deferrable": True, "polling_interval_seconds": DEFERRABLE_POLL_SECONDS} if DEFERRABLE_POLL_SECONDS else {}
 
 dag_arr = DAG_ID.split('-')
 if len(dag_arr) == 5:
@@ -71,6 +90,7 @@ if len(dag_arr) == 5:
 else:
     raise AirflowException("Please make sure DAG name is in right format:<INTLDLDAT>-<DIVISION:SAWM>-<LOAD_TYPE: INC,FULL>-<TARGET_SCHEMA>-<TARGET_TABLE>")
 
+#@section config_readers
 # **************************** Read Global bucket property file *****************************
 def read_properties(gcs_file):
     try:
@@ -113,7 +133,9 @@ def read_cluster_config():
         return CLUSTER_CONFIG
     except (FileNotFoundError, IOError):
         print("Failed to download or read cluster config file: ",file_bytes)
+#@end
 
+#@section cluster_config
 GCS_CODE_BUCKET = Variable.get("GCS_CODE_BUCKET")
 CONN_ID_DPAAS = Variable.get("CONN_ID_"+SENSITIVITY+"_DPAAS")
 SOFTWARE_CONFIGS = Variable.get("SOFTWARE_CONFIG_"+SENSITIVITY)
@@ -135,8 +157,10 @@ init_actions = global_props['init_actions']
 CLUSTER_TYPE = 'custom'  # Changed from 'medium' to 'custom' for dynamic configuration
 CLUSTER_CONFIG = read_cluster_config()
 logging.info(f"CLUSTER_CONFIG: {CLUSTER_CONFIG}")
+#@end
 
 
+#@section failure_handling
 def failure_callback(context):
     if "prod" in PROJECT_ID.lower():
         if PRIORITY == "P1":
@@ -155,10 +179,12 @@ default_args = {
     'max_active_runs':1,
     'on_failure_callback': failure_callback,
 }
+#@end
 
 
 # *************************************** Spark Job - Ingestion from SAP Source ************************************************
 
+#@section ingestion_job_config
 ICDS_INGESTION_MAIN_CLASS = "za.co.massmart.icds.ds.IngestionPipeline"
 
 JARS_FILES = [
@@ -172,8 +198,12 @@ JARS_FILES = [
                ]
 
 ICDS_INGESTION_JOB_NAME = "ICDS_To_DataLake_Raw_Ingestion"
+#@end
+#@section ingestion_args
 ICDS_INGESTION_CMD_LINE_ARGS = ["--banner", BANNER_NAME, "--sapTableName", TABLE_NAME, "--dpaasFlag", TRUE_FLAG]
+#@end
 
+#@section ingestion_spark_prop
 ICDS_INGESTION_SPARK_PROP = {
     "spark.app.name": ICDS_INGESTION_JOB_NAME,
     "spark.master": "yarn",
@@ -194,7 +224,9 @@ ICDS_INGESTION_SPARK_PROP = {
     "spark.driver.extraJavaOptions": f"-Druntime.context.system.property.override.enabled=true -Druntime.context.environmentType=lab -Dscm.server.url={CCM_URL} -Dcom.walmart.platform.metrics.logfile.path=/dev/null -Dcom.walmart.platform.logging.logfile.path=/dev/null -Dcom.walmart.platform.txnmarking.logfile.path=/dev/null",
     "spark.yarn.maxAppAttempts": "1"
 }
+#@end
 
+#@section ingestion_job
 ICDS_INGESTION_SPARK_JOB = {
     "reference": {"project_id": PROJECT_ID},
     "placement": {"cluster_name": CLUSTER_NAME},
@@ -205,15 +237,27 @@ ICDS_INGESTION_SPARK_JOB = {
         "properties": ICDS_INGESTION_SPARK_PROP
     },
 }
+#@end
 
 # *************************************** Spark Job - Upsert with Target Table ************************************************
 
+#@section hudi_conf_args
+# Hudi record key, precombine field and index tuning of a table (HUDI_OPTIONS) as --hoodieConf key=value arguments
+def hudi_conf_args(sap_table_name):
+    return [arg for key, value in HUDI_OPTIONS.get(sap_table_name, {}).items() for arg in ("--hoodieConf", f"{key}={value}")]
+#@end
+
+#@section upsert_job_config
 UPSERT_TARGET_MAIN_CLASS = "za.co.massmart.icds.ds.UpsertPipelineV1"
 
 UPSERT_TARGET_JOB_NAME = "Upsert_Target_DataLake_Table"
+#@end
 
-UPSERT_TARGET_CMD_LINE_ARGS = ["--banner", BANNER_NAME, "--sapTableName", TABLE_NAME,"--bqSync",BQ_SYNC]
+#@section upsert_args
+UPSERT_TARGET_CMD_LINE_ARGS = ["--banner", BANNER_NAME, "--sapTableName", TABLE_NAME,"--bqSync",BQ_SYNC] + hudi_conf_args(TABLE_NAME)
+#@end
 
+#@section upsert_spark_prop
 UPSERT_TARGET_SPARK_PROP = {
     "spark.app.name": UPSERT_TARGET_JOB_NAME,
     "spark.master": "yarn",
@@ -234,7 +278,9 @@ UPSERT_TARGET_SPARK_PROP = {
     "spark.driver.extraJavaOptions": f"-Druntime.context.system.property.override.enabled=true -Druntime.context.environmentType=lab -Dscm.server.url={CCM_URL} -Dcom.walmart.platform.metrics.logfile.path=/dev/null -Dcom.walmart.platform.logging.logfile.path=/dev/null -Dcom.walmart.platform.txnmarking.logfile.path=/dev/null",
     "spark.yarn.maxAppAttempts": "1"
 }
+#@end
 
+#@section upsert_job
 UPSERT_TARGET_SPARK_JOB = {
     "reference": {"project_id": PROJECT_ID},
     "placement": {"cluster_name": CLUSTER_NAME},
@@ -245,27 +291,33 @@ UPSERT_TARGET_SPARK_JOB = {
         "properties": UPSERT_TARGET_SPARK_PROP
     },
 }
+#@end
 
+#@section dag_params
 # DAG Parameters for dynamic configuration
 dag_params = {
-    "machineType": Param(default="n1-standard-4", type="string", description="Machine type for cluster nodes"),
-    "ingDriverCores": Param(default="2", type="string", description="Driver cores for ingestion job"),
-    "ingDriverMemory": Param(default="3g", type="string", description="Driver memory for ingestion job"),
-    "ingExecInstances": Param(default="2", type="string", description="Executor instances for ingestion job"),
-    "ingExecCores": Param(default="2", type="string", description="Executor cores for ingestion job"),
-    "ingExecMemory": Param(default="4g", type="string", description="Executor memory for ingestion job"),
-    "ingMemoryOverhead": Param(default="0.1", type="string", description="Memory overhead factor for ingestion job"),
-    "upsDriverCores": Param(default="2", type="string", description="Driver cores for upsert job"),
-    "upsDriverMemory": Param(default="3g", type="string", description="Driver memory for upsert job"),
-    "upsExecInstances": Param(default="2", type="string", description="Executor instances for upsert job"),
-    "upsExecCores": Param(default="2", type="string", description="Executor cores for upsert job"),
-    "upsExecMemory": Param(default="4g", type="string", description="Executor memory for upsert job"),
-    "upsMemoryOverhead": Param(default="0.1", type="string", description="Memory overhead factor for upsert job"),
-    "clusterType": Param(default="micro", type="string", decription="cluster type for the job"),
-    "numberInstances": Param(default="2", type="string", description="number of instances for job")
+    "machineType": Param(default=PARAM_DEFAULTS.get("machineType", "n1-standard-4"), type="string", description="Machine type for cluster nodes"),
+    "ingDriverCores": Param(default=PARAM_DEFAULTS.get("ingDriverCores", "2"), type="string", description="Driver cores for ingestion job"),
+    "ingDriverMemory": Param(default=PARAM_DEFAULTS.get("ingDriverMemory", "3g"), type="string", description="Driver memory for ingestion job"),
+    "ingExecInstances": Param(default=PARAM_DEFAULTS.get("ingExecInstances", "2"), type="string", description="Executor instances for ingestion job"),
+    "ingExecCores": Param(default=PARAM_DEFAULTS.get("ingExecCores", "2"), type="string", description="Executor cores for ingestion job"),
+    "ingExecMemory": Param(default=PARAM_DEFAULTS.get("ingExecMemory", "4g"), type="string", description="Executor memory for ingestion job"),
+    "ingMemoryOverhead": Param(default=PARAM_DEFAULTS.get("ingMemoryOverhead", "0.1"), type="string", description="Memory overhead factor for ingestion job"),
+    "upsDriverCores": Param(default=PARAM_DEFAULTS.get("upsDriverCores", "2"), type="string", description="Driver cores for upsert job"),
+    "upsDriverMemory": Param(default=PARAM_DEFAULTS.get("upsDriverMemory", "3g"), type="string", description="Driver memory for upsert job"),
+    "upsExecInstances": Param(default=PARAM_DEFAULTS.get("upsExecInstances", "2"), type="string", description="Executor instances for upsert job"),
+    "upsExecCores": Param(default=PARAM_DEFAULTS.get("upsExecCores", "2"), type="string", description="Executor cores for upsert job"),
+    "upsExecMemory": Param(default=PARAM_DEFAULTS.get("upsExecMemory", "4g"), type="string", description="Executor memory for upsert job"),
+    "upsMemoryOverhead": Param(default=PARAM_DEFAULTS.get("upsMemoryOverhead", "0.1"), type="string", description="Memory overhead factor for upsert job"),
+    "clusterType": Param(default=PARAM_DEFAULTS.get("clusterType", "micro"), type="string", decription="cluster type for the job"),
+    "numberInstances": Param(default=PARAM_DEFAULTS.get("numberInstances", "2"), type="string", description="number of instances for job")
 }
+#@end
+#@section dag_open
 with models.DAG(DAG_ID, tags=TAGS, start_date=pendulum.datetime(2025, 6, 1, tz="UTC"), default_args=default_args, max_active_runs=1, catchup=False, schedule_interval=SCHEDULE, params=dag_params) as dag:
+#@end
 
+#@section create_cluster_task
     create_cluster = BFDMSDataprocCreateClusterOperator(
         task_id='{}_create_cluster'.format(DAG_ID.replace('-','_').lower()),
         cluster_name=CLUSTER_NAME,
@@ -275,13 +327,16 @@ with models.DAG(DAG_ID, tags=TAGS, start_date=pendulum.datetime(2025, 6, 1, tz="
         gcp_conn_id=CONN_ID_DPAAS,
         delete_on_error=True
     )
+#@end
 
+#@section job_tasks
     icds_ingest_spark_task = DataprocSubmitJobOperator(
         task_id='icds_ingest_to_dl',
         job=ICDS_INGESTION_SPARK_JOB,
         region=REGION,
         project_id=PROJECT_ID,
-        gcp_conn_id=CONN_ID_DPAAS
+        gcp_conn_id=CONN_ID_DPAAS,
+        **DEFER_ARGS
     )
 
     upsert_spark_task = DataprocSubmitJobOperator(
@@ -289,18 +344,24 @@ with models.DAG(DAG_ID, tags=TAGS, start_date=pendulum.datetime(2025, 6, 1, tz="
         job=UPSERT_TARGET_SPARK_JOB,
         region=REGION,
         project_id=PROJECT_ID,
-        gcp_conn_id=CONN_ID_DPAAS
+        gcp_conn_id=CONN_ID_DPAAS,
+        **DEFER_ARGS
     )
+#@end
 
+#@section delete_cluster_task
     delete_cluster = DataprocDeleteClusterOperator(
         task_id='{}_delete_cluster'.format(DAG_ID.replace('-','_').lower()),
         cluster_name=CLUSTER_NAME,
         project_id=PROJECT_ID,
         region=REGION,
         trigger_rule='all_done',
-        gcp_conn_id=CONN_ID_DPAAS
+        gcp_conn_id=CONN_ID_DPAAS,
+        **DEFER_ARGS
     )
 
     end = EmptyOperator(task_id="end")
+#@end
 
+#@section task_order
     create_cluster >> icds_ingest_spark_task >> upsert_spark_task >> [delete_cluster, end]
\ No newline at end of file
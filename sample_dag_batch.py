@@ -0,0 +1,91 @@
+#@extends sample_dag.py
+# --batch-budget template: sample_dag.py with the sections below replaced
+
+#@section imports
+#@include imports
+from airflow.utils.task_group import TaskGroup
+#@end
+
+#@section header
+# Batch DAG: one cluster for a batch of tables of one schema and sensitivity
+# Task 1. Cluster creation
+# Task 2. Per table x banner, at most MAX_ACTIVE_TASKS at a time: ingestion from ICDS >> upsert target
+# Task 3. Cluster deletion (runs even if a table failed)
+#@end
+
+#@section mode_settings
+BATCH_TASKS = [["MAK", "mak_physl_invt_doc"]]  # [banner, table name passed to --sapTableName] per task pair
+MAX_ACTIVE_TASKS = 4  # task pairs running on the cluster at the same time
+#@end
+
+#@section ingestion_args
+#@end
+
+#@section ingestion_job
+def icds_ingestion_spark_job(banner, sap_table_name):
+    return {
+        "reference": {"project_id": PROJECT_ID},
+        "placement": {"cluster_name": CLUSTER_NAME},
+        "spark_job": {
+            "main_class": ICDS_INGESTION_MAIN_CLASS,
+            "args": ["--banner", banner, "--sapTableName", sap_table_name, "--dpaasFlag", TRUE_FLAG],
+            "jar_file_uris": JARS_FILES,
+            "properties": dict(ICDS_INGESTION_SPARK_PROP, **{"spark.app.name": f"{ICDS_INGESTION_JOB_NAME}_{sap_table_name}"})
+        },
+    }
+#@end
+
+#@section upsert_args
+#@end
+
+#@section upsert_job
+def upsert_target_spark_job(banner, sap_table_name):
+    return {
+        "reference": {"project_id": PROJECT_ID},
+        "placement": {"cluster_name": CLUSTER_NAME},
+        "spark_job": {
+            "main_class": UPSERT_TARGET_MAIN_CLASS,
+            "args": ["--banner", banner, "--sapTableName", sap_table_name, "--bqSync", BQ_SYNC] + hudi_conf_args(sap_table_name),
+            "jar_file_uris": JARS_FILES,
+            "properties": dict(UPSERT_TARGET_SPARK_PROP, **{"spark.app.name": f"{UPSERT_TARGET_JOB_NAME}_{sap_table_name}"})
+        },
+    }
+#@end
+
+#@section dag_open
+with models.DAG(DAG_ID, tags=TAGS, start_date=pendulum.datetime(2025, 6, 1, tz="UTC"), default_args=default_args, max_active_runs=1, catchup=False, schedule_interval=SCHEDULE, params=dag_params, max_active_tasks=MAX_ACTIVE_TASKS) as dag:
+#@end
+
+#@section job_tasks
+    # One independent chain per table x banner: a failed table does not stop the others.
+    # max_active_tasks bounds how many of them share the cluster at once.
+    table_groups = []
+    for banner, sap_table_name in BATCH_TASKS:
+        with TaskGroup(group_id=sap_table_name) as table_group:
+            icds_ingest_spark_task = DataprocSubmitJobOperator(
+                task_id='icds_ingest_to_dl',
+                job=icds_ingestion_spark_job(banner, sap_table_name),
+                region=REGION,
+                project_id=PROJECT_ID,
+                gcp_conn_id=CONN_ID_DPAAS,
+                **DEFER_ARGS
+            )
+
+            upsert_spark_task = DataprocSubmitJobOperator(
+                task_id='upsert_dl_target_table',
+                job=upsert_target_spark_job(banner, sap_table_name),
+                region=REGION,
+                project_id=PROJECT_ID,
+                gcp_conn_id=CONN_ID_DPAAS,
+                **DEFER_ARGS
+            )
+
+            icds_ingest_spark_task >> upsert_spark_task
+        table_groups.append(table_group)
+#@end
+
+#@section task_order
+    create_cluster >> table_groups
+    for table_group in table_groups:
+        table_group >> [delete_cluster, end]
+#@end
@@ -0,0 +1,152 @@
+#@base sample_dag.py
+import os
+import json
+from airflow import models
+from airflow.models import Variable
+from airflow.providers.google.cloud.operators.dataproc import DataprocSubmitJobOperator, DataprocDeleteClusterOperator
+from airflow.contrib.hooks.gcs_hook import GoogleCloudStorageHook
+from datetime import timedelta
+import logging
+import pendulum
+from plugins.CustomModule import  on_failure_spotlight, send_p1_email
+from airflow.models import Param
+from bfdms.dpaas import BFDMSDataprocCreateClusterOperator
+from airflow.operators.empty import EmptyOperator
+
+# DAG factory: registers every DAG listed in the config bundle next to this file
+# (INTLDLDAT-DAG-FACTORY.json, written by `python main.py --dag-factory`) in one parse.
+# Each DAG has the same tasks as a DAG rendered from sample_dag.py:
+# Task 1. Cluster creation
+# Task 2. Ingestion from ICDS
+# Task 3. Upsert Target
+# Task 4. Cluster deletion
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "INTLDLDAT-DAG-FACTORY.json")
+
+PRIORITY="P2"
+TRUE_FLAG = "true"
+
+# Read once per parse for all DAGs (sample_dag.py reads them once per DAG file)
+ARTIFACTORY_URL = Variable.get("ARTIFACTORY_URL")
+CCM_URL = Variable.get("CCM_URL")
+ENV = Variable.get("ENV")
+GCS_CODE_BUCKET = Variable.get("GCS_CODE_BUCKET")
+
+
+#@include param_templates
+
+ALERT_EMAIL_ADDRESSES = ['intltechdatamassmart@email.wal-mart.com']
+BQ_SYNC = TRUE_FLAG
+
+SCHEDULE = ""
+if "DEV" in ENV:
+    SCHEDULE = None
+elif "PROD" in ENV:
+    SCHEDULE="0 22 * * *"  # Schedule updated to run daily at 11:30 PM
+
+CLUSTER_CONFIG_FILE = "configs/cluster_config/dpaas_cluster_create.json"
+CLUSTER_TYPE = 'custom'  # Changed from 'medium' to 'custom' for dynamic configuration
+
+# **************************** Per-sensitivity settings, read once per parse *****************************
+SENSITIVITY_SETTINGS = {}
+
+def sensitivity_settings(sensitivity):
+    SENSITIVITY = sensitivity.upper()
+    if SENSITIVITY in SENSITIVITY_SETTINGS:
+        return SENSITIVITY_SETTINGS[SENSITIVITY]
+
+    #@include config_readers
+
+    CONN_ID_DPAAS = Variable.get("CONN_ID_"+SENSITIVITY+"_DPAAS")
+    # Provide GoogleCloud Platform connection ID
+    gcs_hook = GoogleCloudStorageHook(gcp_conn_id=CONN_ID_DPAAS, delegate_to=None)
+    global_props = read_properties('configs/global/'+SENSITIVITY.lower()+'_bucket_dpaas.properties')
+    SERVICE_ACCOUNT = global_props['service_account_'+SENSITIVITY.lower()]
+    init_actions = global_props['init_actions']
+    settings = {
+        'CONN_ID_DPAAS': CONN_ID_DPAAS,
+        'SOFTWARE_CONFIGS': Variable.get("SOFTWARE_CONFIG_"+SENSITIVITY),
+        'REGION': global_props['region'],
+        'PROJECT_ID': global_props['project_id'],
+        'EMAIL': global_props['email'],
+        'SERVICE_ACCOUNT': SERVICE_ACCOUNT,
+        'CLUSTER_CONFIG': read_cluster_config(),
+    }
+    logging.info(f"{SENSITIVITY}: REGION: {settings['REGION']}, PROJECT_ID: {settings['PROJECT_ID']}, SERVICE_ACCOUNT: {SERVICE_ACCOUNT}")
+    SENSITIVITY_SETTINGS[SENSITIVITY] = settings
+    return settings
+
+
+# *************************************** Spark Job - Ingestion from SAP Source ************************************************
+
+#@include ingestion_job_config
+
+#@include ingestion_spark_prop
+
+# *************************************** Spark Job - Upsert with Target Table ************************************************
+
+#@include upsert_job_config
+
+#@include upsert_spark_prop
+
+# DAG Parameters of sample_dag.py, with the per-DAG defaults of the bundle entry ("params", from --table-stats)
+def build_dag_params(PARAM_DEFAULTS):
+    #@include dag_params
+    return dag_params
+
+
+def create_dag(DAG_ID, dag_config):
+    """Build one ingestion DAG from its config entry (the values sample_dag.py has in its slot lines)"""
+    settings = sensitivity_settings(dag_config["sensitivity"])
+    CLUSTER_NAME = dag_config["cluster_name"]
+    BANNER_NAME = dag_config["banner_name"]
+    TABLE_NAME = dag_config["table_name"]
+    HUDI_OPTIONS = dag_config.get("hudi_options", {})
+    PROJECT_ID = settings['PROJECT_ID']
+    REGION = settings['REGION']
+    EMAIL = settings['EMAIL']
+    CONN_ID_DPAAS = settings['CONN_ID_DPAAS']
+    CLUSTER_CONFIG = settings['CLUSTER_CONFIG']
+
+    #@include failure_handling
+
+    #@include ingestion_args
+
+    #@include ingestion_job
+
+    #@include hudi_conf_args
+
+    #@include upsert_args
+
+    #@include upsert_job
+
+    # Cron slot assigned by --schedule-window, PROD only
+    schedule = dag_config.get("schedule", SCHEDULE) if "PROD" in ENV else SCHEDULE
+    # Deferred Dataproc job/cluster-delete tasks (--deferrable) wait in the triggerer instead of holding a worker slot
+    poll_seconds = dag_config.get("deferrable_poll_seconds", 0)
+    DEFER_ARGS = {"deferrable": True, "polling_interval_seconds": poll_seconds} if poll_seconds else {}
+
+    with models.DAG(DAG_ID, tags=dag_config["tags"], start_date=pendulum.datetime(2025, 6, 1, tz="UTC"), default_args=default_args, max_active_runs=1, catchup=False, schedule_interval=schedule, params=build_dag_params(dag_config.get("params", {}))) as dag:
+
+        #@include create_cluster_task
+
+        #@include job_tasks
+
+        #@include delete_cluster_task
+
+        #@include task_order
+
+    return dag
+
+
+# **************************** Register every DAG of the config bundle *****************************
+with open(CONFIG_FILE, 'r') as config_file:
+    DAG_CONFIGS = json.load(config_file)["dags"]
+
+for dag_config in DAG_CONFIGS:
+    dag_id = dag_config["dag_id"]
+    if len(dag_id.split('-')) != 5:
+        # One bad entry must not take every other DAG of the bundle down with it
+        logging.error(f"Skipping {dag_id}: DAG name must be <INTLDLDAT>-<DIVISION:SAWM>-<LOAD_TYPE: INC,FULL>-<TARGET_SCHEMA>-<TARGET_TABLE>")
+        continue
+    globals()[dag_id.replace('-', '_')] = create_dag(dag_id, dag_config)
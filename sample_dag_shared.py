@@ -0,0 +1,85 @@
+#@extends sample_dag.py
+# --shared-cluster template: sample_dag.py with the sections below replaced
+
+#@section imports
+#@include imports
+from airflow.utils.task_group import TaskGroup
+#@end
+
+#@section header
+# Shared-cluster DAG: one cluster per table, one task group per banner
+# Task 1. Cluster creation
+# Task 2. Per banner, in parallel: ingestion from ICDS >> upsert target
+# Task 3. Cluster deletion (runs even if a banner failed)
+#@end
+
+#@section mode_settings
+BANNER_TABLES = {"MAK": "mak_physl_invt_doc"}  # banner -> table name passed to --sapTableName
+#@end
+
+#@section ingestion_args
+#@end
+
+#@section ingestion_job
+def icds_ingestion_spark_job(banner, sap_table_name):
+    return {
+        "reference": {"project_id": PROJECT_ID},
+        "placement": {"cluster_name": CLUSTER_NAME},
+        "spark_job": {
+            "main_class": ICDS_INGESTION_MAIN_CLASS,
+            "args": ["--banner", banner, "--sapTableName", sap_table_name, "--dpaasFlag", TRUE_FLAG],
+            "jar_file_uris": JARS_FILES,
+            "properties": dict(ICDS_INGESTION_SPARK_PROP, **{"spark.app.name": f"{ICDS_INGESTION_JOB_NAME}_{banner}"})
+        },
+    }
+#@end
+
+#@section upsert_args
+#@end
+
+#@section upsert_job
+def upsert_target_spark_job(banner, sap_table_name):
+    return {
+        "reference": {"project_id": PROJECT_ID},
+        "placement": {"cluster_name": CLUSTER_NAME},
+        "spark_job": {
+            "main_class": UPSERT_TARGET_MAIN_CLASS,
+            "args": ["--banner", banner, "--sapTableName", sap_table_name, "--bqSync", BQ_SYNC] + hudi_conf_args(sap_table_name),
+            "jar_file_uris": JARS_FILES,
+            "properties": dict(UPSERT_TARGET_SPARK_PROP, **{"spark.app.name": f"{UPSERT_TARGET_JOB_NAME}_{banner}"})
+        },
+    }
+#@end
+
+#@section job_tasks
+    # One independent chain per banner: a failed banner does not stop the others
+    banner_groups = []
+    for banner, sap_table_name in BANNER_TABLES.items():
+        with TaskGroup(group_id=banner.lower()) as banner_group:
+            icds_ingest_spark_task = DataprocSubmitJobOperator(
+                task_id='icds_ingest_to_dl',
+                job=icds_ingestion_spark_job(banner, sap_table_name),
+                region=REGION,
+                project_id=PROJECT_ID,
+                gcp_conn_id=CONN_ID_DPAAS,
+                **DEFER_ARGS
+            )
+
+            upsert_spark_task = DataprocSubmitJobOperator(
+                task_id='upsert_dl_target_table',
+                job=upsert_target_spark_job(banner, sap_table_name),
+                region=REGION,
+                project_id=PROJECT_ID,
+                gcp_conn_id=CONN_ID_DPAAS,
+                **DEFER_ARGS
+            )
+
+            icds_ingest_spark_task >> upsert_spark_task
+        banner_groups.append(banner_group)
+#@end
+
+#@section task_order
+    create_cluster >> banner_groups
+    for banner_group in banner_groups:
+        banner_group >> [delete_cluster, end]
+#@end
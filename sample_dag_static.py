@@ -0,0 +1,47 @@
+#@extends sample_dag.py
+# --static-dags template: sample_dag.py with the sections below replaced. Every value
+# sample_dag.py reads at parse time comes from the STATIC_CONFIG slot instead.
+
+#@section artifactory_url
+#@end
+
+#@section mode_settings
+#@end
+
+#@section param_templates
+# Parse-cheap DAG: every value below was resolved when this file was generated
+# (Airflow Variables, global bucket properties and cluster config), so parsing
+# it makes no Variable.get, metadata DB or GCS calls.
+STATIC_CONFIG = {}
+
+ARTIFACTORY_URL = STATIC_CONFIG["ARTIFACTORY_URL"]
+
+
+#@include param_templates
+#@end
+
+#@section environment
+CCM_URL = STATIC_CONFIG["CCM_URL"]
+DAG_ID = os.path.basename(__file__).replace(".pyc", "").replace(".py", "")
+ENV = STATIC_CONFIG["ENV"]
+#@end
+
+#@section config_readers
+#@end
+
+#@section cluster_config
+GCS_CODE_BUCKET = STATIC_CONFIG["GCS_CODE_BUCKET"]
+CONN_ID_DPAAS = STATIC_CONFIG["CONN_ID_DPAAS"]
+SOFTWARE_CONFIGS = STATIC_CONFIG["SOFTWARE_CONFIGS"]
+
+global_props = STATIC_CONFIG["global_props"]
+team_space = global_props['team_space']
+dpaas_env = global_props['dpaas_env']
+REGION = global_props['region']
+PROJECT_ID = global_props['project_id']
+EMAIL=global_props['email']
+SERVICE_ACCOUNT = STATIC_CONFIG["SERVICE_ACCOUNT"]
+
+CLUSTER_TYPE = 'custom'
+CLUSTER_CONFIG = STATIC_CONFIG["CLUSTER_CONFIG"]
+#@end
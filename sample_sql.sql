@@ -1,4 +1,4 @@
-CREATE EXTERNAL TABLE `sa_mdse_dl_secure.mak_physl_invt_doc`(
+CREATE EXTERNAL TABLE `${schema}.${table}`(
   -- Hudi Meta Columns
   `_hoodie_commit_time` string COMMENT 'Hudi Meta Column',
   `_hoodie_commit_seqno` string COMMENT 'Hudi Meta Column',
@@ -17,14 +17,14 @@ CREATE EXTERNAL TABLE `sa_mdse_dl_secure.mak_physl_invt_doc`(
   `ds_load_ts` timestamp COMMENT 'DS_LOAD_START_TS | Data Load Timestamp'
 
 )
-ROW FORMAT SERDE
+${partitioned_by}ROW FORMAT SERDE
   'org.apache.hadoop.hive.ql.io.parquet.serde.ParquetHiveSerDe'
 WITH SERDEPROPERTIES (
    'hoodie.query.as.ro.table'='false',
-   'path'='gs://86009702bc2c3bcd2c1c64cfb8e9a2e7ed7046d5e4b77786956ff1fe50586d/mak_physl_invt_doc')
+   'path'='${bucket_path}')
 STORED AS INPUTFORMAT
    'org.apache.hudi.hadoop.HoodieParquetInputFormat'
 OUTPUTFORMAT
    'org.apache.hadoop.hive.ql.io.parquet.MapredParquetOutputFormat'
 LOCATION
-   'gs://86009702bc2c3bcd2c1c64cfb8e9a2e7ed7046d5e4b77786956ff1fe50586d/mak_physl_invt_doc'
\ No newline at end of file
+   '${bucket_path}'
\ No newline at end of file
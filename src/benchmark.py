@@ -0,0 +1,316 @@
+"""
+Generation benchmark: run IngestionPipeline end to end on synthetic catalogues
+
+Each size runs in its own subprocess (so peak RSS is per size) inside a
+temporary project directory with a synthetic ingestion.csv,
+FinalBucketInfo.csv and a copy of the DAG/SQL templates. Every size is run
+twice: "cold" renders everything, "warm" re-runs on the unchanged inputs
+and measures the incremental path.
+
+--cold-start times `python main.py --dry-run` on a small catalogue
+instead and fails when the median exceeds COLD_START_BUDGET_S (the default
+path must not import pandas).
+
+Usage (from src/):
+    python benchmark.py                          # 10, 1k, 10k, 100k tables
+    python benchmark.py --sizes 10 1000 --output ../bench_results.json
+    python benchmark.py --cold-start             # CI check for the CLI start-up time
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import resource
+import statistics
+import tempfile
+import subprocess
+from datetime import datetime
+
+from main import IngestionPipeline
+from bucket import get_bucket_registry
+
+DEFAULT_SIZES = [10, 1000, 10000, 100000]
+BANNERS = ["MDD", "MAK", "MSB"]
+SCHEMAS = ["sa_mdse_dl_secure", "sa_mdse_dl_table", "sa_fin_dl_secure", "sa_sc_dl_table"]
+SENSITIVITIES = ["se", "ns", "hs"]
+LOAD_TYPES = ["INC", "FULL"]
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+TEMPLATE_FILES = ["sample_dag.py", "sample_sql.sql"]
+
+# `python main.py --dry-run` on 10 tables: ~0.13s without pandas vs ~0.5s when pandas was imported at start-up
+COLD_START_BUDGET_S = 0.3
+COLD_START_TABLES = 10
+COLD_START_RUNS = 5
+
+INGESTION_HEADER = ("icdsTableName,BANNER_NAME,dataSensitivity,OP-Company code,dlSchemaName,"
+                    "dlTableName,tableLoadType,keyPreCombine,keyPrimaryKey,bucket_id")
+FINAL_BUCKET_HEADER = ("bucketNameType,databaseName,tableName,opCmpnyCd,refreshMode,bucket_name,"
+                       "bucket_given_name,location,env")
+BUCKET_INPUT_HEADER = ("bucketNameType,databaseName,tableName,opCmpnyCd,refreshMode,wmt.storage_uploader,"
+                       "wmt.storage_viewer,isDevBigLake,updateSoftDelete,resourceBucketType")
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return round(rss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def window_peak_rss_mb():
+    """
+    Peak RSS since the previous call in MB, then start a new window
+
+    ru_maxrss only ever grows, so it cannot tell the phases apart. Linux
+    tracks the peak in VmHWM, which writing 5 to /proc/self/clear_refs
+    resets. Returns None where that is not available (e.g. macOS).
+    """
+    try:
+        with open('/proc/self/status') as f:
+            peak_kb = next(int(line.split()[1]) for line in f if line.startswith('VmHWM:'))
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except (OSError, StopIteration, ValueError):
+        return None
+    return round(peak_kb / 1024, 1)
+
+
+def write_catalogue(root, tables):
+    """
+    Create a synthetic project under root: ingestion.csv, buckets/ and templates
+
+    Every table gets all three banners and a bucket in FinalBucketInfo.csv,
+    so the whole catalogue renders without missing-bucket warnings.
+    """
+    os.makedirs(os.path.join(root, "buckets"), exist_ok=True)
+    os.makedirs(os.path.join(root, "src"), exist_ok=True)
+
+    for name in TEMPLATE_FILES:
+        shutil.copyfile(os.path.join(REPO_ROOT, name), os.path.join(root, name))
+
+    with open(os.path.join(root, "ingestion.csv"), 'w') as ingestion, \
+            open(os.path.join(root, "buckets", "FinalBucketInfo.csv"), 'w') as final:
+        ingestion.write(INGESTION_HEADER + "\n")
+        final.write(FINAL_BUCKET_HEADER + "\n")
+
+        for i in range(tables):
+            schema = SCHEMAS[i % len(SCHEMAS)]
+            table = f"BENCH_TBL_{i:06d}"
+            ingestion.write(
+                f'T{i:06d},"{",".join(BANNERS)}",{SENSITIVITIES[i % len(SENSITIVITIES)]},'
+                f'"{",".join("SA-" + b for b in BANNERS)}",{schema},{table},{LOAD_TYPES[i % len(LOAD_TYPES)]},'
+                f'ds_load_ts,"clnt,site,artcl",\n'
+            )
+            for banner in BANNERS:
+                table_name = f"{banner}_{table}".lower()
+                bucket = f"{i:06d}{banner.lower()}".ljust(62, "0")
+                final.write(
+                    f"hash,{schema},{table_name},sa-{banner.lower()},incremental load,{bucket},"
+                    f"prod--{schema}--{table_name},us-east4,prod\n"
+                )
+
+    with open(os.path.join(root, "buckets", "bucket_id.csv"), 'w') as f:
+        f.write("dlTableName,bucket_id\n")
+    with open(os.path.join(root, "buckets", "bucket_input.csv"), 'w') as f:
+        f.write(BUCKET_INPUT_HEADER + "\n")
+
+
+class BenchmarkPipeline(IngestionPipeline):
+    """IngestionPipeline that records wall time and the peak RSS of the phase ending at every phase boundary"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.phase_marks = []
+
+    def start_phase(self, phase, title):
+        self.phase_marks.append((phase, time.perf_counter(), window_peak_rss_mb()))
+        super().start_phase(phase, title)
+
+
+def phase_report(marks, end, end_rss, items):
+    """
+    Turn phase boundary marks into {phase: {wall_s, peak_rss_mb, items, items_per_s}}
+
+    Args:
+        marks: [(phase, start time, peak RSS of the window ending there), ...] in run order
+        end: perf_counter at the end of the run
+        end_rss: peak RSS of the last window
+        items: {phase: number of rows/files the phase processed}
+    """
+    report = {}
+    for index, (phase, start, _) in enumerate(marks):
+        if phase == "SUMMARY":
+            continue
+        # A phase's window closes at the next mark
+        stop, rss = (marks[index + 1][1], marks[index + 1][2]) if index + 1 < len(marks) else (end, end_rss)
+        wall = stop - start
+        count = items.get(phase)
+        report[phase] = {
+            "wall_s": round(wall, 4),
+            "peak_rss_mb": rss,
+            "items": count,
+            "items_per_s": round(count / wall, 1) if count and wall > 0 else None,
+        }
+    return report
+
+
+def run_one(root, label, workers):
+    """Run the pipeline once inside root/src and return the measurements"""
+    os.chdir(os.path.join(root, "src"))
+    setup_rss = window_peak_rss_mb()
+    pipeline = BenchmarkPipeline("../ingestion.csv", env="dev", workers=workers, quiet=True)
+
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull:
+        # Quiet mode still echoes the summary; keep the benchmark output clean
+        pipeline.logger.console = devnull
+        success = pipeline.run()
+    end = time.perf_counter()
+    end_rss = window_peak_rss_mb()
+    # Resetting VmHWM also resets ru_maxrss, so the run peak is the highest window
+    windows = [setup_rss, end_rss] + [rss for _, _, rss in pipeline.phase_marks]
+    run_rss = max(windows) if None not in windows else peak_rss_mb()
+    pipeline.logger.close()
+
+    dags = sum(len(table.dags) for table in pipeline.tables)
+    items = {
+        "VALIDATION": len(pipeline.tables),
+        "BUCKET_EXTRACTION": len(get_bucket_registry()),
+        "GENERATION": dags * 2,
+        "UPLOAD_PLANNING": dags,
+    }
+
+    return {
+        "run": label,
+        "success": success,
+        "tables": len(pipeline.tables),
+        "dags": dags,
+        "files_rendered": getattr(pipeline, "rendered_total", 0),
+        "wall_s": round(end - start, 4),
+        "peak_rss_mb": run_rss,
+        "files_per_s": round(dags * 2 / (end - start), 1) if end > start else None,
+        "phases": phase_report(pipeline.phase_marks, end, end_rss, items),
+    }
+
+
+def run_size(tables, workers, keep=False):
+    """Benchmark one catalogue size in a fresh subprocess per run; returns the list of run results"""
+    root = tempfile.mkdtemp(prefix=f"ingestion_bench_{tables}_")
+    results = []
+    try:
+        write_catalogue(root, tables)
+        for label in ("cold", "warm"):
+            result_file = os.path.join(root, f"result_{label}.json")
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--run-one", root, label, result_file,
+                 "--workers", str(workers)],
+                check=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+            )
+            with open(result_file) as f:
+                results.append(json.load(f))
+    finally:
+        if keep:
+            print(f"  kept {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def measure_cold_start(runs=COLD_START_RUNS, tables=COLD_START_TABLES):
+    """
+    Time `python main.py --dry-run` as a fresh process, the way CI runs it on every PR
+
+    Returns:
+        dict: median/min/max wall time in seconds over runs, and the budget
+    """
+    root = tempfile.mkdtemp(prefix="ingestion_cold_start_")
+    try:
+        write_catalogue(root, tables)
+        shutil.copytree(os.path.dirname(os.path.abspath(__file__)), os.path.join(root, "src"),
+                        dirs_exist_ok=True, ignore=shutil.ignore_patterns("*.log", "*.jsonl", "*.ipynb"))
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "main.py", "--dry-run"], check=True, cwd=os.path.join(root, "src"),
+                           stdout=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "command": "python main.py --dry-run",
+        "tables": tables,
+        "runs": runs,
+        "median_s": round(statistics.median(times), 4),
+        "min_s": round(min(times), 4),
+        "max_s": round(max(times), 4),
+        "budget_s": COLD_START_BUDGET_S,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark DAG/SQL generation on synthetic catalogues')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Number of ingestion rows (x3 banners) per run (default: 10 1000 10000 100000)')
+    parser.add_argument('--workers', '-w', type=int, default=1, help='Pipeline worker threads (default: 1)')
+    parser.add_argument('--output', '-o', default=None,
+                        help='Results JSON (default: benchmark_<timestamp>.json)')
+    parser.add_argument('--keep', action='store_true', help='Keep the temporary project directories')
+    parser.add_argument('--cold-start', action='store_true',
+                        help=f'Only time `python main.py --dry-run` and fail above {COLD_START_BUDGET_S}s')
+    parser.add_argument('--run-one', nargs=3, metavar=('ROOT', 'LABEL', 'RESULT'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_one:
+        root, label, result_file = args.run_one
+        result = run_one(root, label, args.workers)
+        with open(result_file, 'w') as f:
+            json.dump(result, f)
+        return 0
+
+    if args.cold_start:
+        result = measure_cold_start()
+        print(f"{result['command']}: median {result['median_s']:.3f}s "
+              f"(min {result['min_s']:.3f}s, max {result['max_s']:.3f}s, budget {result['budget_s']}s)")
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(result, f, indent=2)
+        if result["median_s"] > COLD_START_BUDGET_S:
+            print("✗ Cold start over budget")
+            return 1
+        print("✓ Cold start within budget")
+        return 0
+
+    output = args.output or f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    report = {
+        "created": datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "workers": args.workers,
+        "results": [],
+    }
+
+    for tables in args.sizes:
+        print(f"Benchmarking {tables} tables x {len(BANNERS)} banners...")
+        for result in run_size(tables, args.workers, keep=args.keep):
+            report["results"].append(result)
+            print(f"  {result['run']:<5} {result['wall_s']:>9.3f}s  {result['peak_rss_mb']:>8.1f} MB  "
+                  f"{result['files_rendered']:>7} files rendered")
+            for phase, stats in result["phases"].items():
+                rate = f"{stats['items_per_s']:>10.1f}/s" if stats["items_per_s"] else ""
+                rss = f"{stats['peak_rss_mb']:>8.1f} MB" if stats["peak_rss_mb"] is not None else f"{'-':>8}   "
+                print(f"        {phase:<18} {stats['wall_s']:>9.3f}s  {rss}  {rate}")
+
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    print(f"\n✓ Results saved to: {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,166 @@
-import pandas as pd
 import os
+import csv
+import shutil
+import sqlite3
+import hashlib
+import threading
+
+from utils import atomic_writer
+
+BUCKET_INPUT_COLUMNS = [
+    'bucketNameType', 'databaseName', 'tableName', 'opCmpnyCd', 'refreshMode',
+    'wmt.storage_uploader', 'wmt.storage_viewer', 'isDevBigLake',
+    'updateSoftDelete', 'resourceBucketType'
+]
+
+# The uploader service account carries the env, so a prod request does not hide the dev one
+BUCKET_KEY_COLUMNS = ('databaseName', 'tableName', 'opCmpnyCd', 'wmt.storage_uploader')
+
+
+def build_bucket_row(dag_config, dlSchemaName, env='prod'):
+    """
+    Build a single bucket_input.csv row from dag_config
+    
+    Args:
+        dag_config: Dictionary with configuration values
+        dlSchemaName: Schema name (e.g., 'sa_mdse_dl_tables')
+        env: Environment (default 'prod')
+        
+    Returns:
+        dict: Bucket request row keyed by BUCKET_INPUT_COLUMNS
+    """
+    # Map sensitivity codes to service account suffix
+    sensitivity_map = {
+        'se': 'ns',
+        'ns': 'ns',
+        'hs': 'hs'
+    }
+    
+    table_name = dag_config.get('table_name')
+    banner_name = dag_config.get('banner_name')
+    sensitivity = dag_config.get('sensitivity', 'ns').lower()
+    load_type = dag_config.get('tableLoadType', 'incremental').lower()
+    
+    sa_suffix = sensitivity_map.get(sensitivity, 'ns')
+    op_cmpny_cd = f"SA-{banner_name.upper()}"
+    service_account = f"svc-dl-sa-afaas-{sa_suffix}@wmt-intl-dl-sa-{sa_suffix}-{env}.iam.gserviceaccount.com"
+    refresh_mode = "incremental load" if load_type == "inc" else f"{load_type} load"
+    
+    return {
+        'bucketNameType': 'hash',
+        'databaseName': dlSchemaName,
+        'tableName': table_name,
+        'opCmpnyCd': op_cmpny_cd,
+        'refreshMode': refresh_mode,
+        'wmt.storage_uploader': service_account,
+        'wmt.storage_viewer': service_account,
+        'isDevBigLake': 'FALSE',
+        'updateSoftDelete': 'DCA Logic',
+        'resourceBucketType': ''
+    }
+
+
+class BucketRequestWriter:
+    """
+    Collect bucket requests for a run and write them to bucket_input.csv once
+    
+    The rows already on disk are indexed on (databaseName, tableName, opCmpnyCd,
+    wmt.storage_uploader) when the writer is opened, so repeated runs do not append duplicates.
+    New rows are kept in memory and appended with a single atomic write on flush().
+    The existing file is streamed into that write, never held in memory, so
+    long runs can also flush periodically (e.g. once per chunk).
+    
+    Usage:
+        with BucketRequestWriter("../buckets/bucket_input.csv", env='dev') as writer:
+            writer.add(dag_config, dlSchemaName)
+    """
+    
+    def __init__(self, output_file="../buckets/bucket_input.csv", env='prod'):
+        self.output_file = output_file
+        self.env = env
+        self.rows = []
+        self._keys = set()
+        self._load_existing()
+    
+    def _load_existing(self):
+        """Read the current file once and index its keys"""
+        if not self._has_content():
+            return
+        
+        with open(self.output_file, 'r', newline='') as f:
+            for row in csv.DictReader(f):
+                self._keys.add(tuple(row.get(col) for col in BUCKET_KEY_COLUMNS))
+    
+    def _has_content(self):
+        return os.path.exists(self.output_file) and os.path.getsize(self.output_file) > 0
+    
+    def add(self, dag_config, dlSchemaName):
+        """
+        Queue a bucket request unless one already exists for the same key
+        
+        Args:
+            dag_config: Dictionary with configuration values
+            dlSchemaName: Schema name (e.g., 'sa_mdse_dl_tables')
+            
+        Returns:
+            bool: True if the row was queued, False if it was a duplicate
+        """
+        bucket_row = build_bucket_row(dag_config, dlSchemaName, env=self.env)
+        key = tuple(bucket_row[col] for col in BUCKET_KEY_COLUMNS)
+        if key in self._keys:
+            return False
+        
+        self._keys.add(key)
+        self.rows.append(bucket_row)
+        return True
+    
+    def flush(self):
+        """
+        Append all queued rows to the output file in a single atomic write
+        
+        Returns:
+            int: Number of rows written
+        """
+        if not self.rows:
+            return 0
+        
+        has_content = self._has_content()
+        
+        with atomic_writer(self.output_file) as out:
+            if has_content:
+                with open(self.output_file, 'r', newline='') as existing:
+                    shutil.copyfileobj(existing, out)
+                    existing.seek(0, os.SEEK_END)
+                    if existing.tell() > 0:
+                        existing.seek(existing.tell() - 1)
+                        if existing.read(1) != '\n':
+                            out.write('\n')
+            
+            writer = csv.DictWriter(out, fieldnames=BUCKET_INPUT_COLUMNS, lineterminator='\n')
+            if not has_content:
+                writer.writeheader()
+            writer.writerows(self.rows)
+        
+        written = len(self.rows)
+        self.rows = []
+        return written
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        return False
+
 
 def create_bucket(dag_config, dlSchemaName, output_file="../buckets/bucket_input.csv", env='prod'):
     """
     Create a bucket input CSV row from dag_config for bucket creation request
     
+    Kept for one-off use (e.g. the notebook). Pipeline runs should open a
+    single BucketRequestWriter instead of calling this per table/banner.
+    
     Args:
         dag_config: Dictionary with configuration values
         dlSchemaName: Schema name (e.g., 'sa_mdse_dl_tables')
@@ -16,62 +172,104 @@ def create_bucket(dag_config, dlSchemaName, output_file="../buckets/bucket_input
     """
     print("Creating bulk bucket ... ")
     try:
-        import pandas as pd
-        
-        # Map sensitivity codes to service account suffix
-        sensitivity_map = {
-            'se': 'ns',
-            'ns': 'ns',
-            'hs': 'hs'
-        }
-        
+        writer = BucketRequestWriter(output_file, env=env)
         table_name = dag_config.get('table_name')
-        banner_name = dag_config.get('banner_name')
-        sensitivity = dag_config.get('sensitivity', 'ns').lower()
-        load_type = dag_config.get('tableLoadType', 'incremental').lower()
-        
-        sa_suffix = sensitivity_map.get(sensitivity, 'ns')
-        op_cmpny_cd = f"SA-{banner_name.upper()}"
-        service_account = f"svc-dl-sa-afaas-{sa_suffix}@wmt-intl-dl-sa-{sa_suffix}-{env}.iam.gserviceaccount.com"
-        refresh_mode = "incremental load" if load_type == "inc" else f"{load_type} load"
-        
-        bucket_row = {
-            'bucketNameType': 'hash',
-            'databaseName': dlSchemaName,
-            'tableName': table_name,
-            'opCmpnyCd': op_cmpny_cd,
-            'refreshMode': refresh_mode,
-            'wmt.storage_uploader': service_account,
-            'wmt.storage_viewer': service_account,
-            'isDevBigLake': 'FALSE',
-            'updateSoftDelete': 'DCA Logic',
-            'resourceBucketType': ''
-        }
-        
-        file_exists = os.path.exists(output_file)
-        df_row = pd.DataFrame([bucket_row])
-        
-        if file_exists and os.path.getsize(output_file) > 0:
-            df_existing = pd.read_csv(output_file)
-            df_combined = pd.concat([df_existing, df_row], ignore_index=True)
-            df_combined.to_csv(output_file, index=False)
-        else:
-            df_row.to_csv(output_file, index=False)
         
-        print(f"✓ Added bucket entry for {table_name} to {output_file}")
+        if writer.add(dag_config, dlSchemaName):
+            writer.flush()
+            print(f"✓ Added bucket entry for {table_name} to {output_file}")
+        else:
+            print(f"✓ Bucket entry for {table_name} already in {output_file}")
         return output_file
         
     except Exception as e:
         print(f"Error creating bucket entry: {e}")
         raise
 
-def extract_bucket_id(final_bucket_info_file="../buckets/FinalBucketInfo.csv", output_file="../buckets/bucket_id.csv"):
+def _file_stamp(path):
+    """mtime/size stamp used to detect a changed file without reading it"""
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def default_store_file(bucket_csv_file):
+    """SQLite store that sits next to bucket_id.csv (bucket_id.csv -> bucket_id.sqlite)"""
+    return os.path.splitext(bucket_csv_file)[0] + '.sqlite'
+
+
+def _open_store(store_file):
+    conn = sqlite3.connect(store_file, check_same_thread=False)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS bucket_ids (
+            dlTableName TEXT PRIMARY KEY,
+            bucket_id TEXT NOT NULL
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        ) WITHOUT ROWID;
+    """)
+    return conn
+
+
+def _read_meta(conn):
+    return dict(conn.execute("SELECT key, value FROM meta"))
+
+
+def has_bucket_id(bucket_id):
+    """False for a missing or blank bucket id; both lookups treat such a table as not found"""
+    return bucket_id is not None and str(bucket_id).strip() != ''
+
+
+def read_bucket_mapping(final_bucket_info_file):
+    """
+    Read {lowercased tableName: bucket_name} from FinalBucketInfo.csv, first occurrence wins
+    
+    Only the two needed columns are kept; the export also has ~20 others incl.
+    wide labels dicts. Missing values are None.
+    
+    Raises:
+        ValueError: If the tableName or bucket_name column is missing
+    """
+    mapping = {}
+    with open(final_bucket_info_file, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        missing = [col for col in ('tableName', 'bucket_name') if col not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Missing columns in {final_bucket_info_file}: {missing}")
+        
+        for row in reader:
+            table_name = row['tableName'] or None
+            if table_name is not None:
+                table_name = table_name.lower()
+            if table_name not in mapping:
+                mapping[table_name] = row['bucket_name'] or None
+    return mapping
+
+
+def extract_bucket_id(final_bucket_info_file="../buckets/FinalBucketInfo.csv", output_file="../buckets/bucket_id.csv",
+                      store_file=None, force=False):
     """
     Extract table name and bucket id from FinalBucketInfo.csv and create bucket_id.csv
     
+    The mapping is also written to an indexed SQLite store (bucket_id.sqlite
+    next to bucket_id.csv) that get_bucket_id can query directly. The step is
+    skipped when FinalBucketInfo.csv is unchanged since the last extraction:
+    first by mtime/size, then by content hash.
+    
     Args:
         final_bucket_info_file: Path to the source FinalBucketInfo.csv file
         output_file: Path to save the output bucket_id.csv file
+        store_file: Path of the SQLite store (default: next to output_file)
+        force: Re-extract even if the source is unchanged
         
     Returns:
         str: Path to the generated bucket_id.csv file
@@ -80,29 +278,63 @@ def extract_bucket_id(final_bucket_info_file="../buckets/FinalBucketInfo.csv", o
         FileNotFoundError: If FinalBucketInfo.csv is not found
     """
     
+    store_file = store_file or default_store_file(output_file)
+    
     try:
-        # Read the FinalBucketInfo.csv file
-        final_bucket_df = pd.read_csv(final_bucket_info_file)
-        
-        # Extract required columns
-        bucket_mapping = final_bucket_df[['tableName', 'bucket_name']].copy()
+        source_stamp = _file_stamp(final_bucket_info_file)
+        conn = _open_store(store_file)
         
-        # Rename columns to match expected format
-        bucket_mapping.columns = ['dlTableName', 'bucket_id']
-        
-        # Convert tableName to lowercase format
-        bucket_mapping['dlTableName'] = bucket_mapping['dlTableName'].str.lower()
-        
-        # Remove duplicates if any
-        bucket_mapping = bucket_mapping.drop_duplicates(subset=['dlTableName'])
-        
-        # Save to bucket_id.csv
-        bucket_mapping.to_csv(output_file, index=False)
+        try:
+            meta = _read_meta(conn)
+            outputs_current = (
+                os.path.exists(output_file)
+                and meta.get('csv_stamp') == _file_stamp(output_file)
+            )
+            
+            # No-op runs stop here without reading the export at all
+            if not force and outputs_current and meta.get('source_stamp') == source_stamp:
+                print(f"✓ {final_bucket_info_file} unchanged, skipping extraction")
+                return output_file
+            
+            source_hash = _file_sha256(final_bucket_info_file)
+            if not force and outputs_current and meta.get('source_sha256') == source_hash:
+                with conn:
+                    conn.execute("INSERT OR REPLACE INTO meta VALUES ('source_stamp', ?)", (source_stamp,))
+                print(f"✓ {final_bucket_info_file} content unchanged, skipping extraction")
+                return output_file
+            
+            # Lowercased table name -> bucket id, duplicates removed (first one wins)
+            bucket_mapping = read_bucket_mapping(final_bucket_info_file)
+            
+            # Save to bucket_id.csv
+            with atomic_writer(output_file) as f:
+                writer = csv.writer(f, lineterminator='\n')
+                writer.writerow(['dlTableName', 'bucket_id'])
+                writer.writerows(bucket_mapping.items())
+            
+            # Replace the indexed store contents and remember what it was built from
+            with conn:
+                conn.execute("DELETE FROM bucket_ids")
+                conn.executemany(
+                    "INSERT INTO bucket_ids (dlTableName, bucket_id) VALUES (?, ?)",
+                    [(t, b) for t, b in bucket_mapping.items() if t and has_bucket_id(b)]
+                )
+                conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+                    ('source_stamp', source_stamp),
+                    ('source_sha256', source_hash),
+                    ('csv_stamp', _file_stamp(output_file)),
+                ])
+        finally:
+            conn.close()
         
         print(f"✓ Successfully created {output_file}")
         print(f"✓ Extracted {len(bucket_mapping)} table-bucket mappings")
+        blank = sorted(t for t, b in bucket_mapping.items() if t and not has_bucket_id(b))
+        if blank:
+            print(f"⚠ {len(blank)} table(s) without a bucket_name in {final_bucket_info_file} (reported as not found): {blank[:20]}")
         print(f"\nSample mappings:")
-        print(bucket_mapping.head())
+        for dlTableName, bucket_id in list(bucket_mapping.items())[:5]:
+            print(f"  {dlTableName}: {bucket_id}")
         
         return output_file
         
@@ -113,7 +345,219 @@ def extract_bucket_id(final_bucket_info_file="../buckets/FinalBucketInfo.csv", o
         print(f"Error processing file: {e}")
         raise
 
-def get_bucket_id(dag_config):
+class BucketRegistry:
+    """
+    In-memory dlTableName -> bucket_id mapping backed by bucket_id.csv
+    
+    The file is parsed once into a dict and only re-read when its mtime or
+    size changes, so lookups for thousands of DAGs cost a dict access each.
+    
+    Usage:
+        registry = BucketRegistry("../buckets/bucket_id.csv")
+        missing = registry.missing(table_names)
+        bucket_ids = registry.get_many(table_names)
+    """
+    
+    def __init__(self, bucket_csv_file="../buckets/bucket_id.csv"):
+        self.bucket_csv_file = bucket_csv_file
+        self._mapping = {}
+        self._stamp = None
+        self._static = False
+    
+    @classmethod
+    def from_mapping(cls, mapping, source):
+        """
+        Registry over an in-memory mapping that never touches the disk
+        
+        Used by dry runs to look up the bucket ids a real run would extract,
+        straight from FinalBucketInfo.csv (see read_bucket_mapping).
+        
+        Args:
+            mapping: dlTableName -> bucket_id; tables with no or a blank bucket id are left out
+            source: File name used in "not found" messages
+        """
+        registry = cls(source)
+        registry._mapping = {t: b for t, b in mapping.items() if t and has_bucket_id(b)}
+        registry._static = True
+        return registry
+    
+    def _file_stamp(self):
+        stat = os.stat(self.bucket_csv_file)
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def refresh(self):
+        """
+        Reload the mapping if bucket_id.csv changed since the last load
+        
+        Returns:
+            bool: True if the file was (re)loaded
+            
+        Raises:
+            FileNotFoundError: If bucket_id.csv is not found
+        """
+        if self._static:
+            return False
+        
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return False
+        
+        mapping = {}
+        with open(self.bucket_csv_file, 'r', newline='') as f:
+            for row in csv.DictReader(f):
+                # First occurrence wins, same as the previous iloc[0] lookup
+                mapping.setdefault(row['dlTableName'], row['bucket_id'])
+        
+        # A blank bucket id is not found, the same as in the SQLite BucketStore
+        self._mapping = {t: b for t, b in mapping.items() if t and has_bucket_id(b)}
+        self._stamp = stamp
+        return True
+    
+    def get(self, table_name):
+        """
+        Return the bucket id for a single table
+        
+        Raises:
+            ValueError: If table_name is not found in bucket_id.csv or its bucket id is blank
+        """
+        self.refresh()
+        try:
+            return self._mapping[table_name]
+        except KeyError:
+            raise ValueError(f"Table '{table_name}' not found in {self.bucket_csv_file}") from None
+    
+    def get_many(self, table_names):
+        """
+        Bulk lookup for a list of table names
+        
+        Returns:
+            dict: table_name -> bucket_id for every table that has a bucket
+        """
+        self.refresh()
+        return {t: self._mapping[t] for t in table_names if t in self._mapping}
+    
+    def missing(self, table_names):
+        """
+        Return the set of table names that have no bucket in bucket_id.csv
+        """
+        self.refresh()
+        return set(table_names) - self._mapping.keys()
+    
+    def __contains__(self, table_name):
+        self.refresh()
+        return table_name in self._mapping
+    
+    def __len__(self):
+        self.refresh()
+        return len(self._mapping)
+
+
+class BucketStore:
+    """
+    dlTableName -> bucket_id lookups against the SQLite store written by extract_bucket_id
+    
+    Same interface as BucketRegistry, but nothing is loaded up front: each
+    lookup is a primary-key query, and bulk lookups are batched IN queries.
+    """
+    
+    BATCH_SIZE = 500
+    
+    def __init__(self, store_file, bucket_csv_file="../buckets/bucket_id.csv"):
+        self.store_file = store_file
+        self.bucket_csv_file = bucket_csv_file
+        self._conn = _open_store(store_file)
+        self._lock = threading.Lock()
+    
+    def is_current(self):
+        """True if the store still matches bucket_id.csv (i.e. the CSV was not edited by hand)"""
+        try:
+            csv_stamp = _file_stamp(self.bucket_csv_file)
+        except FileNotFoundError:
+            return False
+        with self._lock:
+            return _read_meta(self._conn).get('csv_stamp') == csv_stamp
+    
+    def get(self, table_name):
+        """
+        Return the bucket id for a single table
+        
+        Raises:
+            ValueError: If table_name is not found in bucket_id.csv or its bucket id is blank
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT bucket_id FROM bucket_ids WHERE dlTableName = ?", (table_name,)
+            ).fetchone()
+        if row is None:
+            raise ValueError(f"Table '{table_name}' not found in {self.bucket_csv_file}")
+        return row[0]
+    
+    def get_many(self, table_names):
+        """
+        Bulk lookup for a list of table names
+        
+        Returns:
+            dict: table_name -> bucket_id for every table that has a bucket
+        """
+        names = list(dict.fromkeys(table_names))
+        found = {}
+        with self._lock:
+            for start in range(0, len(names), self.BATCH_SIZE):
+                batch = names[start:start + self.BATCH_SIZE]
+                placeholders = ','.join('?' * len(batch))
+                found.update(self._conn.execute(
+                    f"SELECT dlTableName, bucket_id FROM bucket_ids WHERE dlTableName IN ({placeholders})", batch
+                ))
+        return found
+    
+    def missing(self, table_names):
+        """
+        Return the set of table names that have no bucket in bucket_id.csv
+        """
+        names = set(table_names)
+        return names - self.get_many(names).keys()
+    
+    def __contains__(self, table_name):
+        return bool(self.get_many([table_name]))
+    
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM bucket_ids").fetchone()[0]
+    
+    def close(self):
+        self._conn.close()
+
+
+_registries = {}
+
+
+def get_bucket_registry(bucket_csv_file="../buckets/bucket_id.csv", store_file=None):
+    """
+    Return the shared bucket lookup for a bucket_id.csv path
+    
+    Uses the SQLite BucketStore written by extract_bucket_id when it is in
+    sync with bucket_id.csv, and the in-memory BucketRegistry over the CSV
+    otherwise (no store yet, or the CSV was edited by hand).
+    """
+    store_file = store_file or default_store_file(bucket_csv_file)
+    registry = _registries.get(bucket_csv_file)
+    
+    if isinstance(registry, BucketStore) and registry.is_current():
+        return registry
+    
+    if os.path.exists(store_file):
+        store = BucketStore(store_file, bucket_csv_file)
+        if store.is_current():
+            _registries[bucket_csv_file] = store
+            return store
+        store.close()
+    
+    if not isinstance(registry, BucketRegistry):
+        registry = _registries[bucket_csv_file] = BucketRegistry(bucket_csv_file)
+    return registry
+
+
+def get_bucket_id(dag_config, registry=None):
     """
     Read bucket id from a bucket_id.csv file based on table name
     
@@ -124,6 +568,8 @@ def get_bucket_id(dag_config):
     
     Args:
         dag_config: Dictionary containing 'table_name' key
+        registry: BucketRegistry to look up in (default: shared registry
+            for ../buckets/bucket_id.csv)
         
     Returns:
         bucket_id: The GCS bucket ID for the table
@@ -133,26 +579,18 @@ def get_bucket_id(dag_config):
         ValueError: If table_name is not found in the CSV
     """
     
+    if registry is None:
+        registry = get_bucket_registry()
+    bucket_csv_file = registry.bucket_csv_file
+    
     try:
-        bucket_csv_file = "../buckets/bucket_id.csv"
-        
-        # Read the CSV file
-        bucket_df = pd.read_csv(bucket_csv_file)
-        
         # Extract table name from dag_config
         table_name = dag_config.get('table_name')
         
         if not table_name:
             raise ValueError("table_name not found in dag_config")
         
-        # Find matching row
-        matching_rows = bucket_df[bucket_df['dlTableName'] == table_name]
-        
-        if matching_rows.empty:
-            raise ValueError(f"Table '{table_name}' not found in {bucket_csv_file}")
-        
-        # Get bucket_id from the first matching row
-        bucket_id = matching_rows.iloc[0]['bucket_id']
+        bucket_id = registry.get(table_name)
         
         print(f"✓ Retrieved bucket_id for {table_name}: {bucket_id}")
         return bucket_id
@@ -162,4 +600,4 @@ def get_bucket_id(dag_config):
         raise
     except ValueError as e:
         print(f"Error: {e}")
-        raise
\ No newline at end of file
+        raise
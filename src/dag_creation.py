@@ -1,93 +1,576 @@
 import os
-def prepare_dag_file(sample_dag_file, dag_config):
+import re
+import json
+import time
+import pprint
+import hashlib
+
+from field_catalogue import render_columns, render_partitioned_by
+
+
+def _render_tags(dag_config):
+    tags_str = str(dag_config["tags"]).replace("'", '"')
+    return f'TAGS = {tags_str}\n'
+
+
+# Slot name -> (line prefix in the template, renderer for the replacement line)
+DAG_TEMPLATE_SLOTS = {
+    'SENSITIVITY': ('SENSITIVITY=', lambda c: f'SENSITIVITY="{c["sensitivity"]}"\n'),
+    'CLUSTER_NAME': ('CLUSTER_NAME =', lambda c: f'CLUSTER_NAME = "{c["cluster_name"]}"\n'),
+    'BANNER_NAME': ('BANNER_NAME=', lambda c: f'BANNER_NAME="{c["banner_name"]}"\n'),
+    'TABLE_NAME': ('TABLE_NAME=', lambda c: f'TABLE_NAME="{c["table_name"]}" #SAP table name\n'),
+    'TAGS': ('TAGS =', _render_tags),
+}
+
+
+def _render_static_config(dag_config):
+    values = pprint.pformat(dag_config["static_config"], width=120, sort_dicts=True)
+    return f'STATIC_CONFIG = {values}\n'
+
+
+def _render_banner_tables(dag_config):
+    return f'BANNER_TABLES = {json.dumps(dag_config["banner_tables"])}  # banner -> table name passed to --sapTableName\n'
+
+
+def _render_batch_tasks(dag_config):
+    return f'BATCH_TASKS = {json.dumps(dag_config["batch_tasks"])}  # [banner, table name passed to --sapTableName] per task pair\n'
+
+
+def _render_param_defaults(dag_config):
+    values = json.dumps(dag_config.get("param_defaults") or {})
+    return f'PARAM_DEFAULTS = {values}  # dag_params defaults sized from --table-stats (empty: the defaults below)\n'
+
+
+def _render_hudi_options(dag_config):
+    values = json.dumps(dag_config.get("hudi_options") or {})
+    return f'HUDI_OPTIONS = {values}  # Hudi write configs of the upsert job per --sapTableName, from ingestion.csv\n'
+
+
+# PROD cron schedule of a DAG without a --schedule-window slot
+DEFAULT_PROD_SCHEDULE = "0 22 * * *"
+
+
+def _render_prod_schedule(dag_config):
+    schedule = dag_config.get("schedule") or DEFAULT_PROD_SCHEDULE
+    return f'PROD_SCHEDULE = "{schedule}"  # cron slot (UTC) assigned by --schedule-window\n'
+
+
+# Polling interval of --deferrable without a value: Spark jobs run for minutes, not seconds
+DEFAULT_DEFERRABLE_POLL_SECONDS = 60
+
+
+def _render_deferrable_poll_seconds(dag_config):
+    seconds = int(dag_config.get("deferrable_poll_seconds") or 0)
+    return f'DEFERRABLE_POLL_SECONDS = {seconds}  # --deferrable polling interval of the Dataproc tasks (0: blocking operators)\n'
+
+
+# Slots a template may contain (filled when present, not required)
+OPTIONAL_DAG_TEMPLATE_SLOTS = {
+    'STATIC_CONFIG': ('STATIC_CONFIG =', _render_static_config),
+    'BANNER_TABLES': ('BANNER_TABLES =', _render_banner_tables),
+    'BATCH_TASKS': ('BATCH_TASKS =', _render_batch_tasks),
+    'PARAM_DEFAULTS': ('PARAM_DEFAULTS =', _render_param_defaults),
+    'HUDI_OPTIONS': ('HUDI_OPTIONS =', _render_hudi_options),
+    'PROD_SCHEDULE': ('PROD_SCHEDULE =', _render_prod_schedule),
+    'DEFERRABLE_POLL_SECONDS': ('DEFERRABLE_POLL_SECONDS =', _render_deferrable_poll_seconds),
+    'MAX_ACTIVE_TASKS': ('MAX_ACTIVE_TASKS =', lambda c: f'MAX_ACTIVE_TASKS = {int(c["max_active_tasks"])}  # task pairs running on the cluster at the same time\n'),
+}
+
+_ALL_DAG_TEMPLATE_SLOTS = {**DAG_TEMPLATE_SLOTS, **OPTIONAL_DAG_TEMPLATE_SLOTS}
+
+
+class DagTemplate:
     """
-    Generate a customized DAG file from template using string replacement
+    Sample DAG parsed once into static text chunks and slot positions
     
-    Args:
-        sample_dag_file: Path to template DAG file
-        dag_config: Dictionary with configuration values
-        output_file: Path to output file
+    Rendering fills the SENSITIVITY, CLUSTER_NAME, BANNER_NAME, TABLE_NAME and
+    TAGS slots (plus any OPTIONAL_DAG_TEMPLATE_SLOTS the template has) and joins
+    the precomputed pieces, so the template file is read and scanned only once
+    per run.
     """
     
-    output_dir = dag_config['output_dir']
-    os.makedirs(output_dir, exist_ok=True)
-    
-    output_file = os.path.join(output_dir, f"{dag_config['dag_name']}.py")
+    def __init__(self, pieces, slots, source=None, digest=None):
+        self.pieces = pieces
+        self.slots = slots
+        self.source = source
+        self.digest = digest
     
-    with open(sample_dag_file, 'r') as file:
-        lines = file.readlines()
-    
-    updated_lines = []
-    for line in lines:
-        new_line = line
+    @classmethod
+    def compile(cls, text, source=None):
+        """
+        Compile template text into static chunks plus slot positions
         
-        # Edit1: Replace SENSITIVITY
-        if line.strip().startswith('SENSITIVITY='):
-            new_line = f'SENSITIVITY="{dag_config["sensitivity"]}"\n'
+        Args:
+            text: Contents of the sample DAG file
+            source: Template path, used in error messages
+            
+        Returns:
+            DagTemplate: The compiled template
+            
+        Raises:
+            ValueError: If any of DAG_TEMPLATE_SLOTS is missing from the template
+        """
+        pieces = []
+        slots = []
+        static = []
         
-        # Edit2: Replace CLUSTER_NAME
-        elif line.strip().startswith('CLUSTER_NAME ='):
-            new_line = f'CLUSTER_NAME = "{dag_config["cluster_name"]}"\n'
+        for line in text.splitlines(keepends=True):
+            stripped = line.strip()
+            slot = next((name for name, (prefix, _) in _ALL_DAG_TEMPLATE_SLOTS.items() if stripped.startswith(prefix)), None)
+            if slot is None:
+                static.append(line)
+                continue
+            if static:
+                pieces.append(''.join(static))
+                static = []
+            slots.append((len(pieces), slot))
+            pieces.append(None)
         
-        # Edit3: Replace BANNER_NAME
-        elif line.strip().startswith('BANNER_NAME='):
-            new_line = f'BANNER_NAME="{dag_config["banner_name"]}"\n'
+        if static:
+            pieces.append(''.join(static))
         
-        # Edit4: Replace TABLE_NAME
-        elif line.strip().startswith('TABLE_NAME='):
-            new_line = f'TABLE_NAME="{dag_config["table_name"]}" #SAP table name\n'
+        missing = [name for name in DAG_TEMPLATE_SLOTS if name not in {slot for _, slot in slots}]
+        if missing:
+            raise ValueError(f"DAG template {source or '<string>'} is missing slot(s): {missing}")
         
-        # Edit5: Replace TAGS
-        elif line.strip().startswith('TAGS ='):
-            tags_str = str(dag_config["tags"]).replace("'", '"')
-            new_line = f'TAGS = {tags_str}\n'
+        return cls(pieces, slots, source, digest=hashlib.sha256(text.encode()).hexdigest())
+    
+    def has_slot(self, name):
+        return any(slot == name for _, slot in self.slots)
+    
+    def render(self, dag_config):
+        """Return the DAG file contents for dag_config"""
+        pieces = list(self.pieces)
+        for index, slot in self.slots:
+            pieces[index] = _ALL_DAG_TEMPLATE_SLOTS[slot][1](dag_config)
+        return ''.join(pieces)
+
+
+# Template sections: sample_dag.py marks its blocks with "#@section <name>" ... "#@end" lines
+# (a section without "#@end" runs to the end of the file). The mode templates reuse them:
+#   "#@extends <base>" - the base with the sections of this file replacing the same-named ones
+#   "#@base <base>"    - this file as is, with every "#@include <name>" line replaced by that section
+# An included section is indented like the "#@include" line. Marker lines never reach the output.
+TEMPLATE_SECTION = '#@section '
+TEMPLATE_SECTION_END = '#@end'
+TEMPLATE_EXTENDS = '#@extends '
+TEMPLATE_BASE = '#@base '
+TEMPLATE_INCLUDE = '#@include '
+
+
+def parse_template_sections(text, source=None):
+    """
+    Split template text into plain text and named sections, dropping the marker lines
+    
+    Args:
+        text: Template text
+        source: Template path, used in error messages
+    
+    Returns:
+        list: [(section name or None for plain text, [lines])] in file order
+    
+    Raises:
+        ValueError: On a nested or duplicate section or a stray "#@end"
+    """
+    parts = [(None, [])]
+    names = set()
+    
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped.startswith(TEMPLATE_SECTION):
+            name = stripped[len(TEMPLATE_SECTION):].strip()
+            if parts[-1][0] is not None:
+                raise ValueError(f"DAG template {source or '<string>'}: section '{name}' starts inside '{parts[-1][0]}'")
+            if name in names:
+                raise ValueError(f"DAG template {source or '<string>'}: duplicate section '{name}'")
+            names.add(name)
+            parts.append((name, []))
+        elif stripped == TEMPLATE_SECTION_END:
+            if parts[-1][0] is None:
+                raise ValueError(f"DAG template {source or '<string>'}: {TEMPLATE_SECTION_END} outside a section")
+            parts.append((None, []))
+        else:
+            parts[-1][1].append(line)
+    
+    return [(name, lines) for name, lines in parts if name is not None or lines]
+
+
+def _expand_includes(lines, sections, source):
+    """Replace each "#@include <name>" line with the lines of that base section, indented like the include"""
+    expanded = []
+    for line in lines:
+        stripped = line.strip()
+        if not stripped.startswith(TEMPLATE_INCLUDE):
+            expanded.append(line)
+            continue
+        name = stripped[len(TEMPLATE_INCLUDE):].strip()
+        if name not in sections:
+            raise ValueError(f"DAG template {source}: no section '{name}' to include")
+        indent = line[:len(line) - len(line.lstrip())]
+        for included in sections[name]:
+            included = included if included.endswith('\n') else included + '\n'
+            expanded.append(indent + included if included.strip() else included)
+    return expanded
+
+
+def compose_dag_template(sample_dag_file):
+    """
+    Return the text of a sample DAG file with its #@extends / #@base template resolved
+    
+    Args:
+        sample_dag_file: Path to the template; a base path is relative to its directory
+    
+    Returns:
+        tuple: (template text without marker lines, [paths read])
+    
+    Raises:
+        ValueError: If the template overrides or includes a section the base does not
+            have, or has code outside a section of an #@extends template
+    """
+    with open(sample_dag_file, 'r') as file:
+        text = file.read()
+    
+    directive, _, rest = text.partition('\n')
+    if not directive.startswith((TEMPLATE_EXTENDS, TEMPLATE_BASE)):
+        return ''.join(line for _, lines in parse_template_sections(text, sample_dag_file) for line in lines), [sample_dag_file]
+    
+    base_file = os.path.join(os.path.dirname(sample_dag_file), directive.split(None, 1)[1].strip())
+    with open(base_file, 'r') as file:
+        base_text = file.read()
+    base_parts = parse_template_sections(base_text, base_file)
+    sections = {name: lines for name, lines in base_parts if name is not None}
+    
+    if directive.startswith(TEMPLATE_BASE):
+        return ''.join(_expand_includes(rest.splitlines(keepends=True), sections, sample_dag_file)), [sample_dag_file, base_file]
+    
+    overrides = {}
+    for name, lines in parse_template_sections(rest, sample_dag_file):
+        if name is None:
+            if any(line.strip() and not line.lstrip().startswith('#') for line in lines):
+                raise ValueError(f"DAG template {sample_dag_file}: code outside a section of an {TEMPLATE_EXTENDS.strip()} template")
+            continue
+        if name not in sections:
+            raise ValueError(f"DAG template {sample_dag_file}: {base_file} has no section '{name}'")
+        overrides[name] = _expand_includes(lines, sections, sample_dag_file)
+    
+    composed = ''.join(line for name, lines in base_parts for line in overrides.get(name, lines))
+    # Keep the base's end of file (sample_dag.py has no trailing newline)
+    if not base_text.endswith('\n'):
+        composed = composed.rstrip('\n')
+    return composed, [sample_dag_file, base_file]
+
+
+_dag_templates = {}
+
+
+def _template_stamp(paths):
+    return tuple((stat.st_mtime_ns, stat.st_size) for stat in map(os.stat, paths))
+
+
+def get_dag_template(sample_dag_file):
+    """
+    Return the compiled DagTemplate for a sample DAG file
+    
+    The compiled template is cached per path and recompiled only when the
+    mtime or size of the file or of the base it extends changes.
+    """
+    cached = _dag_templates.get(sample_dag_file)
+    if cached is not None and cached[0] == _template_stamp(cached[1]):
+        return cached[2]
+    
+    text, paths = compose_dag_template(sample_dag_file)
+    template = DagTemplate.compile(text, source=sample_dag_file)
+    
+    _dag_templates[sample_dag_file] = (_template_stamp(paths), paths, template)
+    return template
+
+
+def dag_output_path(dag_config):
+    """Return the path prepare_dag_file writes for dag_config"""
+    return os.path.join(dag_config['output_dir'], f"{dag_config['dag_name']}.py")
+
+
+def sql_output_path(dag_config):
+    """Return the path prepare_sql_file writes for dag_config"""
+    return os.path.join(dag_config['output_dir'], f"{dag_config['table_name']}.sql")
+
+
+def _add_time(timings, key, start):
+    """Add the seconds since start to timings[key] and return the current time"""
+    now = time.perf_counter()
+    if timings is not None:
+        timings[key] = timings.get(key, 0.0) + (now - start)
+    return now
+
+
+def render_dag_content(sample_dag_file, dag_config):
+    """Return the DAG file content for dag_config without writing anything"""
+    return get_dag_template(sample_dag_file).render(dag_config)
+
+
+def prepare_dag_file(sample_dag_file, dag_config, timings=None):
+    """
+    Generate a customized DAG file from the compiled sample DAG template
+    
+    Args:
+        sample_dag_file: Path to template DAG file
+        dag_config: Dictionary with configuration values
+        timings: Optional dict; seconds spent are added under 'render' and 'write'
         
-        updated_lines.append(new_line)
+    Returns:
+        str: Path to the generated DAG file
+    """
+    
+    start = time.perf_counter()
+    output_file = dag_output_path(dag_config)
+    
+    content = render_dag_content(sample_dag_file, dag_config)
+    start = _add_time(timings, 'render', start)
     
     # Write updated content to new file
+    os.makedirs(dag_config['output_dir'], exist_ok=True)
     with open(output_file, 'w') as file:
-        file.writelines(updated_lines)
+        file.write(content)
+    _add_time(timings, 'write', start)
         
     return output_file
 
-def prepare_sql_file(sample_sql_file, dag_config, dlSchemaName, dlTableName,bucket_id):
+
+# --dag-factory: one factory module plus one config bundle instead of a DAG file per DagSpec
+DAG_FACTORY_DIR = "../output/dag_factory"
+DAG_FACTORY_MODULE = "INTLDLDAT-DAG-FACTORY.py"
+DAG_FACTORY_CONFIG = "INTLDLDAT-DAG-FACTORY.json"
+DAG_FACTORY_CONFIG_VERSION = 1
+
+# Per-DAG values of a bundle entry (what the slot lines of sample_dag.py hold)
+DAG_FACTORY_ENTRY_KEYS = ('sensitivity', 'cluster_name', 'banner_name', 'table_name', 'tags')
+
+
+def dag_factory_entry(dag_config):
+    """Return the config bundle entry of one DAG: its id, its slot values and the optional per-DAG settings"""
+    entry = {'dag_id': dag_config['dag_name']}
+    for key in DAG_FACTORY_ENTRY_KEYS:
+        entry[key] = dag_config[key]
+    if dag_config.get('hudi_options'):
+        entry['hudi_options'] = dag_config['hudi_options']
+    if dag_config.get('param_defaults'):
+        entry['params'] = dag_config['param_defaults']
+    if dag_config.get('schedule'):
+        entry['schedule'] = dag_config['schedule']
+    if dag_config.get('deferrable_poll_seconds'):
+        entry['deferrable_poll_seconds'] = dag_config['deferrable_poll_seconds']
+    return entry
+
+
+def render_dag_factory_config(entries):
+    """
+    Return the config bundle text for the factory module
+    
+    One compact JSON object per line, sorted by dag_id, so the bundle stays
+    small and a re-run only changes the lines of the DAGs that changed.
     """
-    Generate a customized SQL file from template using string replacement
+    lines = [json.dumps(entry, separators=(',', ':')) for entry in sorted(entries, key=lambda e: e['dag_id'])]
+    return '{"version":%d,"dags":[\n%s\n]}\n' % (DAG_FACTORY_CONFIG_VERSION, ',\n'.join(lines))
+
+
+def render_dag_factory(sample_factory_file, entries, output_dir=DAG_FACTORY_DIR):
+    """
+    Render the factory module and its config bundle without writing anything
     
     Args:
-        sample_sql_file: Path to template SQL file
-        dag_config: Dictionary with configuration values
-        dlSchemaName: Schema name
-        dlTableName: Table name
+        sample_factory_file: Path to the factory module (copied with its #@include sections resolved)
+        entries: dag_factory_entry() of every DAG to register
+        output_dir: Directory the two files go to
+        
+    Returns:
+        list: [(module path, content), (config path, content)]
+        
+    Raises:
+        ValueError: If the factory module does not read DAG_FACTORY_CONFIG
+    """
+    module, _ = compose_dag_template(sample_factory_file)
+    if DAG_FACTORY_CONFIG not in module:
+        raise ValueError(f"DAG factory {sample_factory_file} does not load {DAG_FACTORY_CONFIG}")
+    
+    return [
+        (os.path.join(output_dir, DAG_FACTORY_MODULE), module),
+        (os.path.join(output_dir, DAG_FACTORY_CONFIG), render_dag_factory_config(entries)),
+    ]
+
+SQL_PLACEHOLDER_PATTERN = re.compile(r'\$\{(\w+)\}')
+
+# Named placeholders every SQL template must contain
+SQL_TEMPLATE_PLACEHOLDERS = ('schema', 'table', 'bucket_path')
+
+# Placeholders a template may contain (rendered empty unless given)
+OPTIONAL_SQL_TEMPLATE_PLACEHOLDERS = ('partitioned_by',)
+
+# Lines around the manual column section; with --field-catalogue the section becomes the ${columns} slot
+SQL_COLUMNS_START = '-- START'
+SQL_COLUMNS_END = '--- END ---'
+
+
+class SqlTemplate:
+    """
+    Sample DDL precompiled into static chunks around ${name} placeholders
+    
+    Placeholders: ${schema}, ${table} and ${bucket_path}, optionally
+    ${partitioned_by}. The manual column section between the SQL_COLUMNS_START
+    and SQL_COLUMNS_END lines is the "columns" slot, which keeps the section
+    text unless columns are given. Rendering is a single join over the
+    precomputed pieces.
     """
     
-    output_dir = dag_config['output_dir']
-    os.makedirs(output_dir, exist_ok=True)
+    def __init__(self, pieces, slots, source=None, digest=None, defaults=None):
+        self.pieces = pieces
+        self.slots = slots
+        self.source = source
+        self.digest = digest
+        self.defaults = defaults or {}
+    
+    @classmethod
+    def compile(cls, text, source=None):
+        """
+        Compile template text into static chunks plus placeholder positions
+        
+        Args:
+            text: Contents of the sample SQL file
+            source: Template path, used in error messages
+            
+        Returns:
+            SqlTemplate: The compiled template
+            
+        Raises:
+            ValueError: If a required placeholder is missing or an unknown one is used
+        """
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        defaults = {name: '' for name in OPTIONAL_SQL_TEMPLATE_PLACEHOLDERS}
+        
+        # The manual column section (its marker lines included) becomes the columns slot
+        lines = text.splitlines(keepends=True)
+        start = next((i for i, line in enumerate(lines) if line.startswith(SQL_COLUMNS_START)), None)
+        end = next((i for i, line in enumerate(lines) if line.startswith(SQL_COLUMNS_END)), None)
+        if start is not None and end is not None and start < end:
+            before, after = ''.join(lines[:start]), ''.join(lines[end + 1:])
+            defaults['columns'] = ''.join(lines[start:end + 1])
+            regions = [before, None, after]
+        else:
+            regions = [text]
+        
+        pieces = []
+        slots = []
+        for region in regions:
+            if region is None:
+                slots.append((len(pieces), 'columns'))
+                pieces.append(None)
+                continue
+            position = 0
+            for match in SQL_PLACEHOLDER_PATTERN.finditer(region):
+                pieces.append(region[position:match.start()])
+                slots.append((len(pieces), match.group(1)))
+                pieces.append(None)
+                position = match.end()
+            pieces.append(region[position:])
+        
+        names = {name for _, name in slots}
+        missing = [name for name in SQL_TEMPLATE_PLACEHOLDERS if name not in names]
+        if missing:
+            raise ValueError(f"SQL template {source or '<string>'} is missing placeholder(s): {missing}")
+        unknown = sorted(names - set(SQL_TEMPLATE_PLACEHOLDERS) - set(defaults))
+        if unknown:
+            raise ValueError(f"SQL template {source or '<string>'} has unknown placeholder(s): {unknown}")
+        
+        return cls(pieces, slots, source, digest=digest, defaults=defaults)
+    
+    def has_slot(self, name):
+        return any(slot == name for _, slot in self.slots)
+    
+    def render(self, **values):
+        """Return the DDL with every placeholder filled from values (optional slots: their default if None)"""
+        pieces = list(self.pieces)
+        for index, name in self.slots:
+            value = values.get(name)
+            pieces[index] = str(self.defaults[name] if value is None and name in self.defaults else value)
+        return ''.join(pieces)
+
+
+_sql_templates = {}
+
+
+def get_sql_template(sample_sql_file):
+    """
+    Return the compiled SqlTemplate for a sample SQL file
     
-    output_file = os.path.join(output_dir, f"{dag_config['table_name']}.sql")
+    The compiled template is cached per path and recompiled only when the
+    file's mtime or size changes.
+    """
+    stat = os.stat(sample_sql_file)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _sql_templates.get(sample_sql_file)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
     
     with open(sample_sql_file, 'r') as file:
-        content = file.read()
+        template = SqlTemplate.compile(file.read(), source=sample_sql_file)
     
-    # Replace placeholders with actual bucket path
+    _sql_templates[sample_sql_file] = (stamp, template)
+    return template
+
+
+def render_sql_content(sample_sql_file, dag_config, dlSchemaName, bucket_id, columns=None, partition_column=None):
+    """
+    Return the SQL file content for dag_config without writing anything
+    
+    columns (from --field-catalogue) replace the manual column section, and
+    partition_column adds the PARTITIONED BY clause of a hive-style Hudi
+    partition path.
+    """
+    # Fill placeholders with actual schema, table and bucket path
     bucket_path = f"gs://{bucket_id}/{dag_config['table_name']}"
     
-    updated_content = content.replace(
-        'sa_mdse_dl_secure.mak_physl_invt_doc',
-        f"{dlSchemaName}.{dag_config['table_name']}"
-    )
-    updated_content = updated_content.replace(
-        "gs://86009702bc2c3bcd2c1c64cfb8e9a2e7ed7046d5e4b77786956ff1fe50586d/mak_physl_invt_doc",
-        bucket_path
+    return get_sql_template(sample_sql_file).render(
+        schema=dlSchemaName,
+        table=dag_config['table_name'],
+        bucket_path=bucket_path,
+        columns=render_columns(columns, partition_column) if columns else None,
+        partitioned_by=render_partitioned_by(partition_column, columns),
     )
+
+
+def prepare_sql_file(sample_sql_file, dag_config, dlSchemaName, dlTableName,bucket_id, timings=None,
+                     columns=None, partition_column=None):
+    """
+    Generate a customized SQL file from the compiled sample SQL template
+    
+    Args:
+        sample_sql_file: Path to template SQL file
+        dag_config: Dictionary with configuration values
+        dlSchemaName: Schema name
+        dlTableName: Table name
+        bucket_id: GCS bucket ID for the table
+        timings: Optional dict; seconds spent are added under 'render' and 'write'
+        columns: Optional typed columns of the table from --field-catalogue
+        partition_column: Optional hive-style Hudi partition column
+        
+    Returns:
+        str: Path to the generated SQL file
+    """
+    
+    start = time.perf_counter()
+    output_file = sql_output_path(dag_config)
+    
+    updated_content = render_sql_content(sample_sql_file, dag_config, dlSchemaName, bucket_id, columns, partition_column)
+    start = _add_time(timings, 'render', start)
     
+    os.makedirs(dag_config['output_dir'], exist_ok=True)
     with open(output_file, 'w') as file:
         file.write(updated_content)
+    _add_time(timings, 'write', start)
     
     print(f"✓ Created SQL file: {output_file}")
     return output_file
 
-def generate_upload_commands(source_dir="../output", dest_bucket="gs://bfdaf-dags-intldlsadev-catalog/", output_file="../upload_commands.sh"):
+def generate_upload_commands(source_dir="../output", dest_bucket="gs://bfdaf-dags-intldlsadev-catalog/", output_file="../upload_commands.sh", dag_files=None):
     """
     Generate gcloud storage cp commands for all DAG files
     
@@ -95,6 +578,8 @@ def generate_upload_commands(source_dir="../output", dest_bucket="gs://bfdaf-dag
         source_dir: Directory containing generated DAG files
         dest_bucket: GCS destination bucket path
         output_file: Path to save the commands script
+        dag_files: DAG file paths from the run's plan; if None, source_dir is
+            globbed for INTLDLDAT-*.py
         
     Returns:
         list: List of gcloud commands
@@ -106,8 +591,10 @@ def generate_upload_commands(source_dir="../output", dest_bucket="gs://bfdaf-dag
         commands = []
         
         # Find all DAG files
-        dag_pattern = os.path.join(source_dir, "**", "INTLDLDAT-*.py")
-        dag_files = sorted(glob.glob(dag_pattern, recursive=True))
+        if dag_files is None:
+            dag_pattern = os.path.join(source_dir, "**", "INTLDLDAT-*.py")
+            dag_files = glob.glob(dag_pattern, recursive=True)
+        dag_files = sorted(dag_files)
         
         if not dag_files:
             print(f"No DAG files found in {source_dir}")
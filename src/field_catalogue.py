@@ -0,0 +1,147 @@
+"""
+Typed DDL columns from an SAP field catalogue export (--field-catalogue)
+
+The catalogue is a DD03L-style CSV, one row per table field:
+
+    TABNAME,FIELDNAME,POSITION,KEYFLAG,DATATYPE,LENG,DECIMALS,DDTEXT,dlColumnName
+    IKPF,MANDT,1,X,CLNT,3,0,Client,clnt
+    IKPF,IBLNR,2,X,CHAR,10,0,Physical Inventory Document,physl_invt_doc_nbr
+
+TABNAME matches icdsTableName of ingestion.csv, DDTEXT is the field label
+(DD04T) and dlColumnName the data lake column name (default: FIELDNAME in
+lower case). POSITION, LENG, DECIMALS and dlColumnName are optional.
+.INCLUDE/.APPEND rows of the export are skipped.
+"""
+from utils import read_csv_records
+
+FIELD_CATALOGUE_COLUMNS = ['TABNAME', 'FIELDNAME', 'KEYFLAG', 'DATATYPE', 'DDTEXT']
+
+# ABAP Dictionary data type -> Hive type. Dates and times stay strings: SAP
+# writes "00000000" for an empty date, which does not cast to a date.
+HIVE_TYPES = {
+    'CHAR': 'string', 'NUMC': 'string', 'CLNT': 'string', 'LANG': 'string', 'CUKY': 'string',
+    'UNIT': 'string', 'STRG': 'string', 'SSTR': 'string', 'LCHR': 'string', 'ACCP': 'string',
+    'DATS': 'string', 'TIMS': 'string', 'PREC': 'int',
+    'INT1': 'int', 'INT2': 'int', 'INT4': 'int', 'INT8': 'bigint',
+    'FLTP': 'double', 'D16D': 'double', 'D34D': 'double',
+    'RAW': 'binary', 'LRAW': 'binary', 'RSTR': 'binary',
+}
+# Packed numbers keep their precision (LENG digits, DECIMALS after the point)
+DECIMAL_TYPES = ('DEC', 'CURR', 'QUAN')
+
+
+def hive_type(datatype, length=None, decimals=None):
+    """
+    Hive column type of an ABAP Dictionary data type
+
+    Raises:
+        ValueError: If the data type is unknown
+    """
+    datatype = str(datatype).strip().upper()
+    if datatype in DECIMAL_TYPES:
+        precision = int(length or 0)
+        if not 0 < precision <= 38:
+            raise ValueError(f"{datatype} field needs a length (LENG) between 1 and 38")
+        return f"decimal({precision},{int(decimals or 0)})"
+    try:
+        return HIVE_TYPES[datatype]
+    except KeyError:
+        raise ValueError(f"unknown data type '{datatype}'") from None
+
+
+def load_field_catalogue(path):
+    """
+    Read the field catalogue into typed columns per table
+
+    Args:
+        path: Path to the CSV file
+
+    Returns:
+        dict: {TABNAME: [{'name', 'field', 'type', 'key', 'description'}, ...]}, in POSITION order
+
+    Raises:
+        ValueError: If a column is missing, or a row has an unknown type or a duplicate column name
+    """
+    columns, records = read_csv_records(path)
+    missing = [col for col in FIELD_CATALOGUE_COLUMNS if col not in columns]
+    if missing:
+        raise ValueError(f"Field catalogue {path} is missing column(s): {missing}")
+
+    catalogue = {}
+    for row, record in enumerate(records, 1):
+        table, field = (record['TABNAME'] or '').strip(), (record['FIELDNAME'] or '').strip()
+        if not table or not field:
+            raise ValueError(f"{path} row {row}: TABNAME and FIELDNAME must not be empty")
+        if field.startswith('.'):
+            continue
+        try:
+            column_type = hive_type(record['DATATYPE'], record.get('LENG'), record.get('DECIMALS'))
+            position = int(record.get('POSITION') or row)
+        except ValueError as e:
+            raise ValueError(f"{path} row {row} ({table}.{field}): {e}") from None
+        catalogue.setdefault(table, []).append((position, row, {
+            'name': (record.get('dlColumnName') or field).strip().lower(),
+            'field': field,
+            'type': column_type,
+            'key': (record['KEYFLAG'] or '').strip().upper() == 'X',
+            'description': (record['DDTEXT'] or '').strip(),
+        }))
+
+    fields = {}
+    for table, entries in catalogue.items():
+        fields[table] = [column for _, _, column in sorted(entries, key=lambda entry: entry[:2])]
+        names = [column['name'] for column in fields[table]]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Field catalogue {path}: table {table} has duplicate column name(s): {duplicates}")
+    return fields
+
+
+def _comment(text):
+    """Hive string literal contents"""
+    return text.replace('\\', '\\\\').replace("'", "\\'")
+
+
+def render_columns(columns, partition_column=None):
+    """
+    The typed column list of a table's DDL, primary key fields first
+
+    Every line ends with a comma (the template's ds_load_ts column follows).
+    A Hive partition column is not part of the column list, so
+    partition_column is left out.
+
+    Args:
+        columns: Columns of one table from load_field_catalogue
+        partition_column: Data lake name of the partition column, if any
+
+    Returns:
+        str: The column lines
+    """
+    def line(column, suffix=''):
+        comment = _comment(f"{column['field']} | {column['description']}{suffix}")
+        return f"  `{column['name']}` {column['type']} COMMENT '{comment}',\n"
+
+    columns = [column for column in columns if column['name'] != partition_column]
+    keys = [line(column, ' - PRIMARY KEY') for column in columns if column['key']]
+    business = [line(column) for column in columns if not column['key']]
+
+    lines = []
+    if keys:
+        lines += ["  -- Primary Key Fields\n"] + keys
+    if business:
+        lines += (["\n"] if keys else []) + ["  -- Business Columns\n"] + business
+    return ''.join(lines)
+
+
+def render_partitioned_by(partition_column, columns=None):
+    """
+    PARTITIONED BY clause for a hive-style Hudi partition path (<column>=<value>)
+
+    The partition column keeps its catalogue type; without catalogue
+    columns for the table it is declared as string.
+    """
+    if not partition_column:
+        return ''
+    column_type = next((column['type'] for column in columns or () if column['name'] == partition_column), 'string')
+    return (f"PARTITIONED BY (`{partition_column}` {column_type} "
+            f"COMMENT 'Hudi partition path: {partition_column}=<value>')\n")
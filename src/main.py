@@ -1,133 +1,315 @@
 import argparse
 import sys
 import os
-import pandas as pd
+import time
+import heapq
+import cProfile
+import contextlib
+import tracemalloc
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 from utils import *
 from dag_creation import *
 from bucket import *
+from manifest import *
+from run_logger import RunLogger
+from validation import find_missing_columns, find_row_issues, find_validation_issues
+from plan import HUDI_TUNING_COLUMNS, build_plan, frame_rows, iter_dags, plan_batches
+from uploader import DagUploader, dag_artifacts, get_upload_backend
+from static_config import load_static_config, resolve_dag_values
+from sizing import load_table_stats, size_tables
+from field_catalogue import load_field_catalogue
+from scheduling import (DEFAULT_RUNTIME_MINUTES, concurrency_profile, cron_expression, estimate_runtime,
+                        format_minute, load_runtimes, parse_window, plan_schedule)
+
+
+class PipelineOptions:
+    """
+    Mode options of a run, one per CLI flag (defaults match the CLI)
+    
+    Grouped into one object so a new flag adds a field here instead of
+    another IngestionPipeline constructor argument; main() builds it from
+    the parsed command line with from_args().
+    """
+    
+    __slots__ = (
+        'stream', 'chunk_size', 'upload', 'upload_dest', 'profile', 'static_config_file', 'shared_cluster',
+        'batch_budget', 'batch_concurrency', 'dag_factory', 'table_stats_file', 'schedule_window',
+        'max_concurrent_dags', 'runtimes_file', 'allow_overflow', 'deferrable_poll_seconds', 'field_catalogue_file',
+        'hudi_key_conf',
+    )
+    
+    def __init__(self, stream=False, chunk_size=5000, upload=False, upload_dest=None, profile=False,
+                 static_config_file=None, shared_cluster=False, batch_budget=None, batch_concurrency=4,
+                 dag_factory=False, table_stats_file=None, schedule_window=None, max_concurrent_dags=10,
+                 runtimes_file=None, allow_overflow=False, deferrable_poll_seconds=0, field_catalogue_file=None,
+                 hudi_key_conf=False):
+        self.stream = stream
+        self.chunk_size = max(1, chunk_size)
+        self.upload = upload
+        self.upload_dest = upload_dest
+        self.profile = profile
+        # Parse-cheap DAGs: Variables/properties/cluster config resolved from this file at generation time
+        self.static_config_file = static_config_file
+        # One DAG (and one cluster) per table for all its banners instead of one DAG per banner
+        self.shared_cluster = shared_cluster
+        # Batch DAGs: tables of a schema/sensitivity packed onto one cluster, batch_budget task pairs per DAG
+        self.batch_budget = batch_budget
+        self.batch_concurrency = max(1, batch_concurrency)
+        # One factory module + config bundle instead of a DAG file per DagSpec (SQL files unchanged)
+        self.dag_factory = dag_factory
+        # Per-table dag_params defaults sized from row counts/widths/deltas (see sizing.py)
+        self.table_stats_file = table_stats_file
+        # Staggered PROD cron slot per DAG inside a daily batch window (see scheduling.py)
+        self.schedule_window = schedule_window
+        self.max_concurrent_dags = max_concurrent_dags
+        self.runtimes_file = runtimes_file
+        # DAGs that do not fit the window fail the run unless allowed to start after it
+        self.allow_overflow = allow_overflow
+        # Deferrable Dataproc job/cluster-delete tasks polled every N seconds by the triggerer (0: blocking)
+        self.deferrable_poll_seconds = deferrable_poll_seconds
+        # Typed DDL columns per icdsTableName from an SAP field catalogue export (see field_catalogue.py)
+        self.field_catalogue_file = field_catalogue_file
+        # Pass the Hudi key and tuning columns to the upsert job as --hoodieConf (nothing without it)
+        self.hudi_key_conf = hudi_key_conf
+    
+    @classmethod
+    def from_args(cls, args):
+        """Options from the argparse namespace of main()"""
+        return cls(
+            stream=args.stream,
+            chunk_size=args.chunk_size,
+            upload=args.upload,
+            upload_dest=args.upload_dest,
+            profile=args.profile,
+            static_config_file=args.static_dags,
+            shared_cluster=args.shared_cluster,
+            batch_budget=args.batch_budget,
+            batch_concurrency=args.batch_concurrency,
+            dag_factory=args.dag_factory,
+            table_stats_file=args.table_stats,
+            schedule_window=args.schedule_window,
+            max_concurrent_dags=args.max_concurrent_dags,
+            runtimes_file=args.runtimes,
+            allow_overflow=args.allow_overflow,
+            deferrable_poll_seconds=args.deferrable,
+            field_catalogue_file=args.field_catalogue,
+            hudi_key_conf=args.hudi_key_conf
+        )
 
 
 class IngestionPipeline:
     """Main orchestrator for the ingestion pipeline"""
     
-    def __init__(self, ingestion_file, env='dev', dry_run=False):
+    # Entries listed under "Slowest tables" / top allocations written by --profile
+    SLOWEST_COUNT = 5
+    PROFILE_TOP_ALLOCATIONS = 25
+    
+    def __init__(self, ingestion_file, env='dev', dry_run=False, workers=1, full_rebuild=False, quiet=False,
+                 options=None):
         self.ingestion_file = ingestion_file
         self.env = env
         self.dry_run = dry_run
-        self.log_file = f"ingestion_run_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        self.workers = max(1, workers)
+        self.full_rebuild = full_rebuild
+        self.quiet = quiet
+        # Mode flags (--stream, --static-dags, --batch-budget, ...) live in one PipelineOptions
+        self.options = options = options or PipelineOptions()
+        self.stream_skipped_chunks = 0
+        self.upload_dest = options.upload_dest or f"gs://bfdaf-dags-intldlsa{env}-catalog/"
+        self.static_config = None
+        self._static_values = {}
+        if options.static_config_file:
+            self.sample_dag_file = "../sample_dag_static.py"
+        elif options.shared_cluster:
+            self.sample_dag_file = "../sample_dag_shared.py"
+        elif options.batch_budget:
+            self.sample_dag_file = "../sample_dag_batch.py"
+        elif options.dag_factory:
+            self.sample_dag_file = "../sample_dag_factory.py"
+        else:
+            self.sample_dag_file = "../sample_dag.py"
+        self.sample_sql_file = "../sample_sql.sql"
+        self.table_stats = None
+        self.tables_without_stats = set()
+        self.runtimes = {}
+        self.dag_schedules = {}
+        self.field_catalogue = None
+        self.tables_without_fields = set()
+        self.tables_with_unused_hudi_columns = set()
+        self.dag_factory_entries = []
+        self.dag_factory_files = []
+        self.dry_run_diff = None
+        # Seconds per generation component (bucket/render/write/total), summed over all DAGs
+        self.generation_timings = {}
+        self.table_timings = {}
+        self.banner_timings = {}
+        self.manifest = None
+        self.tables = []
+        self.run_name = f"ingestion_run_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # A dry run writes nothing to disk, not even its log
+        self.log_file = None if dry_run else f"{self.run_name}.jsonl"
+        self.logger = RunLogger(self.log_file, quiet=quiet)
         self.errors = []
         self.warnings = []
         
-    def log(self, message, level="INFO"):
-        """Print and log messages"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_msg = f"[{timestamp}] [{level}] {message}"
-        print(log_msg)
-        with open(self.log_file, 'a') as f:
-            f.write(log_msg + "\n")
+    def log(self, message, level="INFO", **fields):
+        """Print and log messages as structured records (see RunLogger)"""
+        return self.logger.log(message, level, **fields)
     
-    def validate_inputs(self):
-        """Validate ingestion.csv before processing"""
+    def record_error(self, error, message=None, **fields):
+        """Add an error to the run summary and log it"""
+        self.errors.append(error)
+        self.log(message or f"✗ {error}", "ERROR", error=error, **fields)
+    
+    def record_warning(self, warning, message=None, **fields):
+        """Add a warning to the run summary and log it"""
+        self.warnings.append(warning)
+        self.log(message or f"⚠ {warning}", "WARNING", warning=warning, **fields)
+    
+    def start_phase(self, phase, title):
+        """Flush the previous phase and print the phase banner"""
+        self.logger.set_phase(phase)
         self.log("=" * 80)
-        self.log("VALIDATION PHASE", "INFO")
+        self.log(title, "INFO")
         self.log("=" * 80)
+    
+    def validate_inputs(self):
+        """Validate ingestion.csv before processing"""
+        self.start_phase("VALIDATION", "VALIDATION PHASE")
         
         try:
             # Check file exists
             if not os.path.exists(self.ingestion_file):
                 raise FileNotFoundError(f"File not found: {self.ingestion_file}")
             
+            if self.options.stream and not self.dry_run:
+                # Rows are validated chunk by chunk during generation
+                missing_cols = find_missing_columns(read_csv_header(self.ingestion_file))
+                if missing_cols:
+                    raise ValueError(f"Missing required columns: {missing_cols}")
+                self.log(f"✓ All required columns present; streaming {self.ingestion_file} in chunks of {self.options.chunk_size} rows")
+                return True
+            
             self.log(f"✓ Reading file: {self.ingestion_file}")
-            df = pd.read_csv(self.ingestion_file)
+            # stdlib csv: no pandas import for the default path (see --stream for the bulk path)
+            columns, records = read_csv_records(self.ingestion_file)
             
-            if df.empty:
+            if not records:
                 raise ValueError("ingestion.csv is empty")
             
-            self.log(f"✓ Found {len(df)} rows to process")
+            self.log(f"✓ Found {len(records)} rows to process")
             
-            # Required columns
-            required_cols = [
-                'icdsTableName', 'BANNER_NAME', 'dataSensitivity', 
-                'dlSchemaName', 'dlTableName', 'tableLoadType'
-            ]
-            
-            missing_cols = [col for col in required_cols if col not in df.columns]
+            missing_cols = find_missing_columns(columns)
             if missing_cols:
                 raise ValueError(f"Missing required columns: {missing_cols}")
             
             self.log(f"✓ All required columns present")
             
-            # Validate data quality
-            validation_issues = []
-            
-            for idx, row in df.iterrows():
-                row_num = idx + 1
-                
-                # Check for empty critical fields
-                if pd.isna(row['dlTableName']) or row['dlTableName'].strip() == '':
-                    validation_issues.append(f"Row {row_num}: dlTableName is empty")
-                
-                if pd.isna(row['BANNER_NAME']) or row['BANNER_NAME'].strip() == '':
-                    validation_issues.append(f"Row {row_num}: BANNER_NAME is empty")
-                
-                # Validate banner names
-                banners = str(row['BANNER_NAME']).split(',')
-                invalid_banners = [b.strip() for b in banners if b.strip() not in ['MDD', 'MAK', 'MSB']]
-                if invalid_banners:
-                    validation_issues.append(f"Row {row_num}: Invalid banner(s): {invalid_banners}")
-                
-                # Validate sensitivity
-                valid_sensitivity = ['se', 'ns', 'hs']
-                if str(row['dataSensitivity']).lower() not in valid_sensitivity:
-                    validation_issues.append(f"Row {row_num}: Invalid sensitivity '{row['dataSensitivity']}'. Must be one of: {valid_sensitivity}")
-                
-                # Validate load type
-                valid_load_types = ['INC', 'FULL']
-                if str(row['tableLoadType']).upper() not in valid_load_types:
-                    validation_issues.append(f"Row {row_num}: Invalid tableLoadType '{row['tableLoadType']}'. Must be INC or FULL")
+            # Validate data quality (see validation.find_row_issues)
+            validation_issues = find_row_issues(enumerate(records, 1))
             
             if validation_issues:
                 for issue in validation_issues:
-                    self.errors.append(issue)
-                    self.log(f"✗ {issue}", "ERROR")
+                    self.record_error(issue)
                 return False
             
-            self.log(f"✓ All {len(df)} rows validated successfully")
+            # Parse once into the typed plan shared by every later phase
+            self.tables, plan_errors = build_plan(enumerate(records, 1))
+            if plan_errors:
+                for row_num, dlTableName, e in plan_errors:
+                    self.record_error(f"Row {row_num}: {dlTableName}: {e}")
+                return False
+            self._note_unused_hudi_columns(self.tables)
+            
+            self.log(f"✓ All {len(records)} rows validated successfully")
             return True
             
         except Exception as e:
-            self.log(f"✗ Validation failed: {e}", "ERROR")
-            self.errors.append(str(e))
+            self.record_error(str(e), f"✗ Validation failed: {e}")
             return False
     
     def check_dependencies(self):
         """Check if required files exist"""
-        self.log("=" * 80)
-        self.log("CHECKING DEPENDENCIES", "INFO")
-        self.log("=" * 80)
+        self.start_phase("DEPENDENCIES", "CHECKING DEPENDENCIES")
         
         required_files = [
             ("../buckets/bucket_id.csv", "Bucket ID mapping"),
-            ("../sample_dag.py", "Sample DAG template"),
-            ("../sample_sql.sql", "Sample SQL template"),
+            (self.sample_dag_file, "Sample DAG template"),
+            (self.sample_sql_file, "Sample SQL template"),
         ]
+        if self.options.static_config_file:
+            required_files.append((self.options.static_config_file, "Static DAG config"))
+        if self.options.table_stats_file:
+            required_files.append((self.options.table_stats_file, "Table statistics"))
+        if self.options.runtimes_file:
+            required_files.append((self.options.runtimes_file, "Table runtimes"))
+        if self.options.field_catalogue_file:
+            required_files.append((self.options.field_catalogue_file, "Field catalogue"))
         
         all_exist = True
         for filepath, description in required_files:
             if os.path.exists(filepath):
                 self.log(f"✓ {description}: {filepath}")
             else:
-                self.log(f"✗ Missing {description}: {filepath}", "ERROR")
-                self.errors.append(f"Missing: {filepath}")
+                self.record_error(f"Missing: {filepath}", f"✗ Missing {description}: {filepath}")
                 all_exist = False
         
         return all_exist
     
     def run(self):
         """Execute the full pipeline"""
+        with self._profiling():
+            if not self.quiet:
+                return self._run()
+            
+            # Quiet mode: silence the per-file prints of the helper modules;
+            # RunLogger still writes errors and the summary to the real console
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                return self._run()
+    
+    @contextlib.contextmanager
+    def _profiling(self):
+        """
+        With --profile, run under cProfile and tracemalloc
+        
+        Writes <log name>.prof (open with `python -m pstats` or snakeviz) and
+        <log name>.alloc.txt (top allocation sites) next to the run log.
+        """
+        if not self.options.profile:
+            yield
+            return
+        
+        profiler = cProfile.Profile()
+        tracemalloc.start()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            
+            profile_file = f"{self.run_name}.prof"
+            alloc_file = f"{self.run_name}.alloc.txt"
+            profiler.dump_stats(profile_file)
+            
+            top = snapshot.statistics('lineno')[:self.PROFILE_TOP_ALLOCATIONS]
+            with open(alloc_file, 'w') as f:
+                f.write(f"# traced memory: current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB\n")
+                f.write(f"# top {len(top)} allocation sites by size\n")
+                for stat in top:
+                    f.write(f"{stat}\n")
+            
+            self.log(f"Profile: {profile_file}")
+            self.log(f"Allocations: {alloc_file} (peak traced {peak / (1024 * 1024):.1f} MiB)")
+            self.logger.flush()
+    
+    def _run(self):
+        """Run the pipeline phases in order"""
         
         # Phase 1: Validation
         if not self.validate_inputs():
@@ -141,121 +323,742 @@ class IngestionPipeline:
             self.print_summary()
             return False
         
+        # Dry run: plan and diff in memory, nothing below is executed
+        if self.dry_run:
+            success = self.plan_dry_run()
+            self.print_summary()
+            return success
+        
         # Phase 3: Extract bucket mappings
-        self.log("=" * 80)
-        self.log("EXTRACTING BUCKET MAPPINGS", "INFO")
-        self.log("=" * 80)
+        self.start_phase("BUCKET_EXTRACTION", "EXTRACTING BUCKET MAPPINGS")
         
         try:
-            extract_bucket_id()
+            extract_bucket_id(force=self.full_rebuild)
             self.log("✓ Bucket mappings extracted")
         except Exception as e:
-            self.log(f"✗ Failed to extract bucket mappings: {e}", "ERROR")
-            self.errors.append(str(e))
+            self.record_error(str(e), f"✗ Failed to extract bucket mappings: {e}")
             self.print_summary()
             return False
         
         # Phase 4: Generate DAGs and SQL
-        self.log("=" * 80)
-        self.log("GENERATING DAGs AND SQL FILES", "INFO")
-        self.log("=" * 80)
+        self.start_phase("GENERATION", "GENERATING DAGs AND SQL FILES")
         
         try:
-            df = pd.read_csv(self.ingestion_file)
-            dag_list = self._prepare_dag_configuration(df)
-            self.log(f"✓ Generated {len(dag_list)} DAG(s)")
+            if self.options.stream:
+                dag_files = self._generate_streaming()
+            else:
+                dag_files = [dag_output_path(dag) for dag in self._prepare_dag_configuration(self.tables)]
+            if self.options.dag_factory:
+                # Only the factory module and its config bundle are uploaded
+                dag_files = self.dag_factory_files
+                self.log(f"✓ Registered {len(self.dag_factory_entries)} DAG(s) in {DAG_FACTORY_CONFIG}")
+            else:
+                self.log(f"✓ Generated {len(dag_files)} DAG(s)")
         except Exception as e:
-            self.log(f"✗ Failed to generate DAGs: {e}", "ERROR")
-            self.errors.append(str(e))
+            self.record_error(str(e), f"✗ Failed to generate DAGs: {e}")
             self.print_summary()
             return False
         
-        # Phase 5: Generate upload commands
-        self.log("=" * 80)
-        self.log("GENERATING UPLOAD COMMANDS", "INFO")
-        self.log("=" * 80)
+        # Phase 5: Upload DAGs, or generate upload commands for a manual upload
+        if self.options.upload:
+            if not self.upload_dags():
+                self.print_summary()
+                return False
+        else:
+            self.start_phase("UPLOAD_PLANNING", "GENERATING UPLOAD COMMANDS")
+            
+            try:
+                upload_commands = generate_upload_commands(
+                    source_dir="../output",
+                    dest_bucket=self.upload_dest,
+                    output_file="../upload_commands.sh",
+                    dag_files=dag_files
+                )
+                self.log(f"✓ Generated {len(upload_commands)} upload command(s)")
+            except Exception as e:
+                self.record_error(str(e), f"✗ Failed to generate upload commands: {e}")
+                self.print_summary()
+                return False
         
-        try:
-            upload_commands = generate_upload_commands(
-                source_dir="../output",
-                dest_bucket=f"gs://bfdaf-dags-intldlsa{self.env}-catalog/",
-                output_file="../upload_commands.sh"
-            )
-            self.log(f"✓ Generated {len(upload_commands)} upload command(s)")
-        except Exception as e:
-            self.log(f"✗ Failed to generate upload commands: {e}", "ERROR")
-            self.errors.append(str(e))
+        if self.stream_skipped_chunks:
+            self.log(f"Pipeline finished with {self.stream_skipped_chunks} chunk(s) skipped due to validation errors", "ERROR")
             self.print_summary()
             return False
         
         self.print_summary()
         return True
     
-    def _prepare_dag_configuration(self, df):
-        """Generate DAG configuration for each table+banner combination"""
+    def upload_dags(self):
+        """
+        Upload the DAG files in this run's manifest to upload_dest
+        
+        Objects whose remote checksum already matches are skipped, so
+        re-running after a partial failure only uploads what is missing.
+        
+        Returns:
+            bool: True if every DAG was uploaded or already current
+        """
+        self.start_phase("UPLOAD", "UPLOADING DAGs")
+        
+        try:
+            backend = get_upload_backend(self.upload_dest)
+            uploader = DagUploader(backend, workers=max(self.workers, 8))
+            result = uploader.upload(dag_artifacts(self.manifest))
+        except Exception as e:
+            self.record_error(str(e), f"✗ Failed to upload DAGs: {e}")
+            return False
+        
+        for path in result["uploaded"]:
+            self.log(f"✓ Uploaded {os.path.basename(path)}")
+        for path, e in result["failed"]:
+            self.record_error(f"Upload of {path}: {e}", f"✗ Failed to upload {os.path.basename(path)}: {e}")
+        
+        self.log(f"✓ Uploaded {len(result['uploaded'])} DAG(s) to {backend}, "
+                 f"{len(result['skipped'])} already up to date")
+        return not result["failed"]
+    
+    def plan_dry_run(self, output_root="../output"):
+        """
+        Build the full plan in memory and diff it against output_root, writing nothing
+        
+        Bucket ids come straight from FinalBucketInfo.csv (what a real run would
+        extract into bucket_id.csv), every DAG/SQL file is rendered in memory
+        and compared with the file on disk. Files under output_root that the
+        plan no longer produces are reported as removed.
+        
+        Returns:
+            bool: True if every DAG could be planned
+        """
+        self.start_phase("DRY_RUN", "DRY RUN: PLANNING CHANGES (NOTHING IS WRITTEN)")
+        
+        final_bucket_info_file = "../buckets/FinalBucketInfo.csv"
+        try:
+            if os.path.exists(final_bucket_info_file):
+                registry = BucketRegistry.from_mapping(read_bucket_mapping(final_bucket_info_file), final_bucket_info_file)
+            else:
+                self.record_warning(f"{final_bucket_info_file} not found, using bucket ids from ../buckets/bucket_id.csv")
+                registry = BucketRegistry("../buckets/bucket_id.csv")
+            bucket_ids = registry.get_many(t for table in self.tables for t in table.table_names())
+            bucket_writer = BucketRequestWriter(output_file="../buckets/bucket_input.csv", env=self.env)
+            manifest = OutputManifest(output_root)
+            self._load_render_inputs()
+        except Exception as e:
+            self.record_error(str(e), f"✗ Failed to load planning inputs: {e}")
+            return False
+        
+        added, changed, unchanged = [], [], []
+        planned = set()
+        bucket_requests = 0
+        
+        def diff(path, content):
+            planned.add(os.path.normpath(path))
+            if not os.path.exists(path):
+                added.append(path)
+                return
+            with open(path, 'r') as f:
+                current = f.read()
+            (unchanged if current == content else changed).append(path)
+        
+        factory_entries = []
+        dags = list(self._plan_dags(self.tables))
+        try:
+            self._assign_schedules(dags)
+        except Exception as e:
+            self.record_error(str(e), f"✗ Failed to plan the DAG schedules: {e}")
+            return False
+        for dag in dags:
+            for banner_dag in self._banner_dags(dag):
+                bucket_requests += bucket_writer.add(banner_dag, dag.dlSchemaName)
+            try:
+                if self.options.dag_factory:
+                    factory_entries.append(dag_factory_entry(self._dag_render_config(dag)))
+                    artifacts = []
+                else:
+                    artifacts = [(dag_output_path(dag), render_dag_content(self.sample_dag_file, self._dag_render_config(dag)))]
+                for banner_dag in self._banner_dags(dag):
+                    bucket_id = self._bucket_id(banner_dag, bucket_ids, registry)
+                    columns = self._table_columns(banner_dag.table)
+                    artifacts.append((sql_output_path(banner_dag),
+                                      render_sql_content(self.sample_sql_file, banner_dag, banner_dag.dlSchemaName, bucket_id,
+                                                         columns, self._partition_column(banner_dag.table))))
+            except Exception as e:
+                self.record_error(f"{dag.dlTableName}/{dag.banner_name}: {str(e)}",
+                                  f"✗ Error planning {dag.dlTableName}/{dag.banner_name}: {e}",
+                                  table=dag.dlTableName, banner=dag.banner_name)
+                # Its files would be kept by a real run, so they are not "removed"
+                planned.update(os.path.normpath(p) for p in self._artifact_paths(dag))
+                continue
+            for path, content in artifacts:
+                diff(path, content)
+        
+        if self.options.dag_factory:
+            try:
+                for path, content in render_dag_factory(self.sample_dag_file, factory_entries):
+                    diff(path, content)
+            except Exception as e:
+                self.record_error(str(e), f"✗ Error planning the DAG factory: {e}")
+        
+        removed = []
+        for dirpath, _, filenames in os.walk(output_root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if name != MANIFEST_FILE and os.path.normpath(path) not in planned:
+                    removed.append(path)
+        removed.sort()
+        
+        self.dry_run_diff = {"added": added, "changed": changed, "removed": removed, "unchanged": unchanged}
+        
+        for path in added:
+            self.log(f"  + {path}", change="added")
+        for path in changed:
+            self.log(f"  ~ {path}", change="changed")
+        for path in removed:
+            note = "" if manifest.contains(path) else " (not in manifest; a real run keeps it)"
+            self.log(f"  - {path}{note}", change="removed")
+        
+        self.log(f"✓ Planned {len(planned)} file(s) for {len(self.tables)} table(s): {len(added)} added, "
+                 f"{len(changed)} changed, {len(removed)} removed, {len(unchanged)} unchanged")
+        self.log(f"✓ Would queue {bucket_requests} new bucket request(s) in {bucket_writer.output_file}")
+        self._report_missing_inputs()
+        return not self.logger.errors()
+    
+    def _prepare_dag_configuration(self, tables):
+        """Generate the DAG and SQL files for every DagSpec of the plan"""
+        self._begin_generation()
+        dag_list = self._generate_tables(tables)
+        self._finish_generation()
+        return dag_list
+    
+    def _begin_generation(self):
+        """Open the state shared by every batch of the generation phase"""
+        self.bucket_writer = BucketRequestWriter(output_file="../buckets/bucket_input.csv", env=self.env)
+        self.bucket_registry = get_bucket_registry("../buckets/bucket_id.csv")
+        self.bucket_ids = {}
+        self.buckets_added = 0
+        self.rendered_total = 0
+        
+        # Compile the templates once; a template missing a slot aborts the phase
+        self._load_render_inputs()
+        self.dag_template = None if self.options.dag_factory else get_dag_template(self.sample_dag_file)
+        self.sql_template = get_sql_template(self.sample_sql_file)
+        self._dag_digests = {}
+        
+        # Only artifacts whose inputs changed since the last run are re-rendered
+        self.manifest = OutputManifest("../output")
+    
+    def _generate_tables(self, tables):
+        """
+        Render every DagSpec of tables (the whole plan, or one chunk of it)
+        
+        Returns:
+            list: The DagSpecs that were generated (or are unchanged) without error
+        """
         dag_list = []
+        unchanged = 0
+        manifest = self.manifest
+        
+        # Every bucket id of these tables in one bulk lookup; tables without one are reported up front
+        table_names = [t for table in tables for t in table.table_names()]
+        self.bucket_ids = self.bucket_registry.get_many(table_names)
+        missing_tables = set(table_names) - self.bucket_ids.keys()
+        if missing_tables:
+            self.log(f"✗ {len(missing_tables)} table(s) not found in {self.bucket_registry.bucket_csv_file}: {sorted(missing_tables)}", "ERROR")
         
-        for index, row in df.iterrows():
-            tableLoadType = row['tableLoadType']
-            dlSchemaName = row['dlSchemaName']
-            dlTableName = row['dlTableName']
-            dataSensitivity = row['dataSensitivity']
-            banner_list = [b.strip() for b in str(row['BANNER_NAME']).split(',')]
+        # Bucket requests (and the schedule, which needs every DAG) are collected here in the main thread
+        dags = list(self._plan_dags(tables))
+        self._assign_schedules(dags)
+        for dag in dags:
+            for banner_dag in self._banner_dags(dag):
+                self.bucket_writer.add(banner_dag, dag.dlSchemaName)
+            if self.options.dag_factory:
+                self.dag_factory_entries.append(dag_factory_entry(self._dag_render_config(dag)))
+        
+        # Each job writes its own files, so results are identical to a serial run;
+        # log records, errors and manifest entries are gathered back here in job order
+        for (dag,), result, error in self._run_jobs(self._render_dag, [(dag,) for dag in dags]):
+            dlTableName, b = dag.dlTableName, dag.banner_name
+            if error is not None:
+                # Keep the previous artifacts of a failed job rather than pruning them
+                for path in self._artifact_paths(dag):
+                    manifest.keep(path)
+                self.record_error(f"{dlTableName}/{b}: {str(error)}", f"✗ Error processing {dlTableName}/{b}: {error}",
+                                  table=dlTableName, banner=b)
+                continue
             
-            table_names = prepare_table_name(banner_list, dlTableName)
-            cluster_names = prepare_cluster_name(dlSchemaName, banner_list, dlTableName)
+            artifacts, rendered, timings = result
+            for path, inputs_digest in artifacts:
+                manifest.record(path, inputs_digest)
+            self.rendered_total += rendered
+            self._record_timings(dag, timings)
+            dag_list.append(dag)
+            if rendered:
+                timing_fields = {f"{key}_ms": round(seconds * 1000, 3) for key, seconds in timings.items()}
+                self.log(f"✓ Generated DAG: {dag.dag_name}", table=dlTableName, banner=b, **timing_fields)
+            else:
+                # One record for all of them: a no-op run over thousands of DAGs would log little else
+                unchanged += 1
+        
+        if unchanged:
+            self.log(f"✓ {unchanged} DAG(s) unchanged", unchanged=unchanged)
+        return dag_list
+    
+    def _render_dag(self, dag):
+        """
+        Render the DAG and SQL file of one DagSpec unless the manifest says they are fresh
+        
+        With --shared-cluster dag is a SharedDagSpec: one DAG file, and one SQL
+        file (with its own bucket id) per banner.
+        
+        Returns:
+            tuple: ([(path, inputs digest), ...], files rendered, timings) where
+                timings has the seconds spent on bucket lookup, render, write and total
+        """
+        start = time.perf_counter()
+        banner_dags = self._banner_dags(dag)
+        bucket_ids = [self._bucket_id(banner_dag, self.bucket_ids, self.bucket_registry) for banner_dag in banner_dags]
+        timings = {'bucket': time.perf_counter() - start}
+        
+        rendered = 0
+        artifacts = []
+        # With --dag-factory the DAG is an entry of the config bundle written by _finish_generation
+        if not self.options.dag_factory:
+            dag_file = dag_output_path(dag)
+            dag_config = self._dag_render_config(dag)
+            # Resolved static values, sized params, schedule and polling are inputs too (absent by default, keeping the old digests)
+            extra_inputs = [dag_config[key] for key in ('static_config', 'param_defaults', 'schedule', 'deferrable_poll_seconds',
+                                                        'hudi_key_conf')
+                            if isinstance(dag_config, dict) and key in dag_config]
+            if extra_inputs:
+                dag_inputs = digest_inputs(dag.digest, self.dag_template.digest, self.env, *extra_inputs)
+            else:
+                # Every banner DAG of a table has the same inputs; digest them once per table
+                dag_inputs = self._dag_digests.get(dag.digest)
+                if dag_inputs is None:
+                    dag_inputs = self._dag_digests[dag.digest] = digest_inputs(dag.digest, self.dag_template.digest, self.env)
+            if self.full_rebuild or not self.manifest.is_fresh(dag_file, dag_inputs):
+                prepare_dag_file(self.sample_dag_file, dag_config, timings=timings)
+                rendered += 1
+            artifacts.append((dag_file, dag_inputs))
+        for banner_dag, bucket_id in zip(banner_dags, bucket_ids):
+            sql_file = sql_output_path(banner_dag)
+            table = banner_dag.table
+            # Catalogue columns and the partition column are inputs when present (absent by default, keeping the old digests)
+            columns = self._table_columns(table)
+            partition_column = self._partition_column(table)
+            sql_inputs = digest_inputs(table.digest, self.sql_template.digest, bucket_id, self.env,
+                                       *([columns] if columns else []), *([partition_column] if partition_column else []))
+            if self.full_rebuild or not self.manifest.is_fresh(sql_file, sql_inputs):
+                prepare_sql_file(self.sample_sql_file, banner_dag, table.dlSchemaName, table.dlTableName, bucket_id,
+                                 timings=timings, columns=columns, partition_column=partition_column)
+                rendered += 1
+            artifacts.append((sql_file, sql_inputs))
+        timings['total'] = time.perf_counter() - start
+        return artifacts, rendered, timings
+    
+    def _bucket_id(self, banner_dag, bucket_ids, registry):
+        """
+        Bucket id of a banner table from the bulk lookup of _generate_tables/plan_dry_run
+        
+        Raises:
+            ValueError: If the table has no bucket in the registry
+        """
+        try:
+            return bucket_ids[banner_dag.table_name]
+        except KeyError:
+            raise ValueError(f"Table '{banner_dag.table_name}' not found in {registry.bucket_csv_file}") from None
+    
+    def _plan_dags(self, tables):
+        """
+        The DAGs to generate for tables: a DagSpec per banner, a SharedDagSpec
+        per table with --shared-cluster, or BatchDagSpecs with --batch-budget
+        """
+        if self.options.shared_cluster:
+            return [table.shared_dag() for table in tables]
+        if self.options.batch_budget:
+            return plan_batches(tables, self.options.batch_budget, self.options.batch_concurrency)
+        return iter_dags(tables)
+    
+    def _banner_dags(self, dag):
+        """The per-banner DagSpecs behind a planned DAG (their buckets and SQL files)"""
+        return dag.banner_dags if self.options.shared_cluster or self.options.batch_budget else [dag]
+    
+    def _artifact_paths(self, dag):
+        """Every file _render_dag writes for a planned DAG"""
+        sql_files = [sql_output_path(banner_dag) for banner_dag in self._banner_dags(dag)]
+        return sql_files if self.options.dag_factory else [dag_output_path(dag)] + sql_files
+    
+    def _write_dag_factory(self):
+        """
+        Write the factory module and the config bundle of every DAG planned this run
+        
+        Returns:
+            list: Paths of the two files
+        """
+        files = render_dag_factory(self.sample_dag_file, self.dag_factory_entries)
+        for path, content in files:
+            inputs_digest = digest_inputs(content, self.env)
+            if self.full_rebuild or not self.manifest.is_fresh(path, inputs_digest):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                atomic_write_text(path, content)
+                self.rendered_total += 1
+            self.manifest.record(path, inputs_digest)
+        return [path for path, _ in files]
+    
+    def _load_render_inputs(self):
+        """Load --static-dags values and the --table-stats, --runtimes and --field-catalogue files; check the template slots"""
+        if self.options.shared_cluster and not get_dag_template(self.sample_dag_file).has_slot('BANNER_TABLES'):
+            raise ValueError(f"{self.sample_dag_file} has no BANNER_TABLES slot for --shared-cluster")
+        if self.options.batch_budget:
+            template = get_dag_template(self.sample_dag_file)
+            missing = [slot for slot in ('BATCH_TASKS', 'MAX_ACTIVE_TASKS') if not template.has_slot(slot)]
+            if missing:
+                raise ValueError(f"{self.sample_dag_file} has no {missing} slot(s) for --batch-budget")
+        if self.options.table_stats_file:
+            self.table_stats = load_table_stats(self.options.table_stats_file)
+            self.tables_without_stats = set()
+            if not self.options.dag_factory and not get_dag_template(self.sample_dag_file).has_slot('PARAM_DEFAULTS'):
+                raise ValueError(f"{self.sample_dag_file} has no PARAM_DEFAULTS slot for --table-stats")
+        if self.options.schedule_window:
+            parse_window(self.options.schedule_window)
+            self.runtimes = load_runtimes(self.options.runtimes_file) if self.options.runtimes_file else {}
+            if not self.options.dag_factory and not get_dag_template(self.sample_dag_file).has_slot('PROD_SCHEDULE'):
+                raise ValueError(f"{self.sample_dag_file} has no PROD_SCHEDULE slot for --schedule-window")
+        if self.options.field_catalogue_file:
+            self.field_catalogue = load_field_catalogue(self.options.field_catalogue_file)
+            self.tables_without_fields = set()
+            if not get_sql_template(self.sample_sql_file).has_slot('columns'):
+                raise ValueError(f"{self.sample_sql_file} has no '{SQL_COLUMNS_START}' ... '{SQL_COLUMNS_END}' column "
+                                 f"section for --field-catalogue")
+        if self.options.deferrable_poll_seconds and not self.options.dag_factory and \
+                not get_dag_template(self.sample_dag_file).has_slot('DEFERRABLE_POLL_SECONDS'):
+            raise ValueError(f"{self.sample_dag_file} has no DEFERRABLE_POLL_SECONDS slot for --deferrable")
+        if not self.options.static_config_file:
+            return
+        self.static_config = load_static_config(self.options.static_config_file)
+        self._static_values = {}
+        if not get_dag_template(self.sample_dag_file).has_slot('STATIC_CONFIG'):
+            raise ValueError(f"{self.sample_dag_file} has no STATIC_CONFIG slot for --static-dags")
+    
+    def _dag_render_config(self, dag):
+        """
+        What the DAG template is rendered from: the DagSpec itself, or its
+        dag_config dict plus the resolved static_config values (--static-dags),
+        the sized param_defaults (--table-stats), the PROD cron schedule
+        (--schedule-window), the deferrable polling interval (--deferrable)
+        and the Hudi key configs (--hudi-key-conf)
+        """
+        if (self.static_config is None and self.table_stats is None and not self.dag_schedules
+                and not self.options.deferrable_poll_seconds and not self.options.hudi_key_conf):
+            return dag
+        dag_config = dag.to_dict()
+        if self.static_config is not None:
+            sensitivity = dag.sensitivity
+            values = self._static_values.get(sensitivity)
+            if values is None:
+                values = self._static_values[sensitivity] = resolve_dag_values(self.static_config, sensitivity)
+            dag_config['static_config'] = values
+        if self.table_stats is not None:
+            dag_config['param_defaults'] = self._param_defaults(dag)
+        if dag.dag_name in self.dag_schedules:
+            dag_config['schedule'] = self.dag_schedules[dag.dag_name]
+        if self.options.deferrable_poll_seconds:
+            dag_config['deferrable_poll_seconds'] = self.options.deferrable_poll_seconds
+        if self.options.hudi_key_conf:
+            dag_config['hudi_options'] = dag.upsert_hudi_options
+            dag_config['hudi_key_conf'] = True
+        return dag_config
+    
+    def _param_defaults(self, dag):
+        """
+        dag_params defaults for a DAG from the statistics of its table(s)
+        
+        A batch DAG is sized for its biggest table with max_active_tasks jobs
+        sharing the cluster, a shared-cluster DAG for one job per banner (its
+        task groups run in parallel, see _dag_runtime). Tables without statistics are left out (and
+        reported); a DAG with none of its tables in the file keeps the
+        template defaults.
+        """
+        tables = getattr(dag, 'tables', (dag.table,))
+        sized = []
+        for table in tables:
+            stats = self.table_stats.get(table.icdsTableName)
+            if stats is None:
+                self.tables_without_stats.add(table.icdsTableName)
+            else:
+                sized.append((stats, table.tableLoadType))
+        if not sized:
+            return {}
+        if self.options.batch_budget:
+            concurrent_jobs = min(dag.max_active_tasks, len(dag.banner_dags))
+        else:
+            concurrent_jobs = len(self._banner_dags(dag))
+        return size_tables(sized, concurrent_jobs)
+    
+    def _table_columns(self, table):
+        """
+        Typed DDL columns of a table from --field-catalogue, or None to keep the
+        manual column section (no catalogue, or the table is not in it)
+        
+        Raises:
+            ValueError: If the table's partition column is not one of its catalogue columns
+        """
+        if self.field_catalogue is None:
+            return None
+        columns = self.field_catalogue.get(table.icdsTableName)
+        if columns is None:
+            self.tables_without_fields.add(table.icdsTableName)
+            return None
+        partition_column = self._partition_column(table)
+        if partition_column and partition_column not in {column['name'] for column in columns}:
+            raise ValueError(f"hudiPartitionField '{partition_column}' is not a column of {table.icdsTableName} "
+                             f"in {self.options.field_catalogue_file}")
+        return columns
+    
+    def _partition_column(self, table):
+        """
+        The table's hudiPartitionField for the DDL, or None: the upsert job
+        only writes the partition path with --hudi-key-conf
+        """
+        return table.partition_column if self.options.hudi_key_conf else None
+    
+    def _note_unused_hudi_columns(self, tables):
+        """Remember the tables whose Hudi tuning columns are not passed on without --hudi-key-conf"""
+        if self.options.hudi_key_conf:
+            return
+        for table in tables:
+            if any(str(getattr(table, column) or '').strip() for column in HUDI_TUNING_COLUMNS):
+                self.tables_with_unused_hudi_columns.add(table.icdsTableName)
+    
+    def _report_missing_inputs(self):
+        """
+        Warn once about the tables --table-stats or --field-catalogue had nothing for,
+        and the tables whose Hudi tuning columns need --hudi-key-conf
+        """
+        for missing, source, fallback in (
+            (self.tables_without_stats, self.options.table_stats_file, "template dag_params defaults kept"),
+            (self.tables_without_fields, self.options.field_catalogue_file, "manual DDL column section kept"),
+        ):
+            if missing:
+                missing = sorted(str(name) for name in missing)
+                self.record_warning(f"{len(missing)} table(s) not in {source}, {fallback}: "
+                                    f"{missing[:20]}{' ...' if len(missing) > 20 else ''}")
+        if self.tables_with_unused_hudi_columns:
+            unused = sorted(str(name) for name in self.tables_with_unused_hudi_columns)
+            self.record_warning(f"{len(unused)} table(s) fill in Hudi tuning columns, which only reach the upsert job "
+                                f"with --hudi-key-conf: {unused[:20]}{' ...' if len(unused) > 20 else ''}")
+    
+    def _dag_runtime(self, dag, missing):
+        """
+        Estimated minutes of one run of a planned DAG
+        
+        A shared-cluster DAG runs its banners in parallel, a batch DAG runs
+        max_active_tasks task pairs at a time. Tables without an estimate
+        count DEFAULT_RUNTIME_MINUTES and are added to missing.
+        """
+        task_runtimes = []
+        for banner_dag in self._banner_dags(dag):
+            name = banner_dag.table.icdsTableName
+            if name not in self.runtimes:
+                missing.add(name)
+            task_runtimes.append(self.runtimes.get(name, DEFAULT_RUNTIME_MINUTES))
+        concurrency = dag.max_active_tasks if self.options.batch_budget else len(task_runtimes)
+        return estimate_runtime(task_runtimes, concurrency)
+    
+    def _assign_schedules(self, dags):
+        """
+        Give every planned DAG a staggered PROD cron slot in --schedule-window
+        and log the resulting concurrency profile
+        """
+        if not self.options.schedule_window:
+            return
+        window = parse_window(self.options.schedule_window)
+        missing = set()
+        runtimes = {dag.dag_name: self._dag_runtime(dag, missing) for dag in dags}
+        offsets, overflow = plan_schedule(runtimes.items(), window, self.options.max_concurrent_dags)
+        self.dag_schedules = {name: cron_expression(window[0] + offset) for name, offset in offsets.items()}
+        
+        window_text = f"{format_minute(window[0])}-{format_minute(window[1])} UTC"
+        self.log(f"✓ Scheduled {len(offsets)} DAG(s) in {window_text}, at most {self.options.max_concurrent_dags} at once")
+        profile = concurrency_profile([(offsets[name], runtime) for name, runtime in runtimes.items()])
+        peak = max((running for _, running in profile), default=0)
+        for offset, running in profile:
+            bar = '#' * max(1 if running else 0, round(running * 40 / peak)) if peak else ''
+            self.log(f"  {format_minute(window[0] + offset)}  {bar:<40}  {running}")
+        if profile:
+            offset = next(offset for offset, running in profile if running == peak)
+            end = max(offsets[name] + runtime for name, runtime in runtimes.items())
+            self.log(f"✓ Peak concurrency {peak} at {format_minute(window[0] + offset)}, "
+                     f"estimated end {format_minute(window[0] + end)}")
+        
+        if missing:
+            missing = sorted(str(name) for name in missing)
+            self.record_warning(f"{len(missing)} table(s) not in {self.options.runtimes_file or 'a --runtimes file'}, "
+                                f"scheduled with {DEFAULT_RUNTIME_MINUTES} min: "
+                                f"{missing[:20]}{' ...' if len(missing) > 20 else ''}")
+        if overflow:
+            message = (f"{len(overflow)} DAG(s) start after the {window_text} window ends; raise "
+                       f"--max-concurrent-dags or widen the window: {sorted(overflow)[:20]}"
+                       f"{' ...' if len(overflow) > 20 else ''}")
+            if not self.options.allow_overflow:
+                raise ValueError(f"{message} (or pass --allow-overflow to schedule them after the window)")
+            self.record_warning(message)
+    
+    def _record_timings(self, dag, timings):
+        """Add one DAG's timings to the per-component, per-table and per-banner totals"""
+        for key, seconds in timings.items():
+            self.generation_timings[key] = self.generation_timings.get(key, 0.0) + seconds
+        table_key = f"{dag.dlSchemaName}.{dag.dlTableName}"
+        self.table_timings[table_key] = self.table_timings.get(table_key, 0.0) + timings['total']
+        self.banner_timings[dag.banner_name] = self.banner_timings.get(dag.banner_name, 0.0) + timings['total']
+    
+    def _finish_generation(self, prune=True):
+        """
+        Write the --dag-factory bundle, save the manifest and flush bucket requests
+        
+        Args:
+            prune: Delete orphaned artifacts. Pass False when part of the input
+                was skipped, so its previous artifacts are kept instead.
+        """
+        if self.options.dag_factory:
+            if prune:
+                self.dag_factory_files = self._write_dag_factory()
+            else:
+                # A bundle without the skipped rows would unregister their DAGs; keep the previous one
+                self.record_warning(f"Input rows were skipped, {DAG_FACTORY_CONFIG} was not rewritten")
+                self.dag_factory_files = [path for path, _ in render_dag_factory(self.sample_dag_file, [])]
+        if prune:
+            removed = self.manifest.prune()
+        else:
+            self.manifest.carry_over()
+            removed = []
+        self.manifest.save()
+        self.log(f"✓ Re-rendered {self.rendered_total} stale file(s), removed {len(removed)} orphan file(s)")
+        for path in removed:
+            self.log(f"  - removed {path}")
+        self._report_missing_inputs()
+        
+        self.buckets_added += self.bucket_writer.flush()
+        self.log(f"✓ Added {self.buckets_added} new bucket request(s) to {self.bucket_writer.output_file}")
+    
+    def _generate_streaming(self):
+        """
+        Validate, plan and render the ingestion file one chunk at a time
+        
+        Only one chunk's frame and specs are alive at a time; bucket requests
+        are flushed per chunk. A chunk with validation issues is skipped (and
+        its previous artifacts kept) while the remaining chunks go on.
+        
+        Returns:
+            list: Paths of the generated DAG files
+        """
+        # Bulk path: chunked reads and column-wise validation pay for the pandas import
+        import pandas as pd
+        
+        self._begin_generation()
+        dag_files = []
+        skipped_chunks = 0
+        
+        chunks = pd.read_csv(self.ingestion_file, chunksize=self.options.chunk_size, dtype=str)
+        for chunk_no, chunk in enumerate(chunks, 1):
+            first_row, last_row = chunk.index[0] + 1, chunk.index[-1] + 1
             
-            sample_dag_file = "../sample_dag.py"
-            sample_sql_file = "../sample_sql.sql"
+            issues = find_validation_issues(chunk)
+            tables, plan_errors = ([], []) if issues else build_plan(frame_rows(chunk))
+            issues += [f"Row {row_num}: {dlTableName}: {e}" for row_num, dlTableName, e in plan_errors]
+            if issues:
+                for issue in issues:
+                    self.record_error(issue)
+                skipped_chunks += 1
+                self.log(f"✗ Chunk {chunk_no} (rows {first_row}-{last_row}): {len(issues)} validation issue(s), skipped", "ERROR")
+                continue
             
-            for i, b in enumerate(banner_list):
+            self._note_unused_hudi_columns(tables)
+            dags = self._generate_tables(tables)
+            self.buckets_added += self.bucket_writer.flush()
+            dag_files.extend(dag_output_path(dag) for dag in dags)
+            self.log(f"✓ Chunk {chunk_no} (rows {first_row}-{last_row}): {len(dags)} DAG(s), {len(dag_files)} so far")
+            del chunk, tables, dags
+        
+        self.stream_skipped_chunks = skipped_chunks
+        self._finish_generation(prune=skipped_chunks == 0)
+        return dag_files
+    
+    def _run_jobs(self, func, jobs):
+        """
+        Run func(*job) for every job and yield (job, result, error) in job order
+        
+        Jobs run inline when workers is 1 and on a thread pool otherwise.
+        Exceptions are returned per job so one failure does not stop the rest.
+        """
+        if self.workers == 1:
+            for job in jobs:
                 try:
-                    dag_config = {
-                        "sensitivity": dataSensitivity,
-                        "cluster_name": cluster_names[i],
-                        "banner_name": b,
-                        "table_name": table_names[i],
-                        "tags": ["Massmart-eComm","P2","Ephemeral","SA","SECURE","MDSE",f"{b}",f"{table_names[i]}","SLT"],
-                        "tableLoadType": tableLoadType,
-                        "output_dir": f"../output/{dlSchemaName}/{table_names[i]}",
-                        "dag_name": f"INTLDLDAT-SA{b}-{tableLoadType}-{dlSchemaName.upper()}-{b}_{dlTableName}",
-                    }
-                    
-                    create_bucket(dag_config, dlSchemaName, output_file="../buckets/bucket_input.csv", env=self.env)
-                    bucket_id = get_bucket_id(dag_config)
-                    prepare_dag_file(sample_dag_file, dag_config)
-                    prepare_sql_file(sample_sql_file, dag_config, dlSchemaName, dlTableName, bucket_id)
-                    
-                    dag_list.append(dag_config)
-                    self.log(f"✓ Generated DAG: {dag_config['dag_name']}")
-                    
+                    yield job, func(*job), None
                 except Exception as e:
-                    self.log(f"✗ Error processing {dlTableName}/{b}: {e}", "ERROR")
-                    self.errors.append(f"{dlTableName}/{b}: {str(e)}")
+                    yield job, None, e
+            return
         
-        return dag_list
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(func, *job) for job in jobs]
+            for job, future in zip(jobs, futures):
+                try:
+                    yield job, future.result(), None
+                except Exception as e:
+                    yield job, None, e
     
     def print_summary(self):
         """Print execution summary"""
-        self.log("=" * 80)
-        self.log("EXECUTION SUMMARY", "INFO")
-        self.log("=" * 80)
-        self.log(f"Log file: {self.log_file}")
+        # Counts come from the structured records, not from ad-hoc lists
+        errors = [r['error'] for r in self.logger.errors()]
+        warnings = [r['warning'] for r in self.logger.warnings()]
+        
+        self.start_phase(RunLogger.SUMMARY_PHASE, "EXECUTION SUMMARY")
+        self.log(f"Log file: {self.log_file or 'none (dry run)'}")
         self.log(f"Environment: {self.env}")
-        self.log(f"Errors: {len(self.errors)}")
-        self.log(f"Warnings: {len(self.warnings)}")
+        self.log(f"Errors: {len(errors)}")
+        self.log(f"Warnings: {len(warnings)}")
+        if self.dry_run_diff is not None:
+            counts = ", ".join(f"{len(paths)} {change}" for change, paths in self.dry_run_diff.items())
+            self.log(f"Dry run (nothing written): {counts}")
         
-        if self.errors:
+        if errors:
             self.log("\nErrors encountered:", "ERROR")
-            for error in self.errors:
+            for error in errors:
                 self.log(f"  - {error}", "ERROR")
         
-        if self.warnings:
+        if warnings:
             self.log("\nWarnings:", "WARNING")
-            for warning in self.warnings:
+            for warning in warnings:
                 self.log(f"  - {warning}", "WARNING")
         
+        self._log_timings()
         self.log("=" * 80)
+        self.logger.flush()
+    
+    def _log_timings(self):
+        """Phase timings, the generation time breakdown and the slowest tables/banners"""
+        phase_timings = self.logger.phase_timings
+        if phase_timings:
+            self.log("\nPhase timings:")
+            for phase, seconds in phase_timings.items():
+                self.log(f"  {phase:<18} {seconds:9.3f}s", phase_s=round(seconds, 6), timed_phase=phase)
+        
+        timings = self.generation_timings
+        if not timings:
+            return
+        
+        # Per-DAG times are summed over all workers, so with --workers > 1 they exceed the phase time
+        self.log(f"\nGeneration time (summed over DAGs): bucket lookup {timings.get('bucket', 0.0):.3f}s, "
+                 f"template rendering {timings.get('render', 0.0):.3f}s, file writes {timings.get('write', 0.0):.3f}s, "
+                 f"total {timings.get('total', 0.0):.3f}s")
+        
+        self.log("Slowest tables:")
+        for table, seconds in heapq.nlargest(self.SLOWEST_COUNT, self.table_timings.items(), key=lambda item: item[1]):
+            self.log(f"  {table:<50} {seconds * 1000:9.3f} ms")
+        
+        self.log("Slowest banners:")
+        for banner, seconds in sorted(self.banner_timings.items(), key=lambda item: item[1], reverse=True):
+            self.log(f"  {banner:<50} {seconds * 1000:9.3f} ms")
 
 
 def main():
@@ -270,11 +1073,20 @@ Examples:
   # Run for production
   python main.py --env prod
   
-  # Dry-run to validate without generating files
+  # Dry-run: show which output files would be added/changed/removed, write nothing
   python main.py --dry-run
   
   # Use custom ingestion file
   python main.py --input /path/to/custom_ingestion.csv
+  
+  # Generate DAG/SQL files on 8 worker threads
+  python main.py --workers 8
+  
+  # Parse-cheap DAGs: bake Variables/properties/cluster config in at generation time
+  python main.py --env prod --static-dags ../static_dag_config.prod.json
+  
+  # Generate and upload changed DAGs straight to the env's DAG bucket
+  python main.py --env dev --upload
         '''
     )
     
@@ -294,15 +1106,197 @@ Examples:
     parser.add_argument(
         '--dry-run',
         action='store_true',
-        help='Validate inputs without generating files'
+        help='Plan in memory and print the added/changed/removed files under output/ without writing anything'
+    )
+    
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=1,
+        help='Number of worker threads for DAG/SQL generation (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--full-rebuild',
+        action='store_true',
+        help='Re-extract bucket mappings and re-render every DAG/SQL file even if their inputs are unchanged'
+    )
+    
+    parser.add_argument(
+        '--quiet', '-q',
+        action='store_true',
+        help='Only print errors, warnings and the summary (the log file is always complete)'
+    )
+    
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Read, validate and generate the input in chunks with bounded memory (for very large sheets)'
+    )
+    
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=5000,
+        help='Rows per chunk in --stream mode (default: 5000)'
+    )
+    
+    parser.add_argument(
+        '--upload',
+        action='store_true',
+        help='Upload changed DAGs to the DAG bucket instead of writing upload_commands.sh'
+    )
+    
+    parser.add_argument(
+        '--upload-dest',
+        default=None,
+        help='Upload destination: gs://bucket/prefix/ or a local directory '
+             '(default: gs://bfdaf-dags-intldlsa<env>-catalog/)'
+    )
+    
+    parser.add_argument(
+        '--static-dags',
+        metavar='CONFIG_JSON',
+        default=None,
+        help='Generate parse-cheap DAGs from sample_dag_static.py with Airflow Variables, global properties '
+             'and cluster config resolved from CONFIG_JSON (no Variable.get/GCS calls when Airflow parses them)'
+    )
+    
+    parser.add_argument(
+        '--shared-cluster',
+        action='store_true',
+        help='Generate one DAG per table from sample_dag_shared.py: a single cluster with a task group '
+             'per banner, instead of one DAG and cluster per banner'
+    )
+    
+    parser.add_argument(
+        '--batch-budget',
+        type=int,
+        metavar='TASK_PAIRS',
+        default=None,
+        help='Generate batch DAGs from sample_dag_batch.py: tables of one schema and sensitivity share one '
+             'cluster, at most TASK_PAIRS ingest/upsert pairs (table x banner) per DAG'
+    )
+    
+    parser.add_argument(
+        '--batch-concurrency',
+        type=int,
+        default=4,
+        help='Task pairs a batch DAG runs on its cluster at the same time (default: 4)'
+    )
+    
+    parser.add_argument(
+        '--dag-factory',
+        action='store_true',
+        help='Write one DAG factory module (sample_dag_factory.py) plus a compact JSON config of every DAG '
+             'to output/dag_factory/ instead of one DAG file per table and banner'
+    )
+    
+    parser.add_argument(
+        '--table-stats',
+        metavar='STATS_CSV',
+        default=None,
+        help='Size each DAG\'s Spark dag_params defaults and machine type from a table statistics CSV '
+             '(icdsTableName,rowCount,avgRowWidthBytes,dailyDeltaRows); see sizing.py for the model'
+    )
+    
+    parser.add_argument(
+        '--schedule-window',
+        metavar='HH:MM-HH:MM',
+        default=None,
+        help='Stagger the PROD schedules: give every DAG its own daily cron slot inside this UTC window '
+             '(e.g. 22:00-04:00) instead of all of them at 0 22 * * *'
+    )
+    
+    parser.add_argument(
+        '--max-concurrent-dags',
+        type=int,
+        default=10,
+        help='DAGs (and clusters) running at the same time at most in --schedule-window (default: 10)'
+    )
+    
+    parser.add_argument(
+        '--runtimes',
+        metavar='RUNTIMES_CSV',
+        default=None,
+        help=f'Estimated minutes per DAG run for --schedule-window (icdsTableName,runtimeMinutes); '
+             f'tables not in it count {DEFAULT_RUNTIME_MINUTES}'
+    )
+    
+    parser.add_argument(
+        '--allow-overflow',
+        action='store_true',
+        help='Schedule the DAGs that do not fit --schedule-window after its end with a warning '
+             '(default: fail the run and write nothing)'
+    )
+    
+    parser.add_argument(
+        '--deferrable',
+        type=int,
+        nargs='?',
+        const=DEFAULT_DEFERRABLE_POLL_SECONDS,
+        default=0,
+        metavar='POLL_SECONDS',
+        help='Generate deferrable Dataproc job and cluster-delete tasks that wait in the triggerer instead of '
+             f'holding a worker slot, polling every POLL_SECONDS (default: {DEFAULT_DEFERRABLE_POLL_SECONDS}). '
+             'Cluster creation stays blocking: BFDMSDataprocCreateClusterOperator has no deferrable mode'
+    )
+    
+    parser.add_argument(
+        '--field-catalogue',
+        metavar='CATALOGUE_CSV',
+        default=None,
+        help='Generate the typed DDL column list (primary keys marked) from a DD03L-style SAP field catalogue '
+             'export (TABNAME,FIELDNAME,KEYFLAG,DATATYPE,DDTEXT,...); see field_catalogue.py'
+    )
+    
+    parser.add_argument(
+        '--hudi-key-conf',
+        action='store_true',
+        help='Pass the Hudi configs of ingestion.csv to the upsert job as --hoodieConf arguments: keyPrimaryKey and '
+             'keyPreCombine as the record key and precombine field, plus the optional hudi* tuning columns. Without it '
+             'the upsert job gets no --hoodieConf (the job must accept --hoodieConf)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Profile the run with cProfile and tracemalloc; writes .prof and .alloc.txt next to the log file'
     )
     
     args = parser.parse_args()
     
+    if sum(bool(mode) for mode in (args.shared_cluster, args.static_dags, args.batch_budget, args.dag_factory)) > 1:
+        parser.error("--shared-cluster, --static-dags, --batch-budget and --dag-factory use different DAG templates "
+                     "and cannot be combined")
+    if args.batch_budget is not None and args.batch_budget < 1:
+        parser.error("--batch-budget must be at least 1")
+    if args.batch_budget and args.stream:
+        # Batches are packed over the whole plan; per-chunk packing would reuse batch names
+        parser.error("--batch-budget cannot be combined with --stream")
+    if args.schedule_window:
+        try:
+            parse_window(args.schedule_window)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.max_concurrent_dags < 1:
+            parser.error("--max-concurrent-dags must be at least 1")
+        if args.stream:
+            # The schedule spreads the whole plan over the window, not one chunk at a time
+            parser.error("--schedule-window cannot be combined with --stream")
+    elif args.runtimes or args.allow_overflow:
+        parser.error("--runtimes and --allow-overflow need --schedule-window")
+    if args.deferrable < 0:
+        parser.error("--deferrable polling interval must not be negative")
+    
     pipeline = IngestionPipeline(
         ingestion_file=args.input,
         env=args.env,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        workers=args.workers,
+        full_rebuild=args.full_rebuild,
+        quiet=args.quiet,
+        options=PipelineOptions.from_args(args)
     )
     
     success = pipeline.run()
@@ -0,0 +1,143 @@
+import os
+import json
+import hashlib
+
+from utils import atomic_write_text
+
+MANIFEST_FILE = ".manifest.json"
+MANIFEST_VERSION = 1
+
+# Built once: json.dumps would construct an encoder for every digest
+_DIGEST_ENCODER = json.JSONEncoder(sort_keys=True, default=str, separators=(',', ':'))
+
+
+def digest_inputs(*parts):
+    """
+    Return a stable sha256 hex digest for a set of artifact inputs
+
+    Args:
+        parts: JSON-serialisable values (ingestion row dict, template digest,
+            bucket id, env, ...). Non-JSON values are hashed via str().
+    """
+    payload = _DIGEST_ENCODER.encode(parts)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class OutputManifest:
+    """
+    Content-hash manifest of generated artifacts under output/
+
+    Each artifact is recorded with a digest of the inputs it was rendered
+    from. A run re-renders only artifacts whose inputs digest changed (or whose
+    file is missing), and prune() deletes files the previous run produced
+    but the current run no longer does.
+
+    Manifest format (output/.manifest.json):
+        {"version": 1, "artifacts": {"<path relative to output/>": {"inputs": "<sha256>", "size": 123}}}
+    """
+
+    def __init__(self, output_root="../output"):
+        self.output_root = output_root
+        self.path = os.path.join(output_root, MANIFEST_FILE)
+        # Artifact paths are built under output_root, so their key is the rest of the path
+        self._prefix = os.path.join(output_root, '')
+        self.previous = self._load()
+        self.current = {}
+        # Keys is_fresh found unchanged on disk; record() reuses their entry instead of another stat
+        self._verified = set()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # A corrupt manifest only costs a full rebuild
+            return {}
+        if data.get('version') != MANIFEST_VERSION:
+            return {}
+        return data.get('artifacts', {})
+
+    def _key(self, path):
+        if path.startswith(self._prefix) and '..' not in path[len(self._prefix):]:
+            key = path[len(self._prefix):]
+        else:
+            key = os.path.relpath(path, self.output_root)
+        return key.replace(os.sep, '/') if os.sep != '/' else key
+
+    def contains(self, path):
+        """True if the previous run's manifest lists path, i.e. a real run would prune it"""
+        return self._key(path) in self.previous
+
+    def is_fresh(self, path, inputs_digest):
+        """True if path was rendered from the same inputs and is still on disk unchanged in size"""
+        key = self._key(path)
+        entry = self.previous.get(key)
+        if entry is None or entry.get('inputs') != inputs_digest:
+            return False
+        try:
+            fresh = os.path.getsize(path) == entry.get('size')
+        except OSError:
+            return False
+        if fresh:
+            self._verified.add(key)
+        return fresh
+
+    def record(self, path, inputs_digest):
+        """Record an artifact produced (or confirmed fresh) by this run"""
+        key = self._key(path)
+        entry = self.previous.get(key)
+        if key in self._verified and entry.get('inputs') == inputs_digest:
+            self.current[key] = entry
+            return
+        self._verified.discard(key)
+        self.current[key] = {
+            'inputs': inputs_digest,
+            'size': os.path.getsize(path),
+        }
+
+    def keep(self, path):
+        """Carry an artifact over from the previous manifest (e.g. its job failed this run)"""
+        key = self._key(path)
+        if key in self.previous and key not in self.current:
+            self.current[key] = self.previous[key]
+
+    def carry_over(self):
+        """Carry every previous artifact not seen this run over to the new manifest"""
+        for key, entry in self.previous.items():
+            self.current.setdefault(key, entry)
+
+    def artifacts(self):
+        """Return the paths (under output_root) of every artifact recorded this run"""
+        return [os.path.join(self.output_root, key) for key in sorted(self.current)]
+
+    def prune(self):
+        """
+        Delete artifacts from the previous run that this run did not produce
+
+        Returns:
+            list: Paths of the removed files
+        """
+        removed = []
+        for key in sorted(set(self.previous) - set(self.current)):
+            path = os.path.join(self.output_root, key)
+            if os.path.exists(path):
+                os.remove(path)
+                removed.append(path)
+            self._remove_empty_dirs(os.path.dirname(path))
+        return removed
+
+    def _remove_empty_dirs(self, directory):
+        root = os.path.abspath(self.output_root)
+        directory = os.path.abspath(directory)
+        while directory.startswith(root + os.sep) and os.path.isdir(directory) and not os.listdir(directory):
+            os.rmdir(directory)
+            directory = os.path.dirname(directory)
+
+    def save(self):
+        """Atomically write the manifest for this run (a no-op run leaves the file untouched)"""
+        if self.current == self.previous and os.path.exists(self.path):
+            return
+        data = {'version': MANIFEST_VERSION, 'artifacts': dict(sorted(self.current.items()))}
+        atomic_write_text(self.path, json.dumps(data, indent=2) + "\n")
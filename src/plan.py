@@ -0,0 +1,372 @@
+from utils import prepare_cluster_name, prepare_table_name
+from manifest import digest_inputs
+
+DAG_TAG_PREFIX = ["Massmart-eComm", "P2", "Ephemeral", "SA", "SECURE", "MDSE"]
+DAG_TAG_SUFFIX = ["SLT"]
+
+# Hudi write configs the upsert job gets from the ingestion columns (--hudi-key-conf)
+HUDI_RECORD_KEY_FIELD = "hoodie.datasource.write.recordkey.field"
+HUDI_PRECOMBINE_FIELD = "hoodie.datasource.write.precombine.field"
+HUDI_INDEX_TYPE = "hoodie.index.type"
+HUDI_BUCKET_COUNT = "hoodie.bucket.index.num.buckets"
+HUDI_MAX_FILE_SIZE = "hoodie.parquet.max.file.size"
+HUDI_PARTITION_PATH_FIELD = "hoodie.datasource.write.partitionpath.field"
+HUDI_HIVE_STYLE_PARTITIONING = "hoodie.datasource.write.hive_style_partitioning"
+# Optional ingestion columns tuning the Hudi write
+HUDI_TUNING_COLUMNS = ['hudiIndexType', 'hudiBucketCount', 'hudiTargetFileSizeMB', 'hudiPartitionField']
+
+
+def _clean(value):
+    """NaN/None (a missing value from pandas or the csv reader) -> None, everything else unchanged"""
+    if value is None or value != value:
+        return None
+    return value
+
+
+def _whole_number(value):
+    """'16', 16 or 16.0 -> 16"""
+    return int(float(value))
+
+
+def hudi_write_options(table):
+    """
+    Hudi write configs of a table's upsert job with --hudi-key-conf, as strings
+
+    keyPrimaryKey becomes the record key (a composite key keeps its column
+    order) and keyPreCombine the precombine field. The optional
+    hudiIndexType, hudiBucketCount and hudiTargetFileSizeMB columns tune the
+    index and the parquet file size. hudiPartitionField partitions the table
+    with a hive-style partition path (<column>=<value>), the layout of the
+    PARTITIONED BY clause of its DDL. Empty columns are left to the job's
+    defaults.
+    """
+    options = {}
+    if table.keyPrimaryKey is not None and str(table.keyPrimaryKey).strip():
+        options[HUDI_RECORD_KEY_FIELD] = ",".join(key.strip() for key in str(table.keyPrimaryKey).split(',') if key.strip())
+    if table.keyPreCombine is not None and str(table.keyPreCombine).strip():
+        options[HUDI_PRECOMBINE_FIELD] = str(table.keyPreCombine).strip()
+    if table.hudiIndexType is not None and str(table.hudiIndexType).strip():
+        options[HUDI_INDEX_TYPE] = str(table.hudiIndexType).strip().upper()
+    if table.hudiBucketCount is not None and str(table.hudiBucketCount).strip():
+        options[HUDI_BUCKET_COUNT] = str(_whole_number(table.hudiBucketCount))
+    if table.hudiTargetFileSizeMB is not None and str(table.hudiTargetFileSizeMB).strip():
+        options[HUDI_MAX_FILE_SIZE] = str(_whole_number(table.hudiTargetFileSizeMB) * 1024 * 1024)
+    if table.partition_column:
+        options[HUDI_PARTITION_PATH_FIELD] = table.partition_column
+        options[HUDI_HIVE_STYLE_PARTITIONING] = "true"
+    return options
+
+
+def _hudi_options(banner_dags):
+    """Banner table name -> Hudi write configs, for the tables that have any"""
+    return {dag.table_name: dag.table.hudi_options for dag in banner_dags if dag.table.hudi_options}
+
+
+class DagSpec:
+    """
+    One generated DAG: a table x banner combination
+
+    Attribute names match the keys of the old dag_config dict, and
+    dag_config-style access (spec['table_name'], spec.get('banner_name'))
+    is supported, so the bucket/DAG/SQL helpers accept a DagSpec directly.
+    """
+
+    __slots__ = ('table', 'banner_name', 'table_name', 'cluster_name', 'dag_name', 'output_dir')
+
+    def __init__(self, table, banner_name, table_name, cluster_name):
+        self.table = table
+        self.banner_name = banner_name
+        self.table_name = table_name
+        self.cluster_name = cluster_name
+        self.dag_name = f"INTLDLDAT-SA{banner_name}-{table.tableLoadType}-{table.dlSchemaName.upper()}-{banner_name}_{table.dlTableName}"
+        self.output_dir = f"../output/{table.dlSchemaName}/{table_name}"
+
+    @property
+    def sensitivity(self):
+        return self.table.dataSensitivity
+
+    @property
+    def tableLoadType(self):
+        return self.table.tableLoadType
+
+    @property
+    def dlSchemaName(self):
+        return self.table.dlSchemaName
+
+    @property
+    def dlTableName(self):
+        return self.table.dlTableName
+
+    @property
+    def digest(self):
+        """Digest of the ingestion row(s) the DAG file is rendered from"""
+        return self.table.digest
+
+    @property
+    def tags(self):
+        return DAG_TAG_PREFIX + [self.banner_name, self.table_name] + DAG_TAG_SUFFIX
+
+    @property
+    def upsert_hudi_options(self):
+        """Hudi write configs of the upsert job(s) with --hudi-key-conf, per table name passed to --sapTableName"""
+        return _hudi_options((self,))
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self):
+        """The equivalent dag_config dict"""
+        return {
+            "sensitivity": self.sensitivity,
+            "cluster_name": self.cluster_name,
+            "banner_name": self.banner_name,
+            "table_name": self.table_name,
+            "tags": self.tags,
+            "tableLoadType": self.tableLoadType,
+            "output_dir": self.output_dir,
+            "dag_name": self.dag_name,
+        }
+
+    def __repr__(self):
+        return f"DagSpec({self.dag_name!r})"
+
+
+class SharedDagSpec(DagSpec):
+    """
+    One DAG for every banner of a table (--shared-cluster)
+
+    The DAG creates one cluster and runs a task group per banner on it.
+    banner_name is the comma-joined banner list; banner_dags are the
+    per-banner DagSpecs, which still own the bucket, SQL file and the
+    --banner/--sapTableName values of each task group.
+    """
+
+    __slots__ = ('banner_dags',)
+
+    def __init__(self, table):
+        self.table = table
+        self.banner_dags = table.dags
+        self.banner_name = ",".join(table.banners)
+        self.table_name = table.dlTableName.lower()
+        self.cluster_name = f"{table.dlSchemaName.lower().replace('_', '-')}-{table.dlTableName.lower().replace('_', '-')}"
+        self.dag_name = f"INTLDLDAT-SA-{table.tableLoadType}-{table.dlSchemaName.upper()}-{table.dlTableName}"
+        self.output_dir = f"../output/{table.dlSchemaName}/{self.table_name}"
+
+    @property
+    def banner_tables(self):
+        """Banner -> banner table name, in ingestion order"""
+        return {dag.banner_name: dag.table_name for dag in self.banner_dags}
+
+    @property
+    def tags(self):
+        return DAG_TAG_PREFIX + list(self.table.banners) + [self.table_name] + DAG_TAG_SUFFIX
+
+    @property
+    def upsert_hudi_options(self):
+        return _hudi_options(self.banner_dags)
+
+    def to_dict(self):
+        config = super().to_dict()
+        config["banner_tables"] = self.banner_tables
+        return config
+
+    def __repr__(self):
+        return f"SharedDagSpec({self.dag_name!r})"
+
+
+class BatchDagSpec(DagSpec):
+    """
+    One DAG for a batch of tables of one schema and sensitivity (--batch-budget)
+
+    The DAG creates one cluster and fans out an ingest >> upsert task pair
+    per table x banner, at most max_active_tasks at a time. Each pair runs in
+    a task group named after its banner table and every table is tagged, so
+    a table can still be traced to its batch DAG.
+    """
+
+    __slots__ = ('tables', 'banner_dags', 'batch_name', 'max_active_tasks')
+
+    def __init__(self, tables, batch_number, max_active_tasks):
+        first = tables[0]
+        self.table = first  # schema and sensitivity are shared by the whole batch
+        self.tables = tuple(tables)
+        self.banner_dags = tuple(dag for table in tables for dag in table.dags)
+        self.max_active_tasks = max_active_tasks
+        self.batch_name = f"{str(first.dataSensitivity).upper()}_BATCH_{batch_number:03d}"
+        self.banner_name = ",".join(dict.fromkeys(dag.banner_name for dag in self.banner_dags))
+        self.table_name = self.batch_name.lower()
+        self.cluster_name = f"{first.dlSchemaName.lower().replace('_', '-')}-{self.table_name.replace('_', '-')}"
+        self.dag_name = f"INTLDLDAT-SA-BATCH-{first.dlSchemaName.upper()}-{self.batch_name}"
+        self.output_dir = f"../output/{first.dlSchemaName}/{self.table_name}"
+
+    @property
+    def tableLoadType(self):
+        return "BATCH"
+
+    @property
+    def dlTableName(self):
+        return self.batch_name
+
+    @property
+    def digest(self):
+        return digest_inputs([table.digest for table in self.tables], self.max_active_tasks)
+
+    @property
+    def batch_tasks(self):
+        """[banner, banner table name] of every task pair, in ingestion order"""
+        return [[dag.banner_name, dag.table_name] for dag in self.banner_dags]
+
+    @property
+    def tags(self):
+        banners = list(dict.fromkeys(dag.banner_name for dag in self.banner_dags))
+        tables = [table.dlTableName.lower() for table in self.tables]
+        return DAG_TAG_PREFIX + banners + tables + ["BATCH"] + DAG_TAG_SUFFIX
+
+    @property
+    def upsert_hudi_options(self):
+        return _hudi_options(self.banner_dags)
+
+    def to_dict(self):
+        config = super().to_dict()
+        config["batch_tasks"] = self.batch_tasks
+        config["max_active_tasks"] = self.max_active_tasks
+        return config
+
+    def __repr__(self):
+        return f"BatchDagSpec({self.dag_name!r}, tables={len(self.tables)})"
+
+
+class TableSpec:
+    """
+    One row of ingestion.csv, parsed once
+
+    Attribute names follow the ingestion.csv columns. digest is a stable
+    hash of the full input row and is the cache key for everything
+    generated from it.
+    """
+
+    __slots__ = (
+        'row_number', 'icdsTableName', 'banners', 'dataSensitivity', 'dlSchemaName',
+        'dlTableName', 'tableLoadType', 'keyPreCombine', 'keyPrimaryKey',
+        'hudiIndexType', 'hudiBucketCount', 'hudiTargetFileSizeMB', 'hudiPartitionField', 'hudi_options',
+        'digest', 'dags'
+    )
+
+    def __init__(self, row_number, record):
+        self.row_number = row_number
+        self.icdsTableName = _clean(record.get('icdsTableName'))
+        self.banners = tuple(b.strip() for b in str(record['BANNER_NAME']).split(','))
+        self.dataSensitivity = _clean(record.get('dataSensitivity'))
+        self.dlSchemaName = _clean(record.get('dlSchemaName'))
+        self.dlTableName = _clean(record.get('dlTableName'))
+        self.tableLoadType = _clean(record.get('tableLoadType'))
+        self.keyPreCombine = _clean(record.get('keyPreCombine'))
+        self.keyPrimaryKey = _clean(record.get('keyPrimaryKey'))
+        # Optional Hudi tuning columns
+        self.hudiIndexType = _clean(record.get('hudiIndexType'))
+        self.hudiBucketCount = _clean(record.get('hudiBucketCount'))
+        self.hudiTargetFileSizeMB = _clean(record.get('hudiTargetFileSizeMB'))
+        self.hudiPartitionField = _clean(record.get('hudiPartitionField'))
+        self.hudi_options = hudi_write_options(self)
+        # Missing values hash the same whether the row came from pandas (NaN) or the csv reader (None)
+        self.digest = digest_inputs({key: _clean(value) for key, value in record.items()})
+
+        table_names = prepare_table_name(self.banners, self.dlTableName)
+        cluster_names = prepare_cluster_name(self.dlSchemaName, self.banners, self.dlTableName)
+        self.dags = tuple(
+            DagSpec(self, b, table_names[i], cluster_names[i])
+            for i, b in enumerate(self.banners)
+        )
+
+    @property
+    def partition_column(self):
+        """Data lake column of the hive-style Hudi partition path, or None for an unpartitioned table"""
+        if self.hudiPartitionField is None or not str(self.hudiPartitionField).strip():
+            return None
+        return str(self.hudiPartitionField).strip().lower()
+
+    def table_names(self):
+        return [dag.table_name for dag in self.dags]
+
+    def shared_dag(self):
+        """The single shared-cluster DAG for all banners of this table"""
+        return SharedDagSpec(self)
+
+    def __repr__(self):
+        return f"TableSpec(row={self.row_number}, {self.dlSchemaName}.{self.dlTableName}, banners={self.banners})"
+
+
+def frame_rows(df):
+    """(row_number, record) pairs of an ingestion DataFrame; row_number is index + 1"""
+    for index, record in zip(df.index, df.to_dict('records')):
+        yield index + 1, record
+
+
+def build_plan(rows):
+    """
+    Build TableSpecs (each with its DagSpecs) from parsed ingestion rows
+
+    Rows that cannot be turned into a spec (e.g. a missing schema name) are
+    returned as errors instead of aborting the whole plan.
+
+    Args:
+        rows: Iterable of (row_number, record dict) pairs, e.g.
+            enumerate(records, 1) or frame_rows(df)
+
+    Returns:
+        tuple: (list of TableSpec, list of (row_number, dlTableName, exception))
+    """
+    tables = []
+    errors = []
+
+    for row_number, record in rows:
+        try:
+            tables.append(TableSpec(row_number, record))
+        except Exception as e:
+            errors.append((row_number, record.get('dlTableName'), e))
+
+    return tables, errors
+
+
+def plan_batches(tables, budget, max_active_tasks):
+    """
+    Pack tables into BatchDagSpecs, per dlSchemaName and sensitivity
+
+    Tables are taken in ingestion order and a batch is closed when the next
+    table's task pairs (one per banner) would take it over budget. A table
+    is never split across batches; one with more banners than budget gets a
+    batch of its own. Appending rows to ingestion.csv therefore only changes
+    the last batch of their schema.
+
+    Args:
+        tables: TableSpecs of the plan
+        budget: Maximum ingest/upsert task pairs per batch DAG
+        max_active_tasks: Task pairs a batch DAG runs at the same time
+
+    Returns:
+        list: BatchDagSpecs, grouped by schema/sensitivity in order of first appearance
+    """
+    groups = {}
+    for table in tables:
+        batches = groups.setdefault((table.dlSchemaName, str(table.dataSensitivity).lower()), [[]])
+        if batches[-1] and sum(len(t.dags) for t in batches[-1]) + len(table.dags) > budget:
+            batches.append([])
+        batches[-1].append(table)
+
+    return [
+        BatchDagSpec(batch, number, max_active_tasks)
+        for batches in groups.values()
+        for number, batch in enumerate(batches, 1)
+    ]
+
+
+def iter_dags(tables):
+    """All DagSpecs of a plan, in ingestion order"""
+    for table in tables:
+        yield from table.dags
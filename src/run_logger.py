@@ -0,0 +1,122 @@
+import sys
+import json
+import time
+import atexit
+from collections import Counter
+from datetime import datetime
+
+
+class RunLogger:
+    """
+    Buffered JSON-lines logger with one long-lived file handle per run
+
+    Every message becomes one JSON record with ts, level, phase, table,
+    banner, elapsed_ms and message fields. Records are buffered and flushed
+    on phase boundaries, on close() and at interpreter exit. The wall time
+    of every phase is kept in phase_timings. With log_file=None nothing is
+    written to disk (dry runs).
+
+    Only per-level counts and error/warning records are kept in memory, so a
+    large run does not grow the logger with every "Generated DAG" line.
+
+    Console output:
+        quiet=False: every message is printed as "[ts] [LEVEL] message"
+        quiet=True:  only errors, warnings and SUMMARY-phase messages are printed
+    """
+
+    QUIET_LEVELS = ("ERROR", "WARNING")
+    SUMMARY_PHASE = "SUMMARY"
+
+    def __init__(self, log_file, quiet=False, console=None, buffer_size=1 << 16):
+        self.log_file = log_file
+        self.quiet = quiet
+        self.console = console or sys.stdout
+        self.phase = None
+        self.phase_started = None
+        self.phase_timings = {}
+        self.counts = Counter()
+        self.records = []
+        self.start = time.perf_counter()
+        self._handle = open(log_file, 'a', buffering=buffer_size, encoding='utf-8') if log_file else None
+        atexit.register(self.close)
+
+    def elapsed_ms(self):
+        """Milliseconds since the logger was created"""
+        return round((time.perf_counter() - self.start) * 1000, 3)
+
+    def set_phase(self, phase):
+        """Start a new phase; buffered records of the previous phase are flushed and its time recorded"""
+        self.end_phase()
+        self.flush()
+        self.phase = phase
+        self.phase_started = time.perf_counter()
+
+    def end_phase(self):
+        """Add the time since the current phase started to phase_timings (in seconds)"""
+        if self.phase is not None and self.phase_started is not None:
+            elapsed = time.perf_counter() - self.phase_started
+            self.phase_timings[self.phase] = self.phase_timings.get(self.phase, 0.0) + elapsed
+            self.phase_started = None
+
+    def log(self, message, level="INFO", table=None, banner=None, **fields):
+        """
+        Write one structured record and echo it to the console
+
+        Args:
+            message: Human-readable message
+            level: INFO, WARNING or ERROR
+            table: dlTableName the message is about, if any
+            banner: Banner the message is about, if any
+            fields: Extra JSON-serialisable fields for the record
+
+        Returns:
+            dict: The record that was written
+        """
+        now = datetime.now()
+        record = {
+            "ts": now.isoformat(timespec='milliseconds'),
+            "level": level,
+            "phase": self.phase,
+            "table": table,
+            "banner": banner,
+            "elapsed_ms": self.elapsed_ms(),
+            "message": message,
+        }
+        record.update(fields)
+
+        self.counts[level] += 1
+        if level in self.QUIET_LEVELS:
+            self.records.append(record)
+
+        if self._handle is not None:
+            self._handle.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+        if not self.quiet or level in self.QUIET_LEVELS or self.phase == self.SUMMARY_PHASE:
+            print(f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] [{level}] {message}", file=self.console)
+
+        return record
+
+    def errors(self):
+        """Error records that carry an 'error' field (i.e. count towards the summary)"""
+        return [r for r in self.records if r["level"] == "ERROR" and "error" in r]
+
+    def warnings(self):
+        """Warning records that carry a 'warning' field (i.e. count towards the summary)"""
+        return [r for r in self.records if r["level"] == "WARNING" and "warning" in r]
+
+    def flush(self):
+        if self._handle is not None:
+            self._handle.flush()
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,183 @@
+"""
+Staggered PROD schedules (--schedule-window)
+
+Every DAG template runs at "0 22 * * *" in PROD, so every DAG asks for a
+Dataproc cluster in the same minute. The planner here spreads the DAGs over a
+daily batch window instead:
+
+1. Each DAG gets an estimated runtime from the runtimes file (minutes per
+   icdsTableName, DEFAULT_RUNTIME_MINUTES when missing). A shared-cluster DAG
+   runs its banners in parallel, a batch DAG runs its task pairs
+   max_active_tasks at a time.
+2. DAGs are placed longest first on max_concurrent lanes; each one starts on
+   the lane that frees up first, rounded up to the next SLOT_MINUTES slot. At
+   most max_concurrent DAGs (and clusters) therefore run at any time, as far
+   as the estimates hold.
+3. A DAG whose start falls after the end of the window still gets a slot and is
+   reported as overflow.
+
+Times are minutes of the day in UTC, the timezone of the DAGs' start_date.
+"""
+import heapq
+
+from utils import read_csv_records
+
+RUNTIME_COLUMNS = ['icdsTableName', 'runtimeMinutes']
+
+# The DAGs' SLA, used for tables without an estimate
+DEFAULT_RUNTIME_MINUTES = 60
+SLOT_MINUTES = 5
+PROFILE_MINUTES = 30
+MINUTES_PER_DAY = 24 * 60
+
+
+def load_runtimes(path):
+    """
+    Read the estimated runtime of each table's DAG run
+
+    CSV format:
+    icdsTableName,runtimeMinutes
+    IKPF,45
+    T001W,4
+
+    Args:
+        path: Path to the CSV file
+
+    Returns:
+        dict: {icdsTableName: runtime in minutes (int, at least 1)}
+
+    Raises:
+        ValueError: If a column is missing or a runtime is not a positive number
+    """
+    columns, records = read_csv_records(path)
+    missing = [col for col in RUNTIME_COLUMNS if col not in columns]
+    if missing:
+        raise ValueError(f"Runtimes file {path} is missing column(s): {missing}")
+
+    runtimes = {}
+    for row, record in enumerate(records, 1):
+        name = record['icdsTableName']
+        if not name:
+            raise ValueError(f"{path} row {row}: icdsTableName is empty")
+        try:
+            minutes = float(record['runtimeMinutes'])
+        except (TypeError, ValueError):
+            raise ValueError(f"{path} row {row} ({name}): runtimeMinutes {record['runtimeMinutes']!r} "
+                             f"is not a number") from None
+        if minutes <= 0:
+            raise ValueError(f"{path} row {row} ({name}): runtimeMinutes must be positive")
+        runtimes[name.strip()] = max(1, round(minutes))
+    return runtimes
+
+
+def parse_window(window):
+    """
+    Parse a batch window "HH:MM-HH:MM" (UTC) into (start, end) minutes of the day
+
+    The window may wrap past midnight ("22:00-04:00"); equal start and end
+    mean the whole day.
+
+    Raises:
+        ValueError: If the window is not in HH:MM-HH:MM format
+    """
+    def minute(text):
+        hours, sep, minutes = text.strip().partition(':')
+        if not sep or not hours.isdigit() or not minutes.isdigit():
+            raise ValueError
+        hours, minutes = int(hours), int(minutes)
+        if hours > 23 or minutes > 59:
+            raise ValueError
+        return hours * 60 + minutes
+
+    try:
+        start, end = str(window).split('-')
+        return minute(start), minute(end)
+    except ValueError:
+        raise ValueError(f"Invalid schedule window '{window}', expected HH:MM-HH:MM (UTC), e.g. 22:00-04:00") from None
+
+
+def window_minutes(window):
+    """Length of a (start, end) window in minutes"""
+    start, end = window
+    return (end - start) % MINUTES_PER_DAY or MINUTES_PER_DAY
+
+
+def format_minute(minute):
+    """Minute of the day as HH:MM"""
+    minute %= MINUTES_PER_DAY
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def cron_expression(minute):
+    """Daily cron expression starting at a minute of the day"""
+    minute %= MINUTES_PER_DAY
+    return f"{minute % 60} {minute // 60} * * *"
+
+
+def estimate_runtime(task_runtimes, concurrency):
+    """
+    Runtime of a DAG running task_runtimes, at most concurrency tasks at a time
+
+    Returns:
+        int: The longest task, or the total work spread over concurrency, whichever is longer
+    """
+    total = sum(task_runtimes)
+    return max(max(task_runtimes), -(-total // max(1, concurrency)))
+
+
+def plan_schedule(jobs, window, max_concurrent, slot_minutes=SLOT_MINUTES):
+    """
+    Assign every job a start minute so that at most max_concurrent run at once
+
+    Args:
+        jobs: (name, runtime minutes) pairs
+        window: (start, end) minutes of the day, see parse_window
+        max_concurrent: Jobs running at the same time at most
+        slot_minutes: Start times are multiples of this many minutes after the window start
+
+    Returns:
+        tuple: ({name: start offset in minutes from the window start}, [names starting after the window])
+    """
+    length = window_minutes(window)
+    lanes = [0] * max(1, max_concurrent)
+    offsets = {}
+    overflow = []
+
+    # Longest first, so the long runs do not end up at the tail of the window
+    for name, runtime in sorted(jobs, key=lambda job: (-job[1], job[0])):
+        free = heapq.heappop(lanes)
+        offset = -(-free // slot_minutes) * slot_minutes
+        heapq.heappush(lanes, offset + runtime)
+        offsets[name] = offset
+        if offset >= length:
+            overflow.append(name)
+    return offsets, overflow
+
+
+def concurrency_profile(runs, bucket_minutes=PROFILE_MINUTES):
+    """
+    Peak number of running jobs per bucket_minutes, from the window start
+
+    Args:
+        runs: (start offset, runtime) pairs in minutes
+
+    Returns:
+        list: [(bucket start offset, peak running jobs)] up to the last run's end
+    """
+    if not runs:
+        return []
+    horizon = max(start + runtime for start, runtime in runs)
+    delta = [0] * (horizon + 1)
+    for start, runtime in runs:
+        delta[start] += 1
+        delta[start + runtime] -= 1
+
+    profile = []
+    running = 0
+    for minute in range(horizon):
+        running += delta[minute]
+        if minute % bucket_minutes == 0:
+            profile.append([minute, running])
+        elif running > profile[-1][1]:
+            profile[-1][1] = running
+    return [tuple(bucket) for bucket in profile]
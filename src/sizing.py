@@ -0,0 +1,207 @@
+"""
+Spark resource sizing from table statistics (--table-stats)
+
+Sizing model
+------------
+1. Data volume per job, from the table statistics file:
+       table bytes  = rowCount * avgRowWidthBytes
+       ingest bytes = table bytes for FULL loads, dailyDeltaRows * avgRowWidthBytes for INC loads
+       upsert bytes = table bytes for FULL loads,
+                      ingest bytes + UPSERT_REWRITE_FRACTION * table bytes for INC loads
+                      (Hudi rewrites the file groups the delta touches, not just the delta)
+2. Executor cores: one core handles BYTES_PER_CORE within the DAG's 60-minute SLA,
+       cores = ceil(bytes / BYTES_PER_CORE)
+   packed into executors of 2 cores (up to SMALL_JOB_CORES cores in total) or 4 cores.
+3. Executor memory: MEMORY_PER_CORE_GB per core, LARGE_MEMORY_PER_CORE_GB for jobs over
+   LARGE_JOB_BYTES (bigger merges/shuffles would otherwise spill), plus a memory overhead
+   factor of 0.1 (0.2 for large jobs).
+4. Driver: 1 core/2g for a single executor, 2 cores/3g (the sample_dag.py default) up to
+   8 executors, 4 cores/8g beyond. Jobs run in client mode, so the driver is on the master.
+5. Machine type: the cheapest entry of MACHINE_TYPES on which CLUSTER_WORKERS workers fit
+   the executors of the bigger of the two jobs (x the jobs a batch or shared-cluster DAG runs at once), with
+   YARN_MEMORY_FRACTION of the worker memory available to YARN. A job that does not fit on
+   the largest machine is capped to the executors that do.
+
+Tables without statistics keep the dag_params defaults of the DAG template.
+"""
+import math
+
+from utils import read_csv_records
+
+TABLE_STATS_COLUMNS = ['icdsTableName', 'rowCount', 'avgRowWidthBytes', 'dailyDeltaRows']
+
+GIB = 1024 ** 3
+
+BYTES_PER_CORE = 2 * GIB
+UPSERT_REWRITE_FRACTION = 0.1
+SMALL_JOB_CORES = 4
+MEMORY_PER_CORE_GB = 2
+LARGE_JOB_BYTES = 64 * GIB
+LARGE_MEMORY_PER_CORE_GB = 4
+
+# Workers per cluster, as set by read_cluster_config() in the DAG templates
+CLUSTER_WORKERS = 2
+YARN_MEMORY_FRACTION = 0.8
+
+# (machine type, vCPUs, memory GB), cheapest first
+MACHINE_TYPES = [
+    ("n1-standard-4", 4, 15),
+    ("n1-standard-8", 8, 30),
+    ("n1-highmem-8", 8, 52),
+    ("n1-standard-16", 16, 60),
+    ("n1-highmem-16", 16, 104),
+    ("n1-highmem-32", 32, 208),
+    ("n1-highmem-64", 64, 416),
+]
+
+
+def load_table_stats(path):
+    """
+    Read the table statistics file
+
+    CSV format:
+    icdsTableName,rowCount,avgRowWidthBytes,dailyDeltaRows
+    T001W,2500,310,0
+    MSEG,2100000000,420,6500000
+
+    Args:
+        path: Path to the CSV file
+
+    Returns:
+        dict: {icdsTableName: {'rowCount': int, 'avgRowWidthBytes': float, 'dailyDeltaRows': int}}
+
+    Raises:
+        ValueError: If a column is missing or a value is not a non-negative number
+    """
+    columns, records = read_csv_records(path)
+    missing = [col for col in TABLE_STATS_COLUMNS if col not in columns]
+    if missing:
+        raise ValueError(f"Table statistics file {path} is missing column(s): {missing}")
+
+    stats = {}
+    for row, record in enumerate(records, 1):
+        name = record['icdsTableName']
+        if not name:
+            raise ValueError(f"{path} row {row}: icdsTableName is empty")
+        try:
+            values = {
+                'rowCount': int(record['rowCount'] or 0),
+                'avgRowWidthBytes': float(record['avgRowWidthBytes'] or 0),
+                'dailyDeltaRows': int(record['dailyDeltaRows'] or 0),
+            }
+        except ValueError as e:
+            raise ValueError(f"{path} row {row} ({name}): {e}") from None
+        if min(values.values()) < 0:
+            raise ValueError(f"{path} row {row} ({name}): statistics must not be negative")
+        stats[name.strip()] = values
+    return stats
+
+
+def job_volumes(stats, load_type):
+    """Return (ingest bytes, upsert bytes) of one table run, see the sizing model"""
+    table_bytes = stats['rowCount'] * stats['avgRowWidthBytes']
+    if str(load_type).upper() == 'FULL':
+        return table_bytes, table_bytes
+    ingest_bytes = stats['dailyDeltaRows'] * stats['avgRowWidthBytes']
+    return ingest_bytes, ingest_bytes + UPSERT_REWRITE_FRACTION * table_bytes
+
+
+def size_job(volume_bytes):
+    """
+    Size one Spark job for volume_bytes of data
+
+    Returns:
+        dict: driver_cores, driver_memory_gb, executors, exec_cores, exec_memory_gb, memory_overhead
+    """
+    cores = max(1, math.ceil(volume_bytes / BYTES_PER_CORE))
+    exec_cores = 2 if cores <= SMALL_JOB_CORES else 4
+    executors = math.ceil(cores / exec_cores)
+    large = volume_bytes > LARGE_JOB_BYTES
+
+    if executors == 1:
+        driver_cores, driver_memory_gb = 1, 2
+    elif executors <= 8:
+        driver_cores, driver_memory_gb = 2, 3
+    else:
+        driver_cores, driver_memory_gb = 4, 8
+
+    return {
+        'driver_cores': driver_cores,
+        'driver_memory_gb': driver_memory_gb,
+        'executors': executors,
+        'exec_cores': exec_cores,
+        'exec_memory_gb': exec_cores * (LARGE_MEMORY_PER_CORE_GB if large else MEMORY_PER_CORE_GB),
+        'memory_overhead': 0.2 if large else 0.1,
+    }
+
+
+def _fits(job, machine, concurrent_jobs):
+    """True if concurrent_jobs copies of job's executors fit on the workers of machine"""
+    _, vcpus, memory_gb = machine
+    yarn_memory_gb = memory_gb * YARN_MEMORY_FRACTION
+    exec_memory_gb = job['exec_memory_gb'] * (1 + job['memory_overhead'])
+    if job['exec_cores'] > vcpus or exec_memory_gb > yarn_memory_gb:
+        return False
+    # Executors do not span workers
+    per_worker = min(vcpus // job['exec_cores'], int(yarn_memory_gb // exec_memory_gb))
+    return job['executors'] * concurrent_jobs <= per_worker * CLUSTER_WORKERS
+
+
+def pick_machine(jobs, concurrent_jobs=1):
+    """
+    Pick the cheapest machine type that fits every job, capping executors on the largest one
+
+    Args:
+        jobs: size_job() results (changed in place when capped)
+        concurrent_jobs: Copies of a job running on the cluster at the same time
+
+    Returns:
+        str: Machine type
+    """
+    for machine in MACHINE_TYPES:
+        if all(_fits(job, machine, concurrent_jobs) for job in jobs):
+            return machine[0]
+
+    machine = MACHINE_TYPES[-1]
+    for job in jobs:
+        while job['executors'] > 1 and not _fits(job, machine, concurrent_jobs):
+            job['executors'] -= 1
+    return machine[0]
+
+
+def _params(prefix, job):
+    return {
+        f"{prefix}DriverCores": str(job['driver_cores']),
+        f"{prefix}DriverMemory": f"{job['driver_memory_gb']}g",
+        f"{prefix}ExecInstances": str(job['executors']),
+        f"{prefix}ExecCores": str(job['exec_cores']),
+        f"{prefix}ExecMemory": f"{job['exec_memory_gb']}g",
+        f"{prefix}MemoryOverhead": str(job['memory_overhead']),
+    }
+
+
+def size_tables(tables, concurrent_jobs=1):
+    """
+    Compute dag_params defaults for a DAG from the statistics of its table(s)
+
+    A DAG running several tables (a batch or shared-cluster DAG) is sized
+    for its biggest table, with concurrent_jobs of them sharing the cluster.
+
+    Args:
+        tables: (statistics dict, tableLoadType) pairs, at least one
+        concurrent_jobs: Spark jobs the DAG runs on its cluster at the same time
+
+    Returns:
+        dict: machineType and the ing*/ups* dag_params defaults, as strings
+    """
+    ingest_bytes, upsert_bytes = max(
+        (job_volumes(stats, load_type) for stats, load_type in tables),
+        key=lambda volumes: volumes[1],
+    )
+    ingest, upsert = size_job(ingest_bytes), size_job(upsert_bytes)
+    machine_type = pick_machine([ingest, upsert], concurrent_jobs)
+
+    params = {"machineType": machine_type}
+    params.update(_params("ing", ingest))
+    params.update(_params("ups", upsert))
+    return params
@@ -0,0 +1,118 @@
+import json
+import copy
+
+# Cluster type and machine type that sample_dag.py's read_cluster_config() applies
+CLUSTER_TYPE = 'custom'
+MACHINE_TYPE = "{{ params.machineType }}"
+
+# Airflow Variables the sample DAG reads with Variable.get at module level
+REQUIRED_VARIABLES = ['ARTIFACTORY_URL', 'CCM_URL', 'ENV', 'GCS_CODE_BUCKET']
+REQUIRED_GLOBAL_PROPS = ['team_space', 'dpaas_env', 'region', 'project_id', 'email', 'init_actions']
+
+
+def load_static_config(path):
+    """
+    Load the values a parse-cheap DAG needs baked in at generation time
+
+    The file is JSON with three sections, exported once per environment:
+
+        {
+          "variables": {...},          # `airflow variables export` output
+          "global_props": {            # configs/global/<sensitivity>_bucket_dpaas.properties
+            "se": {"region": "...", "project_id": "...", "service_account_se": "...", ...}
+          },
+          "cluster_config": {...}      # configs/cluster_config/dpaas_cluster_create.json
+        }
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        dict: The parsed config
+
+    Raises:
+        ValueError: If a section or a required variable is missing
+    """
+    with open(path, 'r') as f:
+        config = json.load(f)
+
+    missing = [key for key in ('variables', 'global_props', 'cluster_config') if key not in config]
+    if missing:
+        raise ValueError(f"Static DAG config {path} is missing section(s): {missing}")
+
+    missing = [name for name in REQUIRED_VARIABLES if name not in config['variables']]
+    if missing:
+        raise ValueError(f"Static DAG config {path} is missing variable(s): {missing}")
+
+    if CLUSTER_TYPE not in config['cluster_config']:
+        raise ValueError(f"Static DAG config {path} has no '{CLUSTER_TYPE}' cluster config")
+
+    return config
+
+
+def _variable(variables, name):
+    """Variable lookup that also matches the upper-cased sensitivity keys (CONN_ID_SE_DPAAS)"""
+    if name in variables:
+        return variables[name]
+    upper = {key.upper(): value for key, value in variables.items()}
+    try:
+        return upper[name.upper()]
+    except KeyError:
+        raise ValueError(f"Airflow Variable '{name}' not found in static DAG config") from None
+
+
+def resolve_dag_values(config, sensitivity):
+    """
+    Resolve what sample_dag.py computes at parse time, for one sensitivity
+
+    Mirrors the module-level Variable.get calls, read_properties() and
+    read_cluster_config() of the sample DAG, so the generated DAG only holds
+    literals.
+
+    Args:
+        config: Output of load_static_config
+        sensitivity: Data sensitivity of the table (se, ns, hs)
+
+    Returns:
+        dict: Values for the STATIC_CONFIG slot of sample_dag_static.py
+
+    Raises:
+        ValueError: If a variable or global property for the sensitivity is missing
+    """
+    variables = config['variables']
+    sensitivity = str(sensitivity)
+
+    props = config['global_props'].get(sensitivity.lower())
+    if props is None:
+        raise ValueError(f"No global properties for sensitivity '{sensitivity}' in static DAG config")
+    props = {key.lower(): value for key, value in props.items()}
+    service_account_key = f"service_account_{sensitivity.lower()}"
+    missing = [key for key in REQUIRED_GLOBAL_PROPS + [service_account_key] if key not in props]
+    if missing:
+        raise ValueError(f"Global properties for sensitivity '{sensitivity}' are missing: {missing}")
+
+    gcs_code_bucket = variables['GCS_CODE_BUCKET']
+
+    cluster_config = copy.deepcopy(config['cluster_config'][CLUSTER_TYPE])
+    cluster_config['dpaas_env'] = sensitivity.lower()
+    gce_config = cluster_config['cluster_config']['gce_cluster_config']
+    gce_config['service_account'] = props[service_account_key]
+    gce_config['metadata']['startup-script-url'] = 'gs://{}/{}'.format(gcs_code_bucket, props['init_actions'])
+    # Dynamic cluster configuration for custom cluster type
+    cluster_config['cluster_config']['master_config']['machine_type_uri'] = MACHINE_TYPE
+    cluster_config['cluster_config']['worker_config']['machine_type_uri'] = MACHINE_TYPE
+    cluster_config['cluster_config']['secondary_worker_config']['machine_type_uri'] = MACHINE_TYPE
+    cluster_config['cluster_config']['worker_config']['num_instances'] = 2
+    cluster_config['cluster_config']['secondary_worker_config']['num_instances'] = 0
+
+    return {
+        'ARTIFACTORY_URL': variables['ARTIFACTORY_URL'],
+        'CCM_URL': variables['CCM_URL'],
+        'ENV': variables['ENV'],
+        'GCS_CODE_BUCKET': gcs_code_bucket,
+        'CONN_ID_DPAAS': _variable(variables, f"CONN_ID_{sensitivity}_DPAAS"),
+        'SOFTWARE_CONFIGS': _variable(variables, f"SOFTWARE_CONFIG_{sensitivity}"),
+        'global_props': props,
+        'SERVICE_ACCOUNT': props[service_account_key],
+        'CLUSTER_CONFIG': cluster_config,
+    }
@@ -0,0 +1,205 @@
+import os
+import base64
+import shutil
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DAG_FILE_PREFIX = "INTLDLDAT-"
+
+
+def dag_artifacts(manifest):
+    """
+    DAG files recorded in a run's OutputManifest (SQL and other artifacts are not uploaded)
+
+    The .json config bundle of --dag-factory output goes to the DAG bucket
+    next to its factory module, so it counts as a DAG file.
+    """
+    return [
+        path for path in manifest.artifacts()
+        if os.path.basename(path).startswith(DAG_FILE_PREFIX) and path.endswith((".py", ".json"))
+    ]
+
+
+def file_md5(path):
+    """Base64-encoded MD5 of a file, the format GCS reports in blob.md5_hash"""
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return base64.b64encode(digest.digest()).decode()
+
+
+def file_crc32c(path):
+    """Base64-encoded CRC32C of a file (blob.crc32c format), or None if google-crc32c is not installed"""
+    try:
+        import google_crc32c
+    except ImportError:
+        return None
+    checksum = google_crc32c.Checksum()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            checksum.update(block)
+    return base64.b64encode(checksum.digest()).decode()
+
+
+def split_destination(dest):
+    """
+    Split "gs://bucket/some/prefix/" into ("bucket", "some/prefix/")
+
+    Raises:
+        ValueError: If dest is not a gs:// URL
+    """
+    if not dest.startswith("gs://"):
+        raise ValueError(f"Not a GCS destination: {dest}")
+    bucket, _, prefix = dest[len("gs://"):].partition("/")
+    if not bucket:
+        raise ValueError(f"No bucket in GCS destination: {dest}")
+    if prefix and not prefix.endswith("/"):
+        prefix += "/"
+    return bucket, prefix
+
+
+class GcsBackend:
+    """
+    Upload backend for a GCS bucket using one pooled google-cloud-storage client
+
+    The client (and its authenticated HTTP session) is shared by all upload
+    threads, so a run costs one auth handshake instead of one per file.
+    """
+
+    def __init__(self, dest, client=None):
+        self.dest = dest
+        self.bucket_name, self.prefix = split_destination(dest)
+        if client is None:
+            # Imported here so planning-only runs don't need the GCS library
+            from google.cloud import storage
+            client = storage.Client()
+        self.client = client
+        self.bucket = client.bucket(self.bucket_name)
+
+    def object_name(self, path):
+        return self.prefix + os.path.basename(path)
+
+    def list_checksums(self):
+        """
+        Return {object name: (md5, crc32c)} for every object under the prefix
+
+        One paginated listing replaces a metadata request per file.
+        """
+        return {
+            blob.name: (blob.md5_hash, blob.crc32c)
+            for blob in self.client.list_blobs(self.bucket_name, prefix=self.prefix or None)
+        }
+
+    def upload(self, path, name):
+        self.bucket.blob(name).upload_from_filename(path)
+
+    def __str__(self):
+        return self.dest
+
+
+class LocalDirBackend:
+    """
+    Upload backend that copies into a local directory
+
+    Stand-in for a bucket when testing or when the DAG folder is mounted
+    locally; no network or credentials needed.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def object_name(self, path):
+        return os.path.basename(path)
+
+    def list_checksums(self):
+        """Return {file name: (md5, None)} for every file in the directory"""
+        checksums = {}
+        for entry in os.scandir(self.root):
+            if entry.is_file():
+                checksums[entry.name] = (file_md5(entry.path), None)
+        return checksums
+
+    def upload(self, path, name):
+        target = os.path.join(self.root, name)
+        tmp = f"{target}.{threading.get_ident()}.tmp"
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, target)
+
+    def __str__(self):
+        return self.root
+
+
+def get_upload_backend(dest):
+    """
+    Pick the backend for a destination
+
+    Args:
+        dest: gs://bucket/prefix/ for GCS, or a local directory
+            (optionally written as file:///path)
+    """
+    if dest.startswith("gs://"):
+        return GcsBackend(dest)
+    if dest.startswith("file://"):
+        dest = dest[len("file://"):]
+    return LocalDirBackend(dest)
+
+
+class DagUploader:
+    """
+    Upload DAG files concurrently, skipping objects that are already up to date
+
+    Remote checksums are listed once up front; a file is skipped when the
+    remote MD5 matches (or, for objects without an MD5 such as composite
+    uploads, the CRC32C).
+    """
+
+    def __init__(self, backend, workers=8):
+        self.backend = backend
+        self.workers = max(1, workers)
+
+    def _is_current(self, path, remote):
+        if remote is None:
+            return False
+        remote_md5, remote_crc32c = remote
+        if remote_md5:
+            return remote_md5 == file_md5(path)
+        if remote_crc32c:
+            return remote_crc32c == file_crc32c(path)
+        return False
+
+    def _upload_one(self, path, remote):
+        name = self.backend.object_name(path)
+        if self._is_current(path, remote.get(name)):
+            return "skipped"
+        self.backend.upload(path, name)
+        return "uploaded"
+
+    def upload(self, files):
+        """
+        Upload files to the backend
+
+        Args:
+            files: Local DAG file paths (e.g. dag_artifacts(manifest))
+
+        Returns:
+            dict: {"uploaded": [...], "skipped": [...], "failed": [(path, error), ...]}
+        """
+        files = sorted(files)
+        result = {"uploaded": [], "skipped": [], "failed": []}
+        if not files:
+            return result
+
+        remote = self.backend.list_checksums()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(self._upload_one, path, remote) for path in files]
+            for path, future in zip(files, futures):
+                try:
+                    result[future.result()].append(path)
+                except Exception as e:
+                    result["failed"].append((path, e))
+
+        return result
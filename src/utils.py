@@ -1,3 +1,9 @@
+import os
+import csv
+import tempfile
+import contextlib
+
+
 def prepare_cluster_name(dlSchemaName, banner_list, dlTableName):
     cluster_names = []
     for b in banner_list:
@@ -17,4 +23,92 @@ def prepare_table_name(banner_list, dlTableName):
         table = dlTableName.lower()
         table_name = f"{banner}_{table}"
         table_names.append(table_name)
-    return table_names
\ No newline at end of file
+    return table_names
+
+@contextlib.contextmanager
+def atomic_writer(path):
+    """
+    Open a temp file next to path for writing and os.replace it over path on success
+    
+    Readers never see a half-written file, and a failed write leaves the
+    previous file untouched.
+    
+    Usage:
+        with atomic_writer("../buckets/bucket_input.csv") as f:
+            f.write(...)
+    """
+    output_dir = os.path.dirname(os.path.abspath(path))
+    os.makedirs(output_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', newline='') as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_text(path, content):
+    """
+    Write content to path atomically (see atomic_writer)
+    
+    Args:
+        path: Destination file path
+        content: Text to write
+    """
+    with atomic_writer(path) as f:
+        f.write(content)
+
+
+def read_csv_header(path):
+    """
+    Return the column names of a CSV file without reading the rest
+    
+    Raises:
+        ValueError: If the file has no header row
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        header = next(csv.reader(f), None)
+    if not header:
+        raise ValueError(f"No columns to parse from file: {path}")
+    return header
+
+
+def read_csv_records(path):
+    """
+    Read a CSV file into row dicts with the stdlib csv module (no pandas import)
+    
+    Mirrors pd.read_csv(path, dtype=str) for the inputs of this project:
+    every value is a string, empty fields and missing trailing fields are
+    None (pandas: NaN) and blank lines are skipped.
+    
+    Args:
+        path: CSV file with a header row
+        
+    Returns:
+        tuple: (list of column names, list of row dicts)
+        
+    Raises:
+        ValueError: If the file has no header row or a row has more fields than the header
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            raise ValueError(f"No columns to parse from file: {path}")
+        
+        width = len(header)
+        records = []
+        for row in reader:
+            if not row:
+                continue
+            if len(row) > width:
+                raise ValueError(f"Error tokenizing {path}: expected {width} fields in line {reader.line_num}, saw {len(row)}")
+            records.append({
+                column: (row[i] if i < len(row) and row[i] != '' else None)
+                for i, column in enumerate(header)
+            })
+    
+    return header, records
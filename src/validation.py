@@ -0,0 +1,220 @@
+import re
+import sys
+
+from utils import read_csv_records
+
+REQUIRED_COLUMNS = [
+    'icdsTableName', 'BANNER_NAME', 'dataSensitivity',
+    'dlSchemaName', 'dlTableName', 'tableLoadType'
+]
+
+VALID_BANNERS = ['MDD', 'MAK', 'MSB']
+VALID_SENSITIVITY = ['se', 'ns', 'hs']
+VALID_LOAD_TYPES = ['INC', 'FULL']
+
+# Optional Hudi tuning columns of the upsert job
+VALID_HUDI_INDEX_TYPES = ['BLOOM', 'SIMPLE', 'GLOBAL_BLOOM', 'GLOBAL_SIMPLE', 'BUCKET', 'RECORD_INDEX']
+HUDI_COUNT_COLUMNS = ['hudiBucketCount', 'hudiTargetFileSizeMB']
+PARTITION_FIELD_PATTERN = r'^\s*\w+\s*$'
+
+
+def _text(value):
+    """A single value as text, with a missing value rendered as 'nan' like pandas does"""
+    return 'nan' if value is None or value != value else str(value)
+
+
+def _blank(value):
+    return value is None or value != value or _text(value).strip() == ''
+
+
+def _positive_int(value):
+    """True for a whole number above zero ('16', 16 or the 16.0 pandas reads from a column with gaps)"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return False
+    return number.is_integer() and number > 0
+
+
+def _as_text(series):
+    """Column as strings, with missing values rendered the way str() renders them"""
+    return series.astype(object).where(series.notna(), 'nan').astype(str)
+
+
+def _is_blank(series):
+    """Missing, empty or whitespace-only values, without stripping every value"""
+    try:
+        return series.isna() | series.eq('') | series.str.isspace().eq(True)
+    except AttributeError:
+        # Not a text column (e.g. a count column read without dtype=str)
+        return series.map(_blank).astype(bool)
+
+
+def _distinct(series):
+    """
+    Factorize a column into per-row codes and its distinct values (NaN included)
+
+    Ingestion sheets repeat the same banner lists, sensitivities and load
+    types on every row, so checks run over the distinct values and are
+    broadcast back to rows through the codes.
+    """
+    import pandas as pd
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    return codes, pd.Series(uniques, dtype=object)
+
+
+def _row_mask(series, check):
+    """Boolean numpy mask over the rows of series where check(distinct values) is True"""
+    codes, uniques = _distinct(series)
+    return check(uniques).to_numpy()[codes]
+
+
+def find_missing_columns(df):
+    """Return the required columns that are not in df (a DataFrame or a list of column names)"""
+    columns = df.columns if hasattr(df, 'columns') else df
+    return [col for col in REQUIRED_COLUMNS if col not in columns]
+
+
+def find_row_issues(rows):
+    """
+    Validate ingestion rows one at a time, without pandas
+
+    Same checks, order and messages as find_validation_issues; this is the
+    default path for ingestion sheets read with utils.read_csv_records.
+
+    Args:
+        rows: Iterable of (row_number, record dict) pairs
+
+    Returns:
+        list: Human-readable issue strings, empty if every row is valid
+    """
+    issues = []
+    banner_cache = {}
+
+    for row, record in rows:
+        # Check for empty critical fields
+        if _blank(record.get('dlTableName')):
+            issues.append(f"Row {row}: dlTableName is empty")
+        if _blank(record.get('dlSchemaName')):
+            issues.append(f"Row {row}: dlSchemaName is empty")
+
+        banner_value = record.get('BANNER_NAME')
+        if _blank(banner_value):
+            issues.append(f"Row {row}: BANNER_NAME is empty")
+
+        # Validate banner names (the same banner lists repeat on most rows)
+        invalid_banners = banner_cache.get(banner_value)
+        if invalid_banners is None:
+            banners = [b.strip() for b in _text(banner_value).split(',')]
+            invalid_banners = banner_cache[banner_value] = [b for b in banners if b not in VALID_BANNERS]
+        if invalid_banners:
+            issues.append(f"Row {row}: Invalid banner(s): {invalid_banners}")
+
+        # Validate sensitivity
+        sensitivity = _text(record.get('dataSensitivity'))
+        if sensitivity.lower() not in VALID_SENSITIVITY:
+            issues.append(f"Row {row}: Invalid sensitivity '{sensitivity}'. Must be one of: {VALID_SENSITIVITY}")
+
+        # Validate load type
+        load_type = _text(record.get('tableLoadType'))
+        if load_type.upper() not in VALID_LOAD_TYPES:
+            issues.append(f"Row {row}: Invalid tableLoadType '{load_type}'. Must be INC or FULL")
+
+        # Validate the optional Hudi tuning columns
+        index_type = record.get('hudiIndexType')
+        if not _blank(index_type) and _text(index_type).strip().upper() not in VALID_HUDI_INDEX_TYPES:
+            issues.append(f"Row {row}: Invalid hudiIndexType '{index_type}'. Must be one of: {VALID_HUDI_INDEX_TYPES}")
+        for column in HUDI_COUNT_COLUMNS:
+            value = record.get(column)
+            if not _blank(value) and not _positive_int(value):
+                issues.append(f"Row {row}: Invalid {column} '{value}'. Must be a whole number above 0")
+        partition_field = record.get('hudiPartitionField')
+        if not _blank(partition_field) and not re.match(PARTITION_FIELD_PATTERN, _text(partition_field)):
+            issues.append(f"Row {row}: Invalid hudiPartitionField '{partition_field}'. Must be one column name")
+
+    return issues
+
+
+def find_validation_issues(df):
+    """
+    Validate every row of an ingestion frame with column-wise operations
+
+    Row numbers in the messages are index + 1, i.e. the data row number in
+    ingestion.csv (header excluded). Issues are reported in row order, and
+    within a row in the order the checks are listed below.
+
+    Args:
+        df: Ingestion DataFrame with all REQUIRED_COLUMNS
+
+    Returns:
+        list: Human-readable issue strings, empty if the frame is valid
+    """
+    import pandas as pd
+
+    issues = []
+
+    def add(mask, check, message):
+        for idx in df.index[mask]:
+            issues.append((idx, check, message(idx)))
+
+    # Check for empty critical fields (dlTableName is unique per row, so factorizing it saves nothing)
+    add(_is_blank(df['dlTableName']).to_numpy(), 0, lambda idx: f"Row {idx + 1}: dlTableName is empty")
+    add(_row_mask(df['dlSchemaName'], _is_blank), 1, lambda idx: f"Row {idx + 1}: dlSchemaName is empty")
+    codes, uniques = _distinct(df['BANNER_NAME'])
+    add(_is_blank(uniques).to_numpy()[codes], 2, lambda idx: f"Row {idx + 1}: BANNER_NAME is empty")
+
+    # Validate banner names: explode every distinct banner list and check against the allowed set in one step
+    banners = _as_text(uniques).str.split(',').explode().str.strip()
+    invalid_banners = banners[~banners.isin(VALID_BANNERS)].groupby(level=0).agg(list)
+    if not invalid_banners.empty:
+        add(pd.Series(codes).isin(invalid_banners.index).to_numpy(), 3,
+            lambda idx: f"Row {idx + 1}: Invalid banner(s): {invalid_banners[codes[df.index.get_loc(idx)]]}")
+
+    # Validate sensitivity
+    sensitivity = df['dataSensitivity']
+    add(_row_mask(sensitivity, lambda u: ~_as_text(u).str.lower().isin(VALID_SENSITIVITY)), 4,
+        lambda idx: f"Row {idx + 1}: Invalid sensitivity '{sensitivity.at[idx]}'. Must be one of: {VALID_SENSITIVITY}")
+
+    # Validate load type
+    load_type = df['tableLoadType']
+    add(_row_mask(load_type, lambda u: ~_as_text(u).str.upper().isin(VALID_LOAD_TYPES)), 5,
+        lambda idx: f"Row {idx + 1}: Invalid tableLoadType '{load_type.at[idx]}'. Must be INC or FULL")
+
+    # Validate the optional Hudi tuning columns
+    if 'hudiIndexType' in df.columns:
+        index_type = df['hudiIndexType']
+        add(_row_mask(index_type, lambda u: ~_is_blank(u) & ~_as_text(u).str.strip().str.upper().isin(VALID_HUDI_INDEX_TYPES)), 6,
+            lambda idx: f"Row {idx + 1}: Invalid hudiIndexType '{index_type.at[idx]}'. Must be one of: {VALID_HUDI_INDEX_TYPES}")
+    for check, column in enumerate(HUDI_COUNT_COLUMNS, 7):
+        if column in df.columns:
+            values = df[column]
+            add(_row_mask(values, lambda u: ~_is_blank(u) & ~u.map(_positive_int).astype(bool)), check,
+                lambda idx, column=column, values=values: f"Row {idx + 1}: Invalid {column} '{values.at[idx]}'. Must be a whole number above 0")
+    if 'hudiPartitionField' in df.columns:
+        partition_field = df['hudiPartitionField']
+        add(_row_mask(partition_field, lambda u: ~_is_blank(u) & ~_as_text(u).str.match(PARTITION_FIELD_PATTERN)), 9,
+            lambda idx: f"Row {idx + 1}: Invalid hudiPartitionField '{partition_field.at[idx]}'. Must be one column name")
+
+    issues.sort(key=lambda issue: (issue[0], issue[1]))
+    return [message for _, _, message in issues]
+
+
+def main(argv=None):
+    """Validate an ingestion file and exit non-zero on issues (usable as a pre-commit hook)"""
+    paths = (argv if argv is not None else sys.argv[1:]) or ['../ingestion.csv']
+    failed = False
+
+    for path in paths:
+        columns, records = read_csv_records(path)
+        missing_cols = find_missing_columns(columns)
+        issues = [f"Missing required columns: {missing_cols}"] if missing_cols else find_row_issues(enumerate(records, 1))
+        for issue in issues:
+            print(f"{path}: {issue}")
+        failed = failed or bool(issues)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
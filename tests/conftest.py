@@ -0,0 +1,25 @@
+import os
+import sys
+
+# The generator modules import each other flat (python main.py runs from src/)
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+def ingestion_record(**overrides):
+    """One ingestion.csv row as read by utils.read_csv_records, with valid defaults"""
+    record = {
+        'icdsTableName': 'IKPF',
+        'BANNER_NAME': 'MDD,MAK,MSB',
+        'dataSensitivity': 'se',
+        'OP-Company code': 'SA-MDD,SA-MAK,SA-MSB',
+        'dlSchemaName': 'sa_mdse_dl_secure',
+        'dlTableName': 'PHYSL_INVT_DOC',
+        'tableLoadType': 'INC',
+        'keyPreCombine': 'ds_load_ts',
+        'keyPrimaryKey': 'clnt,application',
+        'bucket_id': '123',
+    }
+    record.update(overrides)
+    return record
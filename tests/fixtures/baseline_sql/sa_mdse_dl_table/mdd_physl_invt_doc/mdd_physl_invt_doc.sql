@@ -0,0 +1,30 @@
+CREATE EXTERNAL TABLE `sa_mdse_dl_table.mdd_physl_invt_doc`(
+  -- Hudi Meta Columns
+  `_hoodie_commit_time` string COMMENT 'Hudi Meta Column',
+  `_hoodie_commit_seqno` string COMMENT 'Hudi Meta Column',
+  `_hoodie_record_key` string COMMENT 'Hudi Meta Column',
+  `_hoodie_partition_path` string COMMENT 'Hudi Meta Column',
+  `_hoodie_file_name` string COMMENT 'Hudi Meta Column',
+  
+-- START, from here to end this will be manual work,
+  -- Primary Key Fields, like below
+  -- `clnt` string COMMENT 'MANDT | Client - PRIMARY KEY',
+
+  -- Business Columns, like below
+  --`trans_event_type` string COMMENT 'VGART | Transaction/Event Type',
+--- END ---
+
+  `ds_load_ts` timestamp COMMENT 'DS_LOAD_START_TS | Data Load Timestamp'
+
+)
+ROW FORMAT SERDE
+  'org.apache.hadoop.hive.ql.io.parquet.serde.ParquetHiveSerDe'
+WITH SERDEPROPERTIES (
+   'hoodie.query.as.ro.table'='false',
+   'path'='gs://676e39d3ff0cc7e5790e2d370b147db52079cf1a6dbf57ff0f33d652ae40be/mdd_physl_invt_doc')
+STORED AS INPUTFORMAT
+   'org.apache.hudi.hadoop.HoodieParquetInputFormat'
+OUTPUTFORMAT
+   'org.apache.hadoop.hive.ql.io.parquet.MapredParquetOutputFormat'
+LOCATION
+   'gs://676e39d3ff0cc7e5790e2d370b147db52079cf1a6dbf57ff0f33d652ae40be/mdd_physl_invt_doc'
\ No newline at end of file
@@ -0,0 +1,112 @@
+import csv
+
+import pytest
+
+from bucket import BUCKET_INPUT_COLUMNS, BucketRegistry, BucketRequestWriter, BucketStore, extract_bucket_id, get_bucket_registry
+
+
+def _dag(table_name='mak_physl_invt_doc', banner_name='MAK', sensitivity='se'):
+    return {'table_name': table_name, 'banner_name': banner_name, 'sensitivity': sensitivity, 'tableLoadType': 'INC'}
+
+
+def _rows(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_writer_skips_duplicates_within_a_run(tmp_path):
+    path = str(tmp_path / 'bucket_input.csv')
+
+    with BucketRequestWriter(path, env='dev') as writer:
+        assert writer.add(_dag(), 'sa_mdse_dl_secure')
+        assert not writer.add(_dag(), 'sa_mdse_dl_secure')
+        assert writer.add(_dag(table_name='mdd_physl_invt_doc', banner_name='MDD'), 'sa_mdse_dl_secure')
+
+    rows = _rows(path)
+    assert [(row['tableName'], row['opCmpnyCd']) for row in rows] == [('mak_physl_invt_doc', 'SA-MAK'), ('mdd_physl_invt_doc', 'SA-MDD')]
+    assert list(rows[0]) == BUCKET_INPUT_COLUMNS
+
+
+def test_writer_skips_rows_already_in_the_file(tmp_path):
+    path = str(tmp_path / 'bucket_input.csv')
+    with BucketRequestWriter(path, env='dev') as writer:
+        writer.add(_dag(), 'sa_mdse_dl_secure')
+
+    with BucketRequestWriter(path, env='dev') as writer:
+        assert not writer.add(_dag(), 'sa_mdse_dl_secure')
+        assert writer.flush() == 0
+
+    assert len(_rows(path)) == 1
+
+
+def test_writer_keeps_a_request_per_env(tmp_path):
+    path = str(tmp_path / 'bucket_input.csv')
+    for env in ('prod', 'dev', 'prod'):
+        with BucketRequestWriter(path, env=env) as writer:
+            writer.add(_dag(), 'sa_mdse_dl_secure')
+
+    assert [row['wmt.storage_uploader'].rsplit('-', 1)[1] for row in _rows(path)] == ['prod.iam.gserviceaccount.com', 'dev.iam.gserviceaccount.com']
+
+
+def test_writer_appends_after_a_file_without_trailing_newline(tmp_path):
+    path = tmp_path / 'bucket_input.csv'
+    path.write_text(','.join(BUCKET_INPUT_COLUMNS) + '\nhash,s,t,SA-MDD,incremental load,u,v,FALSE,DCA Logic,')
+
+    with BucketRequestWriter(str(path), env='dev') as writer:
+        writer.add(_dag(), 'sa_mdse_dl_secure')
+
+    assert [row['tableName'] for row in _rows(str(path))] == ['t', 'mak_physl_invt_doc']
+
+
+def test_registry_looks_up_many_tables_at_once(tmp_path):
+    csv_file = tmp_path / 'bucket_id.csv'
+    csv_file.write_text('dlTableName,bucket_id\nmak_t,abc\nmdd_t,def\nmak_t,other\n')
+    registry = BucketRegistry(str(csv_file))
+
+    assert registry.get_many(['mak_t', 'mdd_t', 'nope']) == {'mak_t': 'abc', 'mdd_t': 'def'}
+    assert registry.missing(['mak_t', 'nope']) == {'nope'}
+    with pytest.raises(ValueError, match="Table 'nope' not found"):
+        registry.get('nope')
+
+
+def test_registry_reloads_an_edited_file(tmp_path):
+    csv_file = tmp_path / 'bucket_id.csv'
+    csv_file.write_text('dlTableName,bucket_id\nmak_t,abc\n')
+    registry = BucketRegistry(str(csv_file))
+    assert registry.get('mak_t') == 'abc'
+
+    csv_file.write_text('dlTableName,bucket_id\nmak_t,abc\nmdd_t,def\n')
+
+    assert registry.get('mdd_t') == 'def'
+
+
+def test_extraction_is_skipped_while_the_export_is_unchanged(tmp_path, capsys):
+    final_bucket_info = tmp_path / 'FinalBucketInfo.csv'
+    final_bucket_info.write_text('tableName,bucket_name\nmak_t,abc\n')
+    csv_file = str(tmp_path / 'bucket_id.csv')
+    extract_bucket_id(str(final_bucket_info), csv_file)
+    capsys.readouterr()
+
+    extract_bucket_id(str(final_bucket_info), csv_file)
+    assert 'skipping extraction' in capsys.readouterr().out
+
+    registry = get_bucket_registry(csv_file)
+    assert isinstance(registry, BucketStore)
+    assert registry.get('mak_t') == 'abc'
+
+
+def test_blank_bucket_id_is_not_found_in_registry_and_store(tmp_path):
+    final_bucket_info = tmp_path / 'FinalBucketInfo.csv'
+    final_bucket_info.write_text('tableName,bucket_name\nMAK_T,abc\nmdd_t,\nmsb_t,  \nmak_t,other\n')
+    csv_file = extract_bucket_id(str(final_bucket_info), str(tmp_path / 'bucket_id.csv'))
+
+    registry = BucketRegistry(csv_file)
+    store = BucketStore(str(tmp_path / 'bucket_id.sqlite'), csv_file)
+    try:
+        for lookup in (registry, store):
+            assert lookup.get_many(['mak_t', 'mdd_t', 'msb_t', 'nope']) == {'mak_t': 'abc'}
+            assert lookup.missing(['mak_t', 'mdd_t', 'nope']) == {'mdd_t', 'nope'}
+            with pytest.raises(ValueError, match="Table 'mdd_t' not found"):
+                lookup.get('mdd_t')
+    finally:
+        store.close()
@@ -0,0 +1,110 @@
+import ast
+import os
+
+import pytest
+
+from conftest import SRC_DIR, ingestion_record
+from dag_creation import DagTemplate, compose_dag_template, parse_template_sections, render_dag_content
+from plan import TableSpec
+
+SAMPLE_DAG = os.path.join(os.path.dirname(SRC_DIR), 'sample_dag.py')
+
+BASE = (
+    "import os\n"
+    "#@section header\n"
+    "SENSITIVITY=\"se\"\n"
+    "#@end\n"
+    "#@section body\n"
+    "def run():\n"
+    "    return 1\n"
+    "#@end\n"
+    "#@section tail\n"
+    "run()"
+)
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_plain_template_drops_marker_lines(tmp_path):
+    text, paths = compose_dag_template(_write(tmp_path, 'sample_dag.py', BASE))
+
+    assert text == 'import os\nSENSITIVITY="se"\ndef run():\n    return 1\nrun()'
+    assert paths == [str(tmp_path / 'sample_dag.py')]
+
+
+def test_extends_replaces_named_sections_and_keeps_base_end_of_file(tmp_path):
+    base = _write(tmp_path, 'sample_dag.py', BASE)
+    mode = _write(tmp_path, 'sample_dag_mode.py',
+                  "#@extends sample_dag.py\n# mode notes\n\n#@section body\n#@include header\nX = 2\n#@end\n")
+
+    text, paths = compose_dag_template(mode)
+
+    assert text == 'import os\nSENSITIVITY="se"\nSENSITIVITY="se"\nX = 2\nrun()'
+    assert paths == [mode, base]
+
+
+def test_base_includes_are_indented_like_the_include_line(tmp_path):
+    _write(tmp_path, 'sample_dag.py', BASE)
+    factory = _write(tmp_path, 'sample_dag_factory.py', "#@base sample_dag.py\nclass Dag:\n    #@include body\n")
+
+    text, _ = compose_dag_template(factory)
+
+    assert text == 'class Dag:\n    def run():\n        return 1\n'
+
+
+@pytest.mark.parametrize('template, message', [
+    ("#@extends sample_dag.py\n#@section nope\n#@end\n", "has no section 'nope'"),
+    ("#@extends sample_dag.py\nX = 1\n", "code outside a section"),
+    ("#@base sample_dag.py\n#@include nope\n", "no section 'nope' to include"),
+])
+def test_unknown_sections_and_stray_code_are_rejected(tmp_path, template, message):
+    _write(tmp_path, 'sample_dag.py', BASE)
+
+    with pytest.raises(ValueError, match=message):
+        compose_dag_template(_write(tmp_path, 'sample_dag_mode.py', template))
+
+
+def test_nested_duplicate_and_stray_markers_are_rejected():
+    for text in ("#@section a\n#@section b\n", "#@section a\n#@end\n#@section a\n", "#@end\n"):
+        with pytest.raises(ValueError):
+            parse_template_sections(text)
+
+
+def test_compile_requires_every_slot():
+    with pytest.raises(ValueError, match='missing slot'):
+        DagTemplate.compile('SENSITIVITY="se"\n', source='sample_dag.py')
+
+
+def _upsert_args(content):
+    """UPSERT_TARGET_CMD_LINE_ARGS of a rendered DAG (BQ_SYNC, read from an Airflow Variable, standing for itself)"""
+    namespace = {'BQ_SYNC': 'BQ_SYNC'}
+    names = ('BANNER_NAME', 'TABLE_NAME', 'HUDI_OPTIONS', 'UPSERT_TARGET_CMD_LINE_ARGS')
+    for node in ast.parse(content).body:
+        if isinstance(node, ast.FunctionDef) and node.name == 'hudi_conf_args' or \
+                isinstance(node, ast.Assign) and ast.unparse(node.targets[0]) in names:
+            exec(ast.unparse(node), namespace)
+    return namespace['UPSERT_TARGET_CMD_LINE_ARGS']
+
+
+def test_upsert_args_without_hudi_key_conf_are_the_baseline():
+    dag = TableSpec(1, ingestion_record(hudiIndexType='BUCKET', hudiBucketCount='16')).dags[0]
+
+    assert _upsert_args(render_dag_content(SAMPLE_DAG, dag)) == [
+        '--banner', 'MDD', '--sapTableName', 'mdd_physl_invt_doc', '--bqSync', 'BQ_SYNC'
+    ]
+
+
+def test_upsert_args_with_hudi_key_conf_add_every_hudi_config():
+    dag = TableSpec(1, ingestion_record(hudiIndexType='BUCKET', hudiBucketCount='16')).dags[0]
+    dag_config = dict(dag.to_dict(), hudi_options=dag.upsert_hudi_options)
+
+    assert _upsert_args(render_dag_content(SAMPLE_DAG, dag_config))[6:] == [
+        '--hoodieConf', 'hoodie.datasource.write.recordkey.field=clnt,application',
+        '--hoodieConf', 'hoodie.datasource.write.precombine.field=ds_load_ts',
+        '--hoodieConf', 'hoodie.index.type=BUCKET',
+        '--hoodieConf', 'hoodie.bucket.index.num.buckets=16',
+    ]
@@ -0,0 +1,86 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from dag_creation import _ALL_DAG_TEMPLATE_SLOTS, compose_dag_template
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# SQL files of the default run before the backlog changes (DAGs have gained slots since)
+BASELINE_SQL_DIR = os.path.join(REPO_DIR, 'tests', 'fixtures', 'baseline_sql')
+
+
+def _files(root, extension):
+    return sorted(os.path.relpath(os.path.join(dirpath, name), root)
+                  for dirpath, _, names in os.walk(root) for name in names if name.endswith(extension))
+
+
+def _read(path):
+    with open(path, 'r') as file:
+        return file.read()
+
+
+def _run_main(tmp_dir, *args, returncode=0):
+    """Run python main.py on a copy of the repo in tmp_dir, return the output directory"""
+    work_dir = tmp_dir / 'package'
+    shutil.copytree(REPO_DIR, work_dir, ignore=shutil.ignore_patterns(
+        '.git', 'tests', 'output', '__pycache__', '*.log', '*.sqlite'))
+    result = subprocess.run([sys.executable, 'main.py', *args], cwd=work_dir / 'src', capture_output=True, text=True)
+    assert result.returncode == returncode, result.stdout + result.stderr
+    return str(work_dir / 'output')
+
+
+@pytest.fixture(scope='module')
+def output_dir(tmp_path_factory):
+    """Output directory of a run without arguments"""
+    return _run_main(tmp_path_factory.mktemp('run'))
+
+
+def test_default_sql_matches_baseline(output_dir):
+    assert _files(output_dir, '.sql') == _files(BASELINE_SQL_DIR, '.sql')
+    for name in _files(BASELINE_SQL_DIR, '.sql'):
+        assert _read(os.path.join(output_dir, name)) == _read(os.path.join(BASELINE_SQL_DIR, name)), name
+
+
+def test_default_dags_are_the_template_with_slots_filled(output_dir):
+    template = compose_dag_template(os.path.join(REPO_DIR, 'sample_dag.py'))[0].splitlines()
+    slot_prefixes = tuple(prefix for prefix, _ in _ALL_DAG_TEMPLATE_SLOTS.values())
+    dag_files = _files(output_dir, '.py')
+
+    assert len(dag_files) == 6
+    for name in dag_files:
+        rendered = _read(os.path.join(output_dir, name)).splitlines()
+        assert len(rendered) == len(template), name
+        for expected, line in zip(template, rendered):
+            if not expected.strip().startswith(slot_prefixes):
+                assert line == expected, name
+
+
+def test_stream_run_writes_the_same_files(output_dir, tmp_path):
+    stream_dir = _run_main(tmp_path, '--stream', '--chunk-size', '2')
+
+    assert _files(stream_dir, '') == _files(output_dir, '')
+    for name in _files(output_dir, '.py') + _files(output_dir, '.sql'):
+        assert _read(os.path.join(stream_dir, name)) == _read(os.path.join(output_dir, name)), name
+
+
+def test_dry_run_writes_nothing(tmp_path):
+    output_dir = _run_main(tmp_path, '--dry-run')
+    package = os.path.dirname(output_dir)
+
+    assert not os.path.exists(output_dir)
+    assert not [name for name in os.listdir(os.path.join(package, 'src')) if name.endswith('.log')]
+    assert _read(os.path.join(package, 'buckets', 'bucket_input.csv')) == _read(os.path.join(REPO_DIR, 'buckets', 'bucket_input.csv'))
+
+
+def test_dags_past_the_schedule_window_fail_the_run(tmp_path):
+    args = ['--schedule-window', '22:00-23:00', '--max-concurrent-dags', '1']
+
+    assert not os.path.exists(_run_main(tmp_path / 'strict', *args, returncode=1))
+
+    output_dir = _run_main(tmp_path / 'allowed', *args, '--allow-overflow')
+    schedules = [line for name in _files(output_dir, '.py')
+                 for line in _read(os.path.join(output_dir, name)).splitlines() if line.startswith('PROD_SCHEDULE')]
+    assert len(set(schedules)) == 6
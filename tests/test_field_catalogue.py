@@ -0,0 +1,58 @@
+import pytest
+
+from conftest import ingestion_record
+from field_catalogue import hive_type, load_field_catalogue, render_columns, render_partitioned_by
+from main import IngestionPipeline, PipelineOptions
+from plan import TableSpec
+
+CATALOGUE_TEXT = (
+    'TABNAME,FIELDNAME,POSITION,KEYFLAG,DATATYPE,LENG,DECIMALS,DDTEXT,dlColumnName\n'
+    'IKPF,GJAHR,3,X,NUMC,4,0,Fiscal Year,fisc_yr\n'
+    'IKPF,MANDT,1,X,CLNT,3,0,Client,\n'
+    'IKPF,.INCLUDE,2,,,0,0,,\n'
+    'IKPF,WRBTR,4,,CURR,13,2,Amount in Document\'s Currency,amt\n'
+)
+
+
+@pytest.mark.parametrize('datatype, length, decimals, expected', [
+    ('CHAR', 10, 0, 'string'),
+    (' dats ', 8, 0, 'string'),
+    ('INT8', 19, 0, 'bigint'),
+    ('QUAN', 13, 3, 'decimal(13,3)'),
+])
+def test_hive_type(datatype, length, decimals, expected):
+    assert hive_type(datatype, length, decimals) == expected
+
+
+def test_hive_type_rejects_unknown_types_and_unsized_decimals():
+    with pytest.raises(ValueError, match="unknown data type 'XYZ'"):
+        hive_type('XYZ')
+    with pytest.raises(ValueError, match='between 1 and 38'):
+        hive_type('DEC', 0)
+
+
+def test_partition_column_leaves_the_column_list_for_partitioned_by(tmp_path):
+    path = tmp_path / 'catalogue.csv'
+    path.write_text(CATALOGUE_TEXT)
+    columns = load_field_catalogue(str(path))['IKPF']
+
+    assert [column['name'] for column in columns] == ['mandt', 'fisc_yr', 'amt']
+    assert render_columns(columns, 'fisc_yr') == (
+        "  -- Primary Key Fields\n"
+        "  `mandt` string COMMENT 'MANDT | Client - PRIMARY KEY',\n"
+        "\n"
+        "  -- Business Columns\n"
+        "  `amt` decimal(13,2) COMMENT 'WRBTR | Amount in Document\\'s Currency',\n"
+    )
+    assert render_partitioned_by('fisc_yr', columns) == (
+        "PARTITIONED BY (`fisc_yr` string COMMENT 'Hudi partition path: fisc_yr=<value>')\n"
+    )
+    assert render_partitioned_by(None, columns) == ''
+
+
+def test_ddl_is_partitioned_only_when_the_upsert_job_gets_the_partition_path():
+    table = TableSpec(1, ingestion_record(hudiPartitionField=' Fisc_Yr '))
+    options = PipelineOptions(hudi_key_conf=True)
+
+    assert IngestionPipeline('ingestion.csv', dry_run=True)._partition_column(table) is None
+    assert IngestionPipeline('ingestion.csv', dry_run=True, options=options)._partition_column(table) == 'fisc_yr'
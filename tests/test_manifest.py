@@ -0,0 +1,90 @@
+import json
+import os
+
+from manifest import MANIFEST_FILE, OutputManifest, digest_inputs
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+    return path
+
+
+def _run(output_root, artifacts):
+    """One generation run: render the stale artifacts, record all of them, prune and save"""
+    manifest = OutputManifest(output_root)
+    rendered = []
+    for path, (content, inputs) in artifacts.items():
+        if not manifest.is_fresh(path, inputs):
+            _write(path, content)
+            rendered.append(path)
+        manifest.record(path, inputs)
+    removed = manifest.prune()
+    manifest.save()
+    return rendered, removed
+
+
+def test_digest_inputs_is_stable_across_key_order():
+    assert digest_inputs({'a': 1, 'b': None}, 'x') == digest_inputs({'b': None, 'a': 1}, 'x')
+    assert digest_inputs({'a': 1}) != digest_inputs({'a': 2})
+
+
+def test_second_run_with_the_same_inputs_renders_nothing(tmp_path):
+    root = str(tmp_path / 'output')
+    path = os.path.join(root, 'schema', 'table', 'table.sql')
+
+    assert _run(root, {path: ('v1', 'inputs-1')}) == ([path], [])
+    mtime = os.path.getmtime(os.path.join(root, MANIFEST_FILE))
+
+    assert _run(root, {path: ('v1', 'inputs-1')}) == ([], [])
+    assert os.path.getmtime(os.path.join(root, MANIFEST_FILE)) == mtime
+
+
+def test_changed_inputs_or_edited_file_is_rendered_again(tmp_path):
+    root = str(tmp_path / 'output')
+    path = os.path.join(root, 'schema', 'table', 'table.sql')
+    _run(root, {path: ('v1', 'inputs-1')})
+
+    assert _run(root, {path: ('v2', 'inputs-2')}) == ([path], [])
+
+    _write(path, 'edited by hand')
+    assert _run(root, {path: ('v2', 'inputs-2')}) == ([path], [])
+
+    os.remove(path)
+    assert _run(root, {path: ('v2', 'inputs-2')}) == ([path], [])
+
+
+def test_artifacts_no_longer_produced_are_pruned_with_their_empty_dirs(tmp_path):
+    root = str(tmp_path / 'output')
+    kept = os.path.join(root, 's', 'kept', 'kept.sql')
+    dropped = os.path.join(root, 's', 'dropped', 'dropped.sql')
+    _run(root, {kept: ('k', '1'), dropped: ('d', '2')})
+
+    assert _run(root, {kept: ('k', '1')}) == ([], [dropped])
+    assert not os.path.exists(os.path.dirname(dropped))
+    assert os.path.exists(kept)
+
+
+def test_manifest_keys_are_relative_to_the_output_root(tmp_path):
+    root = str(tmp_path / 'output')
+    path = os.path.join(root, 'schema', 'table', 'table.sql')
+    _run(root, {path: ('v1', 'inputs-1')})
+
+    with open(os.path.join(root, MANIFEST_FILE)) as f:
+        artifacts = json.load(f)['artifacts']
+    assert artifacts == {'schema/table/table.sql': {'inputs': 'inputs-1', 'size': 2}}
+
+    manifest = OutputManifest(root)
+    assert manifest.contains(path)
+    assert manifest.contains(os.path.join(root, 'other', '..', 'schema', 'table', 'table.sql'))
+    assert not manifest.contains(os.path.join(root, 'schema', 'table', 'other.sql'))
+
+
+def test_corrupt_manifest_means_a_full_rebuild(tmp_path):
+    root = str(tmp_path / 'output')
+    path = os.path.join(root, 'schema', 'table', 'table.sql')
+    _run(root, {path: ('v1', 'inputs-1')})
+    _write(os.path.join(root, MANIFEST_FILE), '{not json')
+
+    assert _run(root, {path: ('v1', 'inputs-1')}) == ([path], [])
@@ -0,0 +1,70 @@
+import ast
+import os
+
+import pytest
+
+from dag_creation import DAG_FACTORY_MODULE, compose_dag_template, get_dag_template, render_dag_factory
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Calls that make Airflow parsing hit Variables, the metadata DB or GCS
+PARSE_TIME_LOOKUPS = {'Variable.get', 'GoogleCloudStorageHook', 'gcs_hook.download', 'read_properties', 'read_cluster_config'}
+MODE_TEMPLATES = ['sample_dag_static.py', 'sample_dag_shared.py', 'sample_dag_batch.py', 'sample_dag_factory.py']
+
+
+def _composed(name):
+    return compose_dag_template(os.path.join(REPO_DIR, name))[0]
+
+
+def _calls(source):
+    """Source of the called function of every call in source, e.g. ['Variable.get', 'models.DAG', ...]"""
+    return [ast.unparse(node.func) for node in ast.walk(ast.parse(source)) if isinstance(node, ast.Call)]
+
+
+@pytest.mark.parametrize('name', MODE_TEMPLATES)
+def test_mode_template_composes_into_python_without_markers(name):
+    text, paths = compose_dag_template(os.path.join(REPO_DIR, name))
+
+    assert '#@' not in text
+    assert paths[-1] == os.path.join(REPO_DIR, 'sample_dag.py')
+    ast.parse(text)
+
+
+def test_static_dags_make_no_parse_time_lookups():
+    assert get_dag_template(os.path.join(REPO_DIR, 'sample_dag_static.py')).has_slot('STATIC_CONFIG')
+    assert PARSE_TIME_LOOKUPS <= set(_calls(_composed('sample_dag.py')))
+    assert not PARSE_TIME_LOOKUPS & set(_calls(_composed('sample_dag_static.py')))
+
+
+def test_shared_cluster_dag_runs_every_banner_on_one_cluster():
+    calls = _calls(_composed('sample_dag_shared.py'))
+
+    assert get_dag_template(os.path.join(REPO_DIR, 'sample_dag_shared.py')).has_slot('BANNER_TABLES')
+    assert calls.count('BFDMSDataprocCreateClusterOperator') == 1
+    assert calls.count('DataprocSubmitJobOperator') == 2
+    assert 'TaskGroup' in calls
+
+
+def test_batch_dag_bounds_the_task_pairs_running_on_its_cluster():
+    template = get_dag_template(os.path.join(REPO_DIR, 'sample_dag_batch.py'))
+    dag_open = [node for node in ast.walk(ast.parse(_composed('sample_dag_batch.py')))
+                if isinstance(node, ast.Call) and ast.unparse(node.func) == 'models.DAG']
+
+    assert template.has_slot('BATCH_TASKS') and template.has_slot('MAX_ACTIVE_TASKS')
+    assert [ast.unparse(k.value) for node in dag_open for k in node.keywords if k.arg == 'max_active_tasks'] == ['MAX_ACTIVE_TASKS']
+
+
+def test_dag_factory_module_builds_every_dag_in_create_dag(tmp_path):
+    (path, module), _ = render_dag_factory(os.path.join(REPO_DIR, 'sample_dag_factory.py'), [], str(tmp_path))
+    functions = {node.name: node for node in ast.parse(module).body if isinstance(node, ast.FunctionDef)}
+
+    assert os.path.basename(path) == DAG_FACTORY_MODULE
+    assert '#@' not in module
+    assert {'models.DAG', 'BFDMSDataprocCreateClusterOperator', 'DataprocSubmitJobOperator'} <= set(_calls(ast.unparse(functions['create_dag'])))
+
+
+@pytest.mark.parametrize('name', ['sample_dag.py'] + MODE_TEMPLATES)
+def test_deferrable_args_reach_the_job_and_delete_tasks_but_not_cluster_creation(name):
+    deferred = {ast.unparse(node.func) for node in ast.walk(ast.parse(_composed(name))) if isinstance(node, ast.Call)
+                and any(k.arg is None and ast.unparse(k.value) == 'DEFER_ARGS' for k in node.keywords)}
+
+    assert deferred == {'DataprocSubmitJobOperator', 'DataprocDeleteClusterOperator'}
@@ -0,0 +1,111 @@
+from conftest import ingestion_record
+from plan import (
+    HUDI_BUCKET_COUNT, HUDI_HIVE_STYLE_PARTITIONING, HUDI_INDEX_TYPE, HUDI_MAX_FILE_SIZE, HUDI_PARTITION_PATH_FIELD,
+    HUDI_PRECOMBINE_FIELD, HUDI_RECORD_KEY_FIELD, TableSpec, build_plan, hudi_write_options, plan_batches,
+)
+
+
+def _tables(*specs):
+    """TableSpecs from (dlSchemaName, dlTableName, banners[, sensitivity]) tuples"""
+    rows = []
+    for row_number, (schema, table, banners, *sensitivity) in enumerate(specs, 1):
+        record = ingestion_record(dlSchemaName=schema, dlTableName=table, BANNER_NAME=banners,
+                                  dataSensitivity=sensitivity[0] if sensitivity else 'se')
+        rows.append((row_number, record))
+    tables, errors = build_plan(rows)
+    assert errors == []
+    return tables
+
+
+def test_build_plan_one_dag_per_banner():
+    tables = _tables(('sa_mdse_dl_secure', 'PHYSL_INVT_DOC', 'MDD,MAK,MSB'))
+
+    assert [dag.table_name for dag in tables[0].dags] == ['mdd_physl_invt_doc', 'mak_physl_invt_doc', 'msb_physl_invt_doc']
+    assert tables[0].dags[1].dag_name == 'INTLDLDAT-SAMAK-INC-SA_MDSE_DL_SECURE-MAK_PHYSL_INVT_DOC'
+
+
+def test_build_plan_reports_bad_rows_instead_of_raising():
+    tables, errors = build_plan([(1, ingestion_record()), (2, ingestion_record(dlSchemaName=None))])
+
+    assert len(tables) == 1
+    assert [(row, name) for row, name, _ in errors] == [(2, 'PHYSL_INVT_DOC')]
+
+
+def test_plan_batches_packs_per_schema_and_sensitivity_without_splitting_tables():
+    tables = _tables(
+        ('schema_a', 'T1', 'MDD,MAK'),
+        ('schema_a', 'T2', 'MDD,MAK'),
+        ('schema_b', 'T3', 'MDD'),
+        ('schema_a', 'T4', 'MDD'),
+        ('schema_a', 'T5', 'MDD,MAK,MSB'),
+        ('schema_a', 'T6', 'MDD', 'hs'),
+    )
+
+    batches = plan_batches(tables, budget=5, max_active_tasks=2)
+
+    assert [(b.dag_name, [t.dlTableName for t in b.tables]) for b in batches] == [
+        ('INTLDLDAT-SA-BATCH-SCHEMA_A-SE_BATCH_001', ['T1', 'T2', 'T4']),
+        ('INTLDLDAT-SA-BATCH-SCHEMA_A-SE_BATCH_002', ['T5']),
+        ('INTLDLDAT-SA-BATCH-SCHEMA_B-SE_BATCH_001', ['T3']),
+        ('INTLDLDAT-SA-BATCH-SCHEMA_A-HS_BATCH_001', ['T6']),
+    ]
+    assert batches[0].batch_tasks == [['MDD', 'mdd_t1'], ['MAK', 'mak_t1'], ['MDD', 'mdd_t2'], ['MAK', 'mak_t2'], ['MDD', 'mdd_t4']]
+    assert all(b.max_active_tasks == 2 for b in batches)
+
+
+def test_plan_batches_gives_an_oversized_table_its_own_batch():
+    tables = _tables(('s', 'SMALL', 'MDD'), ('s', 'WIDE', 'MDD,MAK,MSB'), ('s', 'NEXT', 'MDD'))
+
+    batches = plan_batches(tables, budget=2, max_active_tasks=1)
+
+    assert [[t.dlTableName for t in b.tables] for b in batches] == [['SMALL'], ['WIDE'], ['NEXT']]
+
+
+def test_plan_batches_appending_rows_only_changes_the_last_batch():
+    before = plan_batches(_tables(('s', 'T1', 'MDD'), ('s', 'T2', 'MDD'), ('s', 'T3', 'MDD')), budget=2, max_active_tasks=1)
+    after = plan_batches(_tables(('s', 'T1', 'MDD'), ('s', 'T2', 'MDD'), ('s', 'T3', 'MDD'), ('s', 'T4', 'MDD')), budget=2, max_active_tasks=1)
+
+    assert before[0].digest == after[0].digest
+    assert before[1].digest != after[1].digest
+
+
+def test_hudi_write_options_keys_without_tuning_columns():
+    table = TableSpec(1, ingestion_record(keyPrimaryKey=' clnt , application,', keyPreCombine=' ds_load_ts '))
+
+    assert hudi_write_options(table) == {
+        HUDI_RECORD_KEY_FIELD: 'clnt,application',
+        HUDI_PRECOMBINE_FIELD: 'ds_load_ts',
+    }
+
+
+def test_hudi_write_options_tuning_columns():
+    table = TableSpec(1, ingestion_record(keyPrimaryKey=None, keyPreCombine=None, hudiIndexType=' bucket ',
+                                          hudiBucketCount='16.0', hudiTargetFileSizeMB='128',
+                                          hudiPartitionField=' Fisc_Yr '))
+
+    assert hudi_write_options(table) == {
+        HUDI_INDEX_TYPE: 'BUCKET',
+        HUDI_BUCKET_COUNT: '16',
+        HUDI_MAX_FILE_SIZE: str(128 * 1024 * 1024),
+        HUDI_PARTITION_PATH_FIELD: 'fisc_yr',
+        HUDI_HIVE_STYLE_PARTITIONING: 'true',
+    }
+
+
+def test_dag_config_has_no_hudi_options():
+    dag = TableSpec(1, ingestion_record(hudiIndexType='SIMPLE')).dags[0]
+
+    assert 'hudi_options' not in dag.to_dict()
+    assert dag.get('hudi_options') is None
+
+
+def test_shared_dag_hudi_options_per_banner_table():
+    table = TableSpec(1, ingestion_record(BANNER_NAME='MDD,MAK', keyPrimaryKey=None, keyPreCombine=None,
+                                          hudiIndexType='SIMPLE'))
+    shared = table.shared_dag()
+
+    assert shared.banner_tables == {'MDD': 'mdd_physl_invt_doc', 'MAK': 'mak_physl_invt_doc'}
+    assert shared.upsert_hudi_options == {
+        'mdd_physl_invt_doc': {HUDI_INDEX_TYPE: 'SIMPLE'},
+        'mak_physl_invt_doc': {HUDI_INDEX_TYPE: 'SIMPLE'},
+    }
@@ -0,0 +1,53 @@
+import pytest
+
+from scheduling import concurrency_profile, cron_expression, estimate_runtime, parse_window, plan_schedule, window_minutes
+
+
+def test_parse_window_wraps_past_midnight():
+    window = parse_window('22:00-04:00')
+
+    assert window == (22 * 60, 4 * 60)
+    assert window_minutes(window) == 6 * 60
+    assert window_minutes(parse_window('03:00-03:00')) == 24 * 60
+
+
+@pytest.mark.parametrize('window', ['22-04', '25:00-04:00', '22:00', '22:60-23:00'])
+def test_parse_window_rejects_bad_format(window):
+    with pytest.raises(ValueError, match='HH:MM-HH:MM'):
+        parse_window(window)
+
+
+def test_cron_expression_wraps_the_day():
+    assert cron_expression(22 * 60 + 35) == '35 22 * * *'
+    assert cron_expression(24 * 60 + 5) == '5 0 * * *'
+
+
+def test_plan_schedule_packs_longest_first_on_free_lanes():
+    jobs = [('a', 60), ('b', 30), ('c', 30), ('d', 20), ('e', 7)]
+
+    offsets, overflow = plan_schedule(jobs, parse_window('22:00-23:00'), max_concurrent=2)
+
+    # a and b start together, c takes b's lane at 30, d and e get the lanes freed at 60: past the window
+    assert offsets == {'a': 0, 'b': 0, 'c': 30, 'd': 60, 'e': 60}
+    assert overflow == ['d', 'e']
+
+
+def test_plan_schedule_never_runs_more_than_max_concurrent():
+    jobs = [(f'job{i}', 10 + (i * 7) % 45) for i in range(40)]
+
+    offsets, _ = plan_schedule(jobs, parse_window('22:00-04:00'), max_concurrent=4)
+
+    runs = [(offsets[name], runtime) for name, runtime in jobs]
+    assert max(peak for _, peak in concurrency_profile(runs, bucket_minutes=1)) == 4
+    assert all(offset % 5 == 0 for offset in offsets.values())
+
+
+def test_plan_schedule_rounds_starts_up_to_the_slot():
+    offsets, _ = plan_schedule([('a', 12), ('b', 3)], parse_window('00:00-01:00'), max_concurrent=1, slot_minutes=10)
+
+    assert offsets == {'a': 0, 'b': 20}
+
+
+def test_estimate_runtime_of_a_fan_out():
+    assert estimate_runtime([60, 10, 10], concurrency=3) == 60
+    assert estimate_runtime([30, 30, 30, 30], concurrency=2) == 60
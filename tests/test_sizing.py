@@ -0,0 +1,59 @@
+from sizing import GIB, MACHINE_TYPES, size_tables
+
+
+def _stats(row_count, width=400, delta=0):
+    return {'rowCount': row_count, 'avgRowWidthBytes': width, 'dailyDeltaRows': delta}
+
+
+def test_small_table_gets_the_template_defaults_on_the_cheapest_machine():
+    params = size_tables([(_stats(2500, 310), 'FULL')])
+
+    assert params == {
+        'machineType': MACHINE_TYPES[0][0],
+        'ingDriverCores': '1', 'ingDriverMemory': '2g', 'ingExecInstances': '1',
+        'ingExecCores': '2', 'ingExecMemory': '4g', 'ingMemoryOverhead': '0.1',
+        'upsDriverCores': '1', 'upsDriverMemory': '2g', 'upsExecInstances': '1',
+        'upsExecCores': '2', 'upsExecMemory': '4g', 'upsMemoryOverhead': '0.1',
+    }
+
+
+def test_incremental_load_sizes_ingest_on_the_delta_and_upsert_on_the_rewrite():
+    # 100 GiB table, 4 GiB daily delta: ingest 4 GiB -> 2 cores, upsert 4 + 10 GiB -> 7 cores
+    stats = _stats(100 * GIB // 400, delta=4 * GIB // 400)
+
+    params = size_tables([(stats, 'INC')])
+
+    assert (params['ingExecInstances'], params['ingExecCores']) == ('1', '2')
+    assert (params['upsExecInstances'], params['upsExecCores']) == ('2', '4')
+
+
+def test_large_job_gets_more_memory_per_core_and_a_bigger_machine():
+    params = size_tables([(_stats(200 * GIB // 400), 'FULL')])
+
+    assert params['ingExecMemory'] == '16g'
+    assert params['ingMemoryOverhead'] == '0.2'
+    assert params['ingDriverCores'] == '4'
+    assert params['machineType'] != MACHINE_TYPES[0][0]
+
+
+def test_concurrent_jobs_need_a_machine_at_least_as_big():
+    tables = [(_stats(20 * GIB // 400), 'FULL')]
+    order = [machine[0] for machine in MACHINE_TYPES]
+
+    alone = size_tables(tables)['machineType']
+    shared = size_tables(tables, concurrent_jobs=3)['machineType']
+
+    assert order.index(shared) > order.index(alone)
+
+
+def test_multi_table_dag_is_sized_for_its_biggest_table():
+    small, big = (_stats(1000), 'FULL'), (_stats(20 * GIB // 400), 'FULL')
+
+    assert size_tables([small, big]) == size_tables([big])
+
+
+def test_oversized_job_is_capped_to_the_largest_machine():
+    params = size_tables([(_stats(5000 * GIB // 400), 'FULL')])
+
+    assert params['machineType'] == MACHINE_TYPES[-1][0]
+    assert int(params['upsExecInstances']) < 5000 // 2 // 4
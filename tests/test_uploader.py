@@ -0,0 +1,62 @@
+import os
+
+from uploader import DagUploader, LocalDirBackend, get_upload_backend
+
+
+def _dag(directory, name, content):
+    path = directory / name
+    path.write_text(content)
+    return str(path)
+
+
+def test_unchanged_files_are_skipped(tmp_path):
+    dag = _dag(tmp_path, 'INTLDLDAT-A.py', 'v1')
+    uploader = DagUploader(LocalDirBackend(str(tmp_path / 'bucket')), workers=2)
+
+    assert uploader.upload([dag]) == {'uploaded': [dag], 'skipped': [], 'failed': []}
+    assert uploader.upload([dag]) == {'uploaded': [], 'skipped': [dag], 'failed': []}
+
+
+def test_changed_content_is_uploaded_again(tmp_path):
+    dag = _dag(tmp_path, 'INTLDLDAT-A.py', 'v1')
+    other = _dag(tmp_path, 'INTLDLDAT-B.py', 'v1')
+    bucket = tmp_path / 'bucket'
+    uploader = DagUploader(LocalDirBackend(str(bucket)))
+    uploader.upload([dag, other])
+
+    _dag(tmp_path, 'INTLDLDAT-A.py', 'v2')
+
+    assert uploader.upload([dag, other]) == {'uploaded': [dag], 'skipped': [other], 'failed': []}
+    assert (bucket / 'INTLDLDAT-A.py').read_text() == 'v2'
+
+
+class FlakyBackend(LocalDirBackend):
+    """LocalDirBackend whose upload of one object fails"""
+
+    def __init__(self, root, failing):
+        super().__init__(root)
+        self.failing = failing
+
+    def upload(self, path, name):
+        if name == self.failing:
+            raise OSError(f"503 uploading {name}")
+        super().upload(path, name)
+
+
+def test_failed_upload_is_reported_and_the_others_go_on(tmp_path):
+    good = _dag(tmp_path, 'INTLDLDAT-A.py', 'a')
+    bad = _dag(tmp_path, 'INTLDLDAT-B.py', 'b')
+    bucket = tmp_path / 'bucket'
+
+    result = DagUploader(FlakyBackend(str(bucket), 'INTLDLDAT-B.py')).upload([bad, good])
+
+    assert result['uploaded'] == [good]
+    assert [(path, str(error)) for path, error in result['failed']] == [(bad, '503 uploading INTLDLDAT-B.py')]
+    assert os.listdir(bucket) == ['INTLDLDAT-A.py']
+
+
+def test_file_url_destination_is_a_local_directory(tmp_path):
+    backend = get_upload_backend(f"file://{tmp_path / 'bucket'}")
+
+    assert isinstance(backend, LocalDirBackend)
+    assert backend.root == str(tmp_path / 'bucket')
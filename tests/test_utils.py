@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from conftest import SRC_DIR, ingestion_record
+from plan import TableSpec, frame_rows
+from utils import read_csv_records
+
+CSV_TEXT = (
+    '\ufeffdlTableName,BANNER_NAME,keyPrimaryKey,bucket_id\n'
+    'T1,"MDD,MAK","clnt,application",007\n'
+    '\n'
+    'T2,MSB,,\n'
+    'T3,MDD\n'
+    'T4, MAK ,"line\nbreak",1e3\n'
+)
+
+
+def test_read_csv_records_mirrors_pandas_read_csv_with_dtype_str(tmp_path):
+    path = tmp_path / 'ingestion.csv'
+    path.write_text(CSV_TEXT, encoding='utf-8')
+
+    columns, records = read_csv_records(str(path))
+    frame = pd.read_csv(path, dtype=str)
+
+    # pandas reads a missing value as NaN, the csv reader as None
+    from_pandas = [{column: None if value != value else value for column, value in record.items()}
+                   for _, record in frame_rows(frame)]
+
+    assert columns == list(frame.columns)
+    assert records == from_pandas
+    assert records[2] == {'dlTableName': 'T3', 'BANNER_NAME': 'MDD', 'keyPrimaryKey': None, 'bucket_id': None}
+
+
+def test_read_csv_records_rejects_rows_wider_than_the_header(tmp_path):
+    path = tmp_path / 'ingestion.csv'
+    path.write_text('a,b\n1,2,3\n')
+
+    with pytest.raises(ValueError, match='expected 2 fields in line 2, saw 3'):
+        read_csv_records(str(path))
+
+
+def test_digest_ignores_how_a_missing_value_was_read():
+    from_csv = TableSpec(1, ingestion_record(keyPreCombine=None))
+    from_pandas = TableSpec(1, ingestion_record(keyPreCombine=float('nan')))
+
+    assert from_csv.digest == from_pandas.digest
+
+
+def test_default_path_does_not_import_pandas():
+    code = 'import sys, main; assert "pandas" not in sys.modules, "pandas imported"'
+
+    result = subprocess.run([sys.executable, '-c', code], cwd=SRC_DIR, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
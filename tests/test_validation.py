@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from conftest import ingestion_record
+from validation import REQUIRED_COLUMNS, find_missing_columns, find_row_issues, find_validation_issues
+
+
+@pytest.fixture(params=['rows', 'frame'])
+def validate(request):
+    """Both validators over the same records: the stdlib row loop and the column-wise pandas one"""
+    if request.param == 'rows':
+        return lambda records: find_row_issues(enumerate(records, 1))
+    return lambda records: find_validation_issues(pd.DataFrame(records))
+
+
+def test_valid_rows_have_no_issues(validate):
+    assert validate([ingestion_record(), ingestion_record(tableLoadType='full')]) == []
+
+
+def test_issues_keep_row_numbers_and_check_order(validate):
+    records = [ingestion_record()] * 6 + [ingestion_record(BANNER_NAME='MDD,XYZ', dataSensitivity='secret'),
+                                          ingestion_record(tableLoadType='DELTA')]
+
+    assert validate(records) == [
+        "Row 7: Invalid banner(s): ['XYZ']",
+        "Row 7: Invalid sensitivity 'secret'. Must be one of: ['se', 'ns', 'hs']",
+        "Row 8: Invalid tableLoadType 'DELTA'. Must be INC or FULL",
+    ]
+
+
+@pytest.mark.parametrize('missing', [None, float('nan'), '', '  '])
+def test_missing_and_whitespace_values_are_blank(validate, missing):
+    issues = validate([ingestion_record(), ingestion_record(dlTableName=missing, dlSchemaName=missing, BANNER_NAME=missing)])
+
+    assert issues[:3] == ["Row 2: dlTableName is empty", "Row 2: dlSchemaName is empty", "Row 2: BANNER_NAME is empty"]
+
+
+def test_hudi_columns_are_optional_but_checked(validate):
+    valid = ingestion_record(hudiIndexType='bucket', hudiBucketCount=16.0, hudiTargetFileSizeMB='120',
+                             hudiPartitionField=' ds_load_dt ')
+    invalid = ingestion_record(hudiIndexType='HASH', hudiBucketCount='0', hudiTargetFileSizeMB='1.5',
+                               hudiPartitionField='a,b')
+
+    assert validate([ingestion_record(hudiIndexType=None, hudiBucketCount=None), valid]) == []
+    assert [issue.split("'")[0] for issue in validate([valid, invalid])] == [
+        "Row 2: Invalid hudiIndexType ",
+        "Row 2: Invalid hudiBucketCount ",
+        "Row 2: Invalid hudiTargetFileSizeMB ",
+        "Row 2: Invalid hudiPartitionField ",
+    ]
+
+
+def test_column_wise_validation_of_numeric_columns():
+    df = pd.DataFrame([ingestion_record(hudiBucketCount=16), ingestion_record(hudiBucketCount=-1)])
+
+    assert find_validation_issues(df) == ["Row 2: Invalid hudiBucketCount '-1'. Must be a whole number above 0"]
+
+
+def test_find_missing_columns_accepts_a_frame_or_a_column_list():
+    assert find_missing_columns(pd.DataFrame([ingestion_record()])) == []
+    assert find_missing_columns(REQUIRED_COLUMNS + ['keyPrimaryKey']) == []
+    assert find_missing_columns(['icdsTableName', 'dlTableName']) == [
+        'BANNER_NAME', 'dataSensitivity', 'dlSchemaName', 'tableLoadType'
+    ]